@@ -0,0 +1,77 @@
+"""
+Measure the compression ratio and throughput of `maxp.util.keyreduce` on synthetic
+baked animation: smooth motion with noise, like motion capture.
+
+Run with `python -m benchmarks.benchkeyreduce`.
+"""
+
+# Standard
+import time
+
+# Third-party
+import numpy as np
+
+# Package
+from maxp.util import keyreduce
+
+# (frames, curves)
+SIZES = [(500, 100), (2000, 500)]
+
+# (position, rotation in degrees) tolerances
+TOLERANCES = [(0.001, 0.01), (0.01, 0.1), (0.1, 1.0)]
+
+NOISE = 0.001
+
+
+def makePositions(frames: int, curves: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    t = np.arange(frames)[:, np.newaxis, np.newaxis]
+    freq = rng.uniform(0.005, 0.05, (1, curves, 3))
+    phase = rng.uniform(0.0, np.pi, (1, curves, 3))
+    positions = 10.0 * np.sin(t * freq + phase)
+    return positions + rng.normal(0.0, NOISE, positions.shape)
+
+
+def makeRotations(frames: int, curves: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    t = np.arange(frames)[:, np.newaxis]
+    axes = rng.normal(size=(curves, 3))
+    axes /= np.linalg.norm(axes, axis=-1, keepdims=True)
+    angles = np.sin(t * rng.uniform(0.005, 0.05, curves)) * np.pi
+    angles = angles + rng.normal(0.0, NOISE, angles.shape)
+    half = angles[..., np.newaxis] / 2.0
+    return np.concatenate([axes * np.sin(half), np.cos(half)], axis=-1)
+
+
+def run(sizes: list = SIZES, tolerances: list = TOLERANCES) -> dict:
+    results = {}
+    for frames, curves in sizes:
+        times = np.arange(frames, dtype=np.float64)
+        positions = makePositions(frames, curves)
+        rotations = makeRotations(frames, curves)
+        for posTolerance, rotTolerance in tolerances:
+            cases = {
+                "positions": (keyreduce.reduceVectors, positions, posTolerance),
+                "rotations": (keyreduce.reduceRotations, rotations, rotTolerance),
+            }
+            for name, (reducer, values, tolerance) in cases.items():
+                start = time.perf_counter()
+                keys = reducer(times, values, tolerance)
+                seconds = time.perf_counter() - start
+                results[(frames, curves, name, tolerance)] = (
+                    keyreduce.compressionRatio(keys),
+                    frames * curves / seconds,
+                )
+    return results
+
+
+if __name__ == "__main__":
+    print(
+        f"{'frames':>6} {'curves':>6} {'channel':<10} {'tolerance':>9} "
+        f"{'ratio':>8} {'samples/s':>12}"
+    )
+    for (frames, curves, name, tolerance), (ratio, rate) in run().items():
+        print(
+            f"{frames:>6} {curves:>6} {name:<10} {tolerance:>9g} "
+            f"{ratio:>8.1f} {rate:>12,.0f}"
+        )
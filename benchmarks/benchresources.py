@@ -0,0 +1,55 @@
+"""
+Compare the stack-walking `fileio.relative` implementation with the cached
+resolvers in `maxp.util.resources`.
+
+Run with `python -m benchmarks.benchresources`.
+"""
+
+# Standard
+import inspect
+import os
+import sys
+import timeit
+
+# Package
+from maxp.util import resources
+
+NUMBER = 10000
+FILENAME = "..\\resources\\LightRig.max"
+
+
+def legacyRelative(filename: str) -> str:
+    """The original `fileio.relative`, which reads the whole stack per call."""
+    leaves = filename.split("\\")
+    count = leaves.count("..") + 1
+
+    calledFrom = inspect.stack()[1].filename
+    commonLeaves = calledFrom.split("\\")
+    commonRoot = "\\".join(commonLeaves[: (len(commonLeaves) - count)])
+
+    end = [leaf for leaf in leaves if leaf != ".."]
+    return os.path.join(commonRoot, "\\".join(end))
+
+
+def cachedRelative(filename: str) -> str:
+    """Equivalent of the current `fileio.relative`."""
+    return resources.relativeTo(sys._getframe(1).f_code.co_filename, filename)
+
+
+def run(number: int = NUMBER) -> dict:
+    cases = {
+        "legacy": lambda: legacyRelative(FILENAME),
+        "relativeTo": lambda: cachedRelative(FILENAME),
+        "resource": lambda: resources.resource("maxp", "resources/LightRig.max"),
+    }
+    results = {}
+    for name, func in cases.items():
+        results[name] = timeit.timeit(func, number=number) / number
+    return results
+
+
+if __name__ == "__main__":
+    results = run()
+    for name, seconds in results.items():
+        speedup = results["legacy"] / seconds
+        print(f"{name:<12} {seconds * 1e6:10.2f} us/call  {speedup:8.1f}x")
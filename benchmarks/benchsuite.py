@@ -0,0 +1,257 @@
+"""
+Benchmark maxp scene, callback, file and widget operations at increasing scene sizes.
+Must be run inside 3ds Max.
+
+Each case records its wall time, the number of bridge crossings made by maxp (see
+`maxp.util.profiler`) and the peak Python memory allocated while it ran. Results can
+be saved as a baseline, and later runs compared against it:
+
+    python -m benchmarks.benchsuite --sizes 1000 10000 --save baseline.json
+    python -m benchmarks.benchsuite --sizes 1000 10000 --baseline baseline.json
+"""
+
+# Standard
+import argparse
+import gc
+import json
+import shutil
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+# Qt
+from PySide2.QtWidgets import QSpinBox
+
+# Package
+from maxp import rt
+from maxp.util import callbacks, fileio, mxs, profiler, scene
+from maxp.widgets import autowindow
+
+SIZES = [1000, 10000, 100000]
+
+# Callbacks registered per scene node in the fan-out case
+CALLBACKS_PER_NODE = 0.01
+
+# Nodes exported in the export case, regardless of scene size
+EXPORT_LIMIT = 1000
+
+# Frames sampled in the sampling case
+SAMPLE_FRAMES = 100
+
+CALLBACK_ID = "maxpBenchmark"
+CALLBACK_EVENT = callbacks.GeneralEvent.unitsChange
+
+# Allowed increase over the baseline before a metric counts as a regression, as a
+# fraction of the baseline value
+THRESHOLDS = {"wall": 0.25, "calls": 0.0, "peak": 0.10}
+
+CREATE_NODES_FN = """
+fn maxpBenchCreateNodes count = (
+    resetMaxFile #noPrompt
+    for i = 1 to count collect (
+        Sphere name:("maxpBench" + i as string) radius:10 segs:8 pos:[i * 25, 0, 0]
+    )
+)
+"""
+
+
+class Measurement(NamedTuple):
+    wall: float
+    """Seconds taken, measured without profiling."""
+    calls: int
+    """Bridge crossings made by maxp."""
+    peak: int
+    """Peak Python memory allocated, in bytes."""
+
+
+class Case(NamedTuple):
+    name: str
+    run: Callable[[List[rt.Node], str], Any]
+    cleanup: Optional[Callable[[], None]] = None
+
+
+def _getProperties(nodes: List[rt.Node], tempPath: str) -> None:
+    for node in nodes:
+        scene.getProperty(node, "radius")
+
+
+def _setProperties(nodes: List[rt.Node], tempPath: str) -> None:
+    for node in nodes:
+        scene.setProperty(node, "radius", 12.0)
+
+
+def _addCallbacks(nodes: List[rt.Node], tempPath: str) -> None:
+    count = max(1, int(len(nodes) * CALLBACKS_PER_NODE))
+    for _ in range(count):
+        callbacks.add(CALLBACK_EVENT, lambda *args: None, id=CALLBACK_ID)
+    rt.Callbacks.BroadcastCallback(rt.Name(CALLBACK_EVENT))
+
+
+def _removeCallbacks() -> None:
+    callbacks.remove(CALLBACK_EVENT, id=CALLBACK_ID)
+
+
+def _addWhen(nodes: List[rt.Node], tempPath: str) -> None:
+    callbacks.When(
+        list(nodes),
+        callbacks.Trigger.Changes,
+        lambda node: None,
+        attr=callbacks.Attribute.Parameters,
+    )
+
+
+def _removeWhen() -> None:
+    for handler in callbacks.HANDLERS:
+        rt.DeleteChangeHandler(handler)
+    callbacks.HANDLERS.clear()
+
+
+def _exportNodes(nodes: List[rt.Node], tempPath: str) -> None:
+    fileio.exportNodes(nodes[:EXPORT_LIMIT], tempPath, ".obj", native=True)
+
+
+def _sampleTransforms(nodes: List[rt.Node], tempPath: str) -> None:
+    scene.sample(nodes, "transform", range(SAMPLE_FRAMES))
+
+
+def _bindWidgets(nodes: List[rt.Node], tempPath: str) -> None:
+    for node in nodes:
+        spinner = QSpinBox()
+        autowindow.bind(spinner.valueChanged, spinner.setValue, node, "radius")
+
+
+def _unbindWidgets() -> None:
+    for handler in autowindow.HANDLERS:
+        handler._unbind()
+    autowindow.HANDLERS.clear()
+    rt.gc(light=True)
+
+
+CASES = [
+    Case("getNodes", lambda nodes, tempPath: scene.getNodes()),
+    Case("getProperty", _getProperties),
+    Case("setProperty", _setProperties),
+    Case("callbacks.add", _addCallbacks, _removeCallbacks),
+    Case("When", _addWhen, _removeWhen),
+    Case("exportNodes", _exportNodes),
+    Case("sample", _sampleTransforms),
+    Case("bind", _bindWidgets, _unbindWidgets),
+]
+
+
+def measure(case: Case, nodes: List[rt.Node], tempPath: str) -> Measurement:
+    """Run `case` twice: once for its wall time alone, then again with the bridge
+    profiler and tracemalloc to count crossings and memory."""
+    gc.collect()
+    start = time.perf_counter()
+    try:
+        case.run(nodes, tempPath)
+        wall = time.perf_counter() - start
+    finally:
+        if case.cleanup is not None:
+            case.cleanup()
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        with profiler.profileBridge() as bridge:
+            case.run(nodes, tempPath)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        if case.cleanup is not None:
+            case.cleanup()
+    return Measurement(wall, bridge.calls, peak)
+
+
+def run(
+    sizes: List[int] = SIZES, cases: List[Case] = CASES
+) -> Dict[int, Dict[str, Measurement]]:
+    """Run every case in a new scene of each size in `sizes`."""
+    results: Dict[int, Dict[str, Measurement]] = {}
+    for size in sizes:
+        nodes = list(mxs.compileFunction(CREATE_NODES_FN)(size))
+        tempPath = tempfile.mkdtemp(prefix="maxp_bench_")
+        try:
+            results[size] = {
+                case.name: measure(case, nodes, tempPath) for case in cases
+            }
+        finally:
+            shutil.rmtree(tempPath, ignore_errors=True)
+    return results
+
+
+def save(results: Dict[int, Dict[str, Measurement]], filename: str) -> None:
+    data = {
+        str(size): {name: m._asdict() for name, m in cases.items()}
+        for size, cases in results.items()
+    }
+    with open(filename, "w") as f:
+        json.dump(data, f, indent=4)
+
+
+def load(filename: str) -> Dict[int, Dict[str, Measurement]]:
+    with open(filename) as f:
+        data = json.load(f)
+    return {
+        int(size): {name: Measurement(**m) for name, m in cases.items()}
+        for size, cases in data.items()
+    }
+
+
+def compare(
+    results: Dict[int, Dict[str, Measurement]],
+    baseline: Dict[int, Dict[str, Measurement]],
+    thresholds: Dict[str, float] = THRESHOLDS,
+) -> List[str]:
+    """Return a description of each metric in `results` that exceeds its baseline
+    by more than its threshold. Cases missing from the baseline are skipped."""
+    regressions = []
+    for size, cases in results.items():
+        for name, measurement in cases.items():
+            expected = baseline.get(size, {}).get(name)
+            if expected is None:
+                continue
+            for field, threshold in thresholds.items():
+                value = getattr(measurement, field)
+                limit = getattr(expected, field) * (1.0 + threshold)
+                if value > limit:
+                    regressions.append(
+                        f"{name} @ {size}: {field} {getattr(expected, field):g} -> "
+                        f"{value:g} (limit {limit:g})"
+                    )
+    return regressions
+
+
+def report(results: Dict[int, Dict[str, Measurement]]) -> None:
+    for size, cases in results.items():
+        print(f"{size} nodes")
+        for name, m in cases.items():
+            print(
+                f"    {name:<16} {m.wall * 1000:12.2f} ms {m.calls:10} calls "
+                f"{m.peak / 1024:10.1f} KiB"
+            )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--baseline", help="Compare against this baseline file.")
+    parser.add_argument("--save", help="Save the results as a baseline file.")
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes)
+    report(results)
+    if args.save:
+        save(results, args.save)
+    if args.baseline:
+        regressions = compare(results, load(args.baseline))
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,61 @@
+"""
+Compare the per-element `values.toArray` loop with the bulk converters in
+`maxp.util.values`. Must be run inside 3ds Max.
+"""
+
+# Standard
+import time
+
+# Third-party
+import numpy as np
+
+# Package
+from maxp import rt
+from maxp.util import values
+
+SIZES = [1000, 10000, 100000]
+
+
+def legacyToArray(iterable: list) -> rt.Array:
+    """The original `values.toArray`, which appends one item per bridge call."""
+    mxsArray = rt.Array()
+    for item in iterable:
+        rt.Append(mxsArray, item)
+    return mxsArray
+
+
+def legacyToPoint3Array(array: np.ndarray) -> rt.Array:
+    return legacyToArray([rt.Point3(*row) for row in array.tolist()])
+
+
+def _time(func, *args) -> float:
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def run(sizes: list = SIZES) -> dict:
+    results = {}
+    for size in sizes:
+        indices = np.arange(1, size + 1)
+        points = np.random.rand(size, 3)
+        mxsPoints = values.toPoint3Array(points)
+        results[size] = {
+            "legacy toArray": _time(legacyToArray, indices.tolist()),
+            "toIntArray": _time(values.toIntArray, indices),
+            "toBitArray": _time(values.toBitArray, indices),
+            "legacy Point3": _time(legacyToPoint3Array, points),
+            "toPoint3Array": _time(values.toPoint3Array, points),
+            "legacy read Point3": _time(
+                lambda: np.array([[p.x, p.y, p.z] for p in mxsPoints])
+            ),
+            "fromPoint3Array": _time(values.fromPoint3Array, mxsPoints),
+        }
+    return results
+
+
+if __name__ == "__main__":
+    for size, timings in run().items():
+        print(f"{size} items")
+        for name, seconds in timings.items():
+            print(f"    {name:<20} {seconds * 1000:10.2f} ms")
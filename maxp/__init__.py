@@ -1,3 +1,53 @@
 # flake8: noqa
-from .runtime import (MAX_HWND, MXSWrapperBase, MXSWrapperObjectSet,
-                      MXSWrapperObjectSetIter, pymxs, rt)
+"""
+3ds Max Python library.
+
+Attributes from `maxp.runtime` (`rt`, `pymxs`, `MAX_HWND`, ...) and the subpackages
+are loaded on first access, so `import maxp` does not import pymxs, Qt or any
+helper module that is not used.
+"""
+
+# Standard
+# typing is deliberately not imported here, as it is slow to import
+import importlib
+
+# Type checkers do not evaluate module __getattr__, so they see the runtime
+# attributes through this import, which never runs
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from .runtime import (
+        MAX_HWND,
+        MXSWrapperBase,
+        MXSWrapperObjectSet,
+        MXSWrapperObjectSetIter,
+        pymxs,
+        rt,
+    )
+
+# Attributes resolved from maxp.runtime on first access
+RUNTIME_ATTRIBUTES = [
+    "MAX_HWND",
+    "MXSWrapperBase",
+    "MXSWrapperObjectSet",
+    "MXSWrapperObjectSetIter",
+    "pymxs",
+    "rt",
+]
+
+# Submodules imported on first access
+SUBMODULES = ["runtime", "tools", "util", "widgets"]
+
+
+def __getattr__(name: str) -> object:
+    if name in RUNTIME_ATTRIBUTES:
+        value = getattr(importlib.import_module(".runtime", __name__), name)
+    elif name in SUBMODULES:
+        value = importlib.import_module(f".{name}", __name__)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(RUNTIME_ATTRIBUTES) | set(SUBMODULES))
@@ -1,16 +1,31 @@
 # noqa
 # flake8: noqa
+from typing import Any
+
 from .util.exceptions import MaxRuntimeError
 
 try:
     import pymxs
-    import qtmax
     from pymxs import (MXSWrapperBase, MXSWrapperObjectSet,
                        MXSWrapperObjectSetIter)
     from pymxs import mxsreference as ref
     from pymxs import mxstoken as token
     from pymxs import runtime as rt
-
-    MAX_HWND = qtmax.GetQMaxMainWindow()
 except (ImportError, ModuleNotFoundError):
     raise MaxRuntimeError()
+
+# Set by __getattr__ on first access
+MAX_HWND: Any
+
+
+def __getattr__(name: str) -> Any:
+    # The main window handle is only fetched (and qtmax imported) when first used
+    if name == "MAX_HWND":
+        global MAX_HWND
+        try:
+            import qtmax
+        except (ImportError, ModuleNotFoundError):
+            raise MaxRuntimeError()
+        MAX_HWND = qtmax.GetQMaxMainWindow()
+        return MAX_HWND
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,93 @@
+"""
+Registry of maxp tools.
+
+Tools are declared here with static metadata so their macros can be registered at
+3ds Max startup without importing the tool modules (and with them PySide2). A tool's
+module is only imported the first time its macro runs.
+"""
+
+# Standard
+import importlib
+import sys
+import time
+from collections import namedtuple
+from typing import Any, Dict, List, Optional
+
+# Package
+from maxp.util import macros
+
+# Defines the static metadata of a tool
+Tool = namedtuple("Tool", ["action", "category", "title", "tooltip", "module", "entry"])
+
+TOOLS: Dict[str, Tool] = {}
+
+# Time taken to import each tool's module, in seconds, keyed by action
+IMPORT_TIMES: Dict[str, float] = {}
+
+
+def register(
+    action: str,
+    title: str,
+    tooltip: str,
+    module: str,
+    entry: str = "launch",
+    category: str = "maxp",
+) -> Tool:
+    """Declare a tool without importing it.
+
+    Args:
+        action (str): The macro name.
+        title (str): The button text or menu entry name.
+        tooltip (str): Text displayed when hovered.
+        module (str): The dotted name of the module containing the tool.
+        entry (str): The function in `module` which launches the tool.
+        category (str): The macro category.
+
+    Returns:
+        Tool: The registered tool.
+    """
+    tool = Tool(action, category, title, tooltip, module, entry)
+    TOOLS[action] = tool
+    return tool
+
+
+def launch(action: str) -> Any:
+    """Import the tool registered as `action` if needed, then launch it."""
+    tool = TOOLS[action]
+    if tool.module not in sys.modules:
+        start = time.perf_counter()
+        importlib.import_module(tool.module)
+        IMPORT_TIMES[action] = time.perf_counter() - start
+    return getattr(sys.modules[tool.module], tool.entry)()
+
+
+def addMacros(actions: Optional[List[str]] = None) -> None:
+    """Register a macro for each tool (or only those in `actions`).
+
+    The macros call `launch`, so no tool module is imported until its macro runs.
+    """
+    specs = [
+        macros.MacroSpec(
+            tool.action,
+            tool.category,
+            tool.title,
+            tool.tooltip,
+            f"from maxp.tools import launch; launch({tool.action!r})",
+        )
+        for tool in TOOLS.values()
+        if not actions or tool.action in actions
+    ]
+    macros.addMacros(specs)
+
+
+def getImportTimes() -> Dict[str, float]:
+    """Return the import time, in seconds, of each tool launched so far."""
+    return dict(IMPORT_TIMES)
+
+
+register(
+    "GameExporter",
+    "Game Exporter",
+    "Batch export models, with extra options for each export.",
+    "maxp.tools.gameexporter",
+)
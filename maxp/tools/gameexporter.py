@@ -4,32 +4,56 @@ and options for batch exporting and performing certain operations while exportin
 """
 
 # Standard
+import datetime
 import logging
-from typing import List
+import time
+from typing import Any, Callable, Iterator, List, Optional
 
 # Qt
+from PySide2.QtCore import QEvent, QTimer
 from PySide2.QtWidgets import QFileDialog
 
 # Package
-from maxp import MAX_HWND, pymxs, rt
-from maxp.util import callbacks, fileio, macros, scene
+from maxp import MAX_HWND, rt, tools
+from maxp.util import callbacks, fileio, macros, scene, selector
 from maxp.util.callbacks import GeneralEvent
-from maxp.util.context import origin
+from maxp.util.context import performance
 from maxp.util.logger import log
 from maxp.widgets.autowindow import AutoWindow
 
+# Indices of the "Group by" options
+GROUP_BY_NODE = 0
+GROUP_BY_LAYER = 1
+GROUP_BY_PROPERTY = 2
+
+# Time spent exporting between returns to the event loop, in milliseconds. At least
+# one node or group is exported each time.
+EXPORT_BUDGET = 100.0
+
 
 class GameExporter(AutoWindow):
     _modelQueue: List[rt.Node] = []
+    _export: Optional[Iterator[Any]] = None
 
     def __init__(self):
         super().__init__("Game Exporter", parent=MAX_HWND, uiFileName="gameexporter")
+        self._exportTimer = QTimer(self)
+        self._exportTimer.setInterval(0)
+        self._exportTimer.timeout.connect(self._exportStep)
+        self.ui.exportProgress.hide()
         self.setupConnections()
         self.updateModelQueue()
 
+    # Override
+    def closeEvent(self, event: QEvent) -> None:
+        self.cancelExport()
+        super().closeEvent(event)
+
     def setupConnections(self) -> None:
         log("Setting connections")
         self.ui.exportSelected.toggled.connect(self.updateModelQueue)
+        self.ui.selector.editingFinished.connect(self.updateModelQueue)
+        self.ui.groupBy.currentIndexChanged.connect(self.updateGroupBy)
         self.ui.exploreOutput.clicked.connect(self.exploreOutput)
         self.ui.exportModels.clicked.connect(self.exportQueue)
 
@@ -54,37 +78,182 @@ class GameExporter(AutoWindow):
         log("Exploring output")
         output = QFileDialog.getExistingDirectory(self, "Select output directory")
         if output != "":
-            log(f"Setting output path to {output}")
+            log("Setting output path to %s", output)
             self.ui.filePath.setText(output)
         else:
-            log(f"No output selected", level=logging.WARNING)
+            log("No output selected", level=logging.WARNING)
+
+    def updateGroupBy(self, index: int) -> None:
+        self.ui.groupProperty.setEnabled(index == GROUP_BY_PROPERTY)
 
     def updateModelQueue(self) -> None:
+        if self._export is not None:
+            # Exporting changes the selection
+            return
         self.clearQueue()
-        log(f"Updating model queue")
+        log("Updating model queue")
         selected = self.ui.exportSelected.isChecked()
-        nodes = scene.getNodes(selected=selected)
+        query = self.ui.selector.text().strip()
+        if query:
+            try:
+                nodes = selector.select(f"{query} selected" if selected else query)
+            except ValueError as e:
+                log("Invalid selector: %s", e, level=logging.WARNING)
+                self.ui.statusbar.showMessage(str(e))
+                return
+        else:
+            nodes = scene.getNodes(selected=selected)
         for node in nodes:
-            log(f"Adding model {node.name}", indentLevel=1)
+            log("Adding model %s", node.name, indentLevel=1)
             self.ui.modelList.addItem(node.name)
             self._modelQueue.append(node)
 
     def clearQueue(self) -> None:
-        log(f"Clearing model queue")
+        log("Clearing model queue")
         self._modelQueue = []
         self.ui.modelList.clear()
 
     def exportQueue(self):
+        if self._export is not None:
+            self.cancelExport()
+            return
         path = self.ui.filePath.text()
-        log(f"Exporting model queue at {path}")
-        for node in self._modelQueue:
-            with origin(node):
-                log(f"Moving model {node.name} to origin", indent=1)
-                with pymxs.redraw(False):
-                    log(f"Disabling redraw", indent=1)
-                    log(f"Exporting model {node.name}", indent=1)
-                    filename = fileio.exportNode(node, path, ".fbx")
-                    log(f"Output model to {filename}", indent=1)
+        if self.ui.groupBy.currentIndex() == GROUP_BY_NODE:
+            self.exportNodes(path)
+        else:
+            self.exportGroups(path)
+
+    def exportNodes(self, path: str) -> None:
+        log("Exporting model queue at %s", path)
+        job = fileio.ExportJob(
+            self._modelQueue,
+            path,
+            ".fbx",
+            resume=self.ui.resumeExport.isChecked(),
+            zero=True,
+        )
+        if job.resumedAt:
+            log("Resuming at model %d of %d", job.resumedAt + 1, job.total)
+        self._startExport(iter(job), job.total, job.resumedAt, self._logNode)
+
+    def _logNode(self, result: fileio.NodeExport) -> None:
+        log(
+            "Output model %s to %s in %.3f s",
+            result.name,
+            result.filename,
+            result.seconds,
+            indentLevel=1,
+        )
+
+    def exportGroups(self, path: str) -> None:
+        userProp = None
+        if self.ui.groupBy.currentIndex() == GROUP_BY_PROPERTY:
+            userProp = self.ui.groupProperty.text().strip()
+            if not userProp:
+                log("No user property to group by", level=logging.WARNING)
+                self.ui.statusbar.showMessage("Enter a user property to group by")
+                return
+
+        log("Exporting model queue by group at %s", path)
+        groups = fileio.groupNodes(self._modelQueue, userProp)
+        export = fileio.iterExportGroups(groups, path, ".fbx")
+        self._startExport(export, len(groups), 0, self._logGroup)
+
+    def _logGroup(self, result: fileio.GroupExport) -> None:
+        if result.skipped:
+            log("Skipped unchanged group %s", result.name, indentLevel=1)
+            return
+        log(
+            "Output %d models in group %s to %s in %.3f s",
+            result.nodes,
+            result.name,
+            result.filename,
+            result.seconds,
+            indentLevel=1,
+        )
+
+    def _startExport(
+        self,
+        export: Iterator[Any],
+        total: int,
+        position: int,
+        logResult: Callable[[Any], None],
+    ) -> None:
+        """Run `export`, which exports one node or group per item, from the event
+        loop until it is exhausted or cancelled.
+
+        Each step runs in its own `performance` scope, so redraw, undo and the
+        editors are restored whenever control returns to the user between steps."""
+        self._export = export
+        self._exportTotal = total
+        self._exportPosition = position
+        self._exportResults: List[Any] = []
+        self._exportStarted = time.perf_counter()
+        self._logResult = logResult
+        self.ui.exportModels.setText("Cancel")
+        self.ui.exportProgress.setRange(0, max(total, 1))
+        self.ui.exportProgress.setValue(position)
+        self.ui.exportProgress.show()
+        self._exportTimer.start()
+
+    def _exportStep(self) -> None:
+        deadline = time.perf_counter() + EXPORT_BUDGET / 1000.0
+        try:
+            with performance():
+                while True:
+                    result = next(self._export)  # type: ignore
+                    self._exportResults.append(result)
+                    self._exportPosition += 1
+                    self._logResult(result)
+                    if time.perf_counter() >= deadline:
+                        break
+        except StopIteration:
+            elapsed = time.perf_counter() - self._exportStarted
+            skipped = sum(getattr(r, "skipped", False) for r in self._exportResults)
+            exported = len(self._exportResults) - skipped
+            self._stopExport(
+                f"Exported {exported} of {self._exportTotal} in {elapsed:.2f} s"
+            )
+            return
+        except Exception as e:
+            log("Export failed: %s", e, level=logging.ERROR)
+            self._stopExport(
+                f"Export failed at {self._exportPosition + 1} of "
+                f"{self._exportTotal}: {e}"
+            )
+            return
+
+        self.ui.exportProgress.setValue(self._exportPosition)
+        elapsed = time.perf_counter() - self._exportStarted
+        remaining = (
+            elapsed
+            / len(self._exportResults)
+            * (self._exportTotal - self._exportPosition)
+        )
+        eta = datetime.timedelta(seconds=round(remaining))
+        self.ui.statusbar.showMessage(
+            f"Exporting {self._exportPosition} of {self._exportTotal}, "
+            f"{eta} remaining"
+        )
+
+    def cancelExport(self) -> None:
+        """Stop the running export. Exporting the same queue again resumes where it
+        stopped."""
+        if self._export is None:
+            return
+        log("Cancelled export at %d of %d", self._exportPosition, self._exportTotal)
+        self._stopExport(
+            f"Cancelled at {self._exportPosition} of {self._exportTotal}, "
+            "export again to resume"
+        )
+
+    def _stopExport(self, message: str) -> None:
+        self._exportTimer.stop()
+        # Progress is saved after each node or group, so the export can be dropped
+        self._export = None
+        self.ui.exportModels.setText("Export")
+        self.ui.exportProgress.hide()
+        self.ui.statusbar.showMessage(message)
 
 
 def launch() -> None:
@@ -93,13 +262,7 @@ def launch() -> None:
 
 
 def test_addMacro():
-    macros.addMacro(
-        "GameExporter",
-        __file__.__package__,
-        "Game Exporter",
-        __file__.__doc__,
-        launch,
-    )
+    tools.addMacros(["GameExporter"])
     assert macros.isMacroDefined("GameExporter", "maxp")
 
 
@@ -0,0 +1,141 @@
+"""
+Fold many scene operations into a single MAXScript call.
+
+Operations are recorded on a `Batch` and turned into one MAXScript function. Nodes
+and values are passed to that function as arrays rather than interpolated into the
+script, so batches with the same shape (the same operations and property names)
+share one compiled function.
+"""
+
+# Standard
+import re
+from typing import Any, List, Sequence, Union
+
+# Package
+from maxp import rt
+from maxp.util import mxs
+
+# Resolves a node given either as a node or as its handle
+RESOLVE_NODE_FN = """
+fn maxpResolveNode x = (
+    if isKindOf x Integer then maxOps.getNodeByHandle x else x
+)
+"""
+
+# Property paths and class names are part of the script, so they are restricted to
+# plain (dotted) identifiers
+IDENTIFIER_PATTERN = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*(\.[A-Za-z_][A-Za-z0-9_]*)*$")
+
+
+class BatchRef:
+    """The result of an earlier operation in the same batch, e.g. a created node.
+
+    Can be used anywhere a node is accepted.
+    """
+
+    def __init__(self, index: int) -> None:
+        self.index = index
+
+
+NodeArg = Union[rt.Node, int, BatchRef]
+
+
+def _identifier(name: str) -> str:
+    if not IDENTIFIER_PATTERN.match(name):
+        raise ValueError(f"Invalid MAXScript identifier: {name}")
+    return name
+
+
+class Batch:
+    """Record scene operations and run them with a single `rt.Execute`-compiled
+    function call.
+
+    Every operation returns a `BatchRef` to its result; `run` returns all results
+    as one array, in the order the operations were recorded.
+
+    Usage::
+    ```python
+    batch = Batch()
+    box = batch.create("Box", name="crate", length=10.0)
+    batch.link(box, parent)
+    batch.setProperty(box, "pos.z", 5.0)
+    batch.moveToLayer([box], "Props")
+    results = batch.run()
+    ```
+    """
+
+    def __init__(self) -> None:
+        self._lines: List[str] = []
+        self._nodes: List[Any] = []
+        self._values: List[Any] = []
+
+    def __len__(self) -> int:
+        return len(self._lines)
+
+    def _node(self, node: NodeArg) -> str:
+        if isinstance(node, BatchRef):
+            return f"results[{node.index + 1}]"
+        self._nodes.append(node)
+        return f"nodes[{len(self._nodes)}]"
+
+    def _nodeList(self, nodes: Sequence[NodeArg]) -> str:
+        if any(isinstance(node, BatchRef) for node in nodes):
+            return "#(" + ", ".join(self._node(node) for node in nodes) + ")"
+        return f"(for x in {self._value(list(nodes))} collect maxpResolveNode x)"
+
+    def _value(self, value: Any) -> str:
+        self._values.append(value)
+        return f"values[{len(self._values)}]"
+
+    def _add(self, expression: str) -> BatchRef:
+        self._lines.append(f"append results ({expression})")
+        return BatchRef(len(self._lines) - 1)
+
+    def source(self) -> str:
+        """Return the MAXScript function source for this batch."""
+        body = "\n    ".join(self._lines)
+        return (
+            "fn maxpBatch nodes values = (\n"
+            "    nodes = for x in nodes collect maxpResolveNode x\n"
+            "    local results = #()\n"
+            f"    {body}\n"
+            "    results\n"
+            ")"
+        )
+
+    def getProperty(self, node: NodeArg, prop: str) -> BatchRef:
+        return self._add(f"{self._node(node)}.{_identifier(prop)}")
+
+    def setProperty(self, node: NodeArg, prop: str, value: Any) -> BatchRef:
+        target = f"{self._node(node)}.{_identifier(prop)}"
+        return self._add(f"{target} = {self._value(value)}")
+
+    def create(self, cls: str, **props: Any) -> BatchRef:
+        """Create an instance of the MAXScript class `cls` with `props`."""
+        args = " ".join(f"{_identifier(k)}:{self._value(v)}" for k, v in props.items())
+        return self._add(f"{_identifier(cls)} {args}".strip())
+
+    def link(self, child: NodeArg, parent: NodeArg) -> BatchRef:
+        return self._add(f"{self._node(child)}.parent = {self._node(parent)}")
+
+    def unlink(self, child: NodeArg) -> BatchRef:
+        return self._add(f"{self._node(child)}.parent = undefined")
+
+    def select(self, nodes: Sequence[NodeArg]) -> BatchRef:
+        return self._add(f"select {self._nodeList(nodes)}")
+
+    def moveToLayer(self, nodes: Sequence[NodeArg], layer: str) -> BatchRef:
+        """Move `nodes` to the layer named `layer`, creating it if needed."""
+        name = self._value(layer)
+        return self._add(
+            f"local layer = LayerManager.getLayerFromName {name}; "
+            f"if layer == undefined do layer = LayerManager.newLayerFromName {name}; "
+            f"for n in {self._nodeList(nodes)} do layer.addNode n; layer"
+        )
+
+    def run(self) -> rt.Array:
+        """Run the batch and return the result of each operation as one MAXScript
+        array, indexed by `BatchRef.index`."""
+        mxs.compileFunction(RESOLVE_NODE_FN)
+        func = mxs.compileFunction(self.source())
+        return func(self._nodes, self._values)
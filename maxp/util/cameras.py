@@ -1,8 +1,37 @@
 # Standard
 import math
+import os
+import shutil
+import tempfile
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, List, Optional, Sequence, Tuple
+
+# Third-party
+import numpy as np
+
+# Qt
+from PySide2.QtCore import Qt
+from PySide2.QtGui import QImage
 
 # Package
 from maxp import rt
+from maxp.util import mxs, values
+
+# Returns the bounding box corners of each node as #(min1, max1, min2, max2, ...)
+BOUNDS_FN = """
+fn maxpBounds nodes = (
+    local result = #()
+    result.count = nodes.count * 2
+    for i = 1 to nodes.count do (
+        result[i * 2 - 1] = nodes[i].min
+        result[i * 2] = nodes[i].max
+    )
+    result
+)
+"""
+
+# Default direction icon cameras look from, towards the object
+ICON_DIRECTION = (1.0, 1.0, 1.0)
 
 
 def createCamera() -> rt.Camera:
@@ -11,27 +40,42 @@ def createCamera() -> rt.Camera:
     return camera
 
 
-def alignCamera(camera: rt.Camera, obj: rt.Node):
-    # Move the target position to the center of the target object
-    target = camera.target
-    target.pos = obj.center
-    fov = camera.fov
+def getBounds(nodes: List[rt.Node]) -> Tuple[np.ndarray, np.ndarray]:
+    """Return the world-space bounding box minimums and maximums of `nodes` as two
+    (N, 3) arrays, read in a single MAXScript call."""
+    corners = values.fromPoint3Array(mxs.compileFunction(BOUNDS_FN)(nodes))
+    return corners[0::2], corners[1::2]
+
 
-    # Get the bounds of the object
-    bounds = obj.max - obj.min
+def computeFramings(
+    mins: np.ndarray,
+    maxs: np.ndarray,
+    fov: float,
+    direction: Sequence[float] = ICON_DIRECTION,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Compute camera framings for many bounding boxes at once.
 
-    # Get the largest bounding box dimension
-    radius = max([bounds.x, bounds.y, bounds.z])
+    The distance fits the largest bounding box dimension into the view, given
+    `fov`, and the camera is placed that far from the box's center along
+    `direction`.
 
-    # Calculate the distance to fit into the view, given
-    # the FOV and radius
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The (N, 3) target and camera positions.
+    """
+    centers = (mins + maxs) / 2.0
+    radius = (maxs - mins).max(axis=1)
     dist = (radius / 2.0) / math.tan(math.radians(fov) / 2.0)
+    unit = np.asarray(direction, dtype=np.float64)
+    unit = unit / np.linalg.norm(unit)
+    return centers, centers + dist[:, np.newaxis] * unit
 
-    # Construct the goal position
-    goalPos = rt.Point3(dist, dist, dist)
 
-    # Move the camera and set the FOV
-    camera.pos = goalPos
+def alignCamera(camera: rt.Camera, obj: rt.Node):
+    """Frame `obj` with `camera`, looking from `ICON_DIRECTION`."""
+    mins, maxs = getBounds([obj])
+    targets, positions = computeFramings(mins, maxs, camera.fov)
+    camera.target.pos = rt.Point3(*targets[0].tolist())
+    camera.pos = rt.Point3(*positions[0].tolist())
 
 
 def createIconCamera(obj: rt.Node):
@@ -42,3 +86,133 @@ def createIconCamera(obj: rt.Node):
 
 def setViewport(camera: rt.Camera) -> None:
     rt.viewport.setCamera(camera)
+
+
+def _encode(source: str, filename: str, size: Tuple[int, int]) -> str:
+    """Resize and encode the rendered image `source` to `filename`. Runs on a
+    worker thread, so only Qt image classes (not the 3ds Max runtime) are used."""
+    image = QImage(source)
+    if image.isNull():
+        raise IOError(f"Could not read {source}")
+    if (image.width(), image.height()) != size:
+        image = image.scaled(
+            size[0], size[1], Qt.KeepAspectRatio, Qt.SmoothTransformation
+        )
+    if not image.save(filename):
+        raise IOError(f"Could not write {filename}")
+    os.remove(source)
+    return filename
+
+
+class IconRenderer:
+    """Render icons for many nodes with a single reusable camera.
+
+    Framings for every node are computed at once from their bounding boxes. Each
+    frame is rendered to a Bitmap on the main thread, then resized and encoded on
+    a thread pool while the next frame renders.
+
+    Usage::
+    ```python
+    with IconRenderer("C:\\\\icons", size=(128, 128)) as renderer:
+        futures = renderer.render(nodes)
+    filenames = [future.result() for future in futures]
+    ```
+    """
+
+    def __init__(
+        self,
+        filepath: str,
+        size: Tuple[int, int] = (256, 256),
+        renderSize: Optional[Tuple[int, int]] = None,
+        fov: float = 25.0,
+        direction: Sequence[float] = ICON_DIRECTION,
+        fileext: str = ".png",
+        isolate: bool = True,
+        workers: int = 4,
+    ) -> None:
+        """
+        Args:
+            filepath (str): The output directory. Icons are named `<node.name><ext>`.
+            size (Tuple[int, int]): The icon size.
+            renderSize (Tuple[int, int]): The render size, if different from `size`
+                (e.g. larger, for supersampling).
+            fov (float): The camera field of view.
+            direction (Sequence[float]): The direction the camera looks from.
+            fileext (str): The image format, as a file extension.
+            isolate (bool): Hide the other nodes being rendered for each frame.
+            workers (int): The number of encoding threads.
+        """
+        self.filepath = filepath
+        self.size = size
+        self.renderSize = renderSize or size
+        self.fov = fov
+        self.direction = direction
+        self.fileext = fileext
+        self.isolate = isolate
+        self._camera: Any = None
+        self._rendered = 0
+        self._pool = ThreadPoolExecutor(max_workers=workers)
+        self._tempPath = tempfile.mkdtemp(prefix="maxp_icons_")
+
+    def __enter__(self) -> "IconRenderer":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def camera(self) -> rt.Camera:
+        if self._camera is None or not rt.IsValidNode(self._camera):
+            self._camera = createCamera()
+            self._camera.fov = self.fov
+        return self._camera
+
+    def render(self, nodes: List[rt.Node]) -> List[Future]:
+        """Render an icon for each of `nodes`.
+
+        Returns:
+            List[Future]: One future per node, resolving to the icon's filename.
+        """
+        if not nodes:
+            return []
+        camera = self.camera()
+        mins, maxs = getBounds(nodes)
+        targets, positions = computeFramings(mins, maxs, self.fov, self.direction)
+        outputSize = rt.Point2(*self.renderSize)
+
+        hidden = [bool(node.isHidden) for node in nodes] if self.isolate else []
+        if self.isolate:
+            rt.Hide(nodes)
+
+        futures = []
+        try:
+            for i, node in enumerate(nodes):
+                camera.target.pos = rt.Point3(*targets[i].tolist())
+                camera.pos = rt.Point3(*positions[i].tolist())
+                if self.isolate:
+                    rt.Unhide(node)
+
+                source = os.path.join(self._tempPath, f"{self._rendered}.bmp")
+                self._rendered += 1
+                bitmap = rt.Render(camera=camera, outputSize=outputSize, vfb=False)
+                bitmap.filename = source
+                rt.Save(bitmap)
+                rt.Close(bitmap)
+
+                if self.isolate:
+                    rt.Hide(node)
+
+                filename = os.path.join(self.filepath, f"{node.name}{self.fileext}")
+                futures.append(self._pool.submit(_encode, source, filename, self.size))
+        finally:
+            if self.isolate:
+                rt.Unhide([n for n, wasHidden in zip(nodes, hidden) if not wasHidden])
+        return futures
+
+    def close(self) -> None:
+        """Wait for pending icons and delete the camera."""
+        self._pool.shutdown(wait=True)
+        shutil.rmtree(self._tempPath, ignore_errors=True)
+        if self._camera is not None and rt.IsValidNode(self._camera):
+            rt.Delete(self._camera.target)
+            rt.Delete(self._camera)
+        self._camera = None
@@ -1,9 +1,11 @@
 # Standard
-from contextlib import contextmanager
-from typing import Iterator
+import time
+from contextlib import ExitStack, contextmanager
+from typing import Iterator, List, Optional, Union
 
 # Package
-from maxp import rt
+from maxp import pymxs, rt
+from maxp.util import profiler, scene
 
 COORD_SPACES = [
     "view",
@@ -18,6 +20,22 @@ COORD_SPACES = [
     "local_aligned",
 ]
 
+# Default explorers which rebuild themselves whenever nodes are added to the scene
+SCENE_EXPLORERS = ["Scene Explorer", "Layer Explorer"]
+
+# Number of active performance() scopes, and the settings entered by the outermost
+PERFORMANCE_DEPTH = 0
+PERFORMANCE_STACK: Optional[ExitStack] = None
+
+
+class PerformanceStats:
+    """Measurements for a single `performance` block."""
+
+    elapsed: float = 0.0
+    """Wall time, in seconds."""
+    bridgeCalls: int = 0
+    """Number of runtime lookups made through `rt` by maxp."""
+
 
 def isValidCoordsys(space: str) -> bool:
     """Validate the given coordinate space.
@@ -73,26 +91,128 @@ def coordsys(space: str) -> Iterator[None]:
 
 @contextmanager
 def origin(
-    node: rt.Node, pos: bool = True, rot: bool = True, scale: bool = True
+    nodes: Union[rt.Node, List[rt.Node]],
+    pos: bool = True,
+    rot: bool = True,
+    scale: bool = True,
 ) -> Iterator[None]:
-    """Contextually set the node's transforms to zero.
+    """Contextually set the transforms of one or more nodes to zero.
+
+    All nodes are zeroed in one MAXScript call and restored in another. The
+    original transforms are restored even if the block raises, and are restored
+    immediately inside `scene.transaction`, as zeroing is not buffered.
 
     Usage::
     ```python
-    with origin(node):
-        # Node's position, rotation, and scale are zero'd
-    # Node's transforms are returned to their original values
+    with origin(nodes):
+        # Nodes' position, rotation, and scale are zero'd
+    # Nodes' transforms are returned to their original values
     ```
     """
-    current = node.transform
-    if pos:
-        node.transform.position = rt.Point3(0, 0, 0)
-    if rot:
-        node.transform.rotation = rt.Point3(0, 0, 0)
-    if scale:
-        node.transform.scale = rt.Point3(1, 1, 1)
-    yield
-    node.transform = current
+    nodes = nodes if isinstance(nodes, list) else [nodes]
+    current = scene.zeroTransforms(nodes, pos, rot, scale)
+    try:
+        yield
+    finally:
+        scene.setTransforms(nodes, current, buffer=False)
+
+
+@contextmanager
+def suspend(
+    redraw: bool = True, undo: bool = True, explorer: bool = True
+) -> Iterator[None]:
+    """Contextually suspend viewport redraw, undo and scene explorer updates.
+
+    Everything is restored on exit, even if the block raises.
+
+    Usage::
+    ```python
+    with suspend():
+        # Merge, create or delete many nodes
+    # Views are redrawn and explorers reopened once
+    ```
+    """
+    explorers: List[str] = []
+    with ExitStack() as stack:
+        if redraw:
+            stack.enter_context(pymxs.redraw(False))
+        if undo:
+            stack.enter_context(pymxs.undo(False))
+        if explorer:
+            manager = rt.SceneExplorerManager
+            explorers = [e for e in SCENE_EXPLORERS if manager.ExplorerIsOpen(e)]
+            for name in explorers:
+                manager.CloseExplorer(name)
+        try:
+            yield
+        finally:
+            for name in explorers:
+                rt.SceneExplorerManager.OpenExplorer(name)
+    if redraw:
+        rt.RedrawViews()
+
+
+@contextmanager
+def _suspendEditing() -> Iterator[None]:
+    rt.SuspendEditing()
+    try:
+        yield
+    finally:
+        rt.ResumeEditing()
+
+
+@contextmanager
+def performance(timing: bool = False) -> Iterator[Optional[PerformanceStats]]:
+    """Contextually put 3ds Max into a state suited to heavy scene work.
+
+    Viewport redraw, undo, scene explorers and the modifier panel are suspended and
+    quiet mode is enabled. Scopes can be nested; only the outermost one changes
+    and restores these settings, and it always restores them.
+
+    Usage::
+    ```python
+    with performance(timing=True) as stats:
+        # Heavy work
+    print(stats.elapsed, stats.bridgeCalls)
+    ```
+
+    Args:
+        timing (bool): Record the wall time and bridge calls of this block.
+
+    Yields:
+        Optional[PerformanceStats]: The block's measurements if `timing` is set,
+        filled in on exit.
+    """
+    global PERFORMANCE_DEPTH, PERFORMANCE_STACK
+    if PERFORMANCE_DEPTH == 0:
+        stack = ExitStack()
+        try:
+            stack.enter_context(suspend())
+            stack.enter_context(pymxs.quiet(True))
+            stack.enter_context(_suspendEditing())
+        except BaseException:
+            stack.close()
+            raise
+        PERFORMANCE_STACK = stack
+    PERFORMANCE_DEPTH += 1
+
+    try:
+        if not timing:
+            yield None
+            return
+        stats = PerformanceStats()
+        start = time.perf_counter()
+        with profiler.profileBridge() as bridge:
+            try:
+                yield stats
+            finally:
+                stats.elapsed = time.perf_counter() - start
+                stats.bridgeCalls = bridge.calls
+    finally:
+        PERFORMANCE_DEPTH -= 1
+        if PERFORMANCE_DEPTH == 0 and PERFORMANCE_STACK is not None:
+            stack, PERFORMANCE_STACK = PERFORMANCE_STACK, None
+            stack.close()
 
 
 # def redraw() -> None:
@@ -146,23 +266,6 @@ def origin(
 #     return True
 
 
-# def has_user_prop(node: Any, prop: str) -> bool:
-#     if not is_valid(node):
-#         raise ValueError(f"Node {node} is not valid.")
-
-#     value = rt.getUserProp(node, prop)
-#     return True if value is not None else False
-
-
-# def get_user_prop(node: Any, prop: str) -> Any:
-#     if not has_user_prop(node, prop):
-#         raise ValueError(f"Node {node} has no User Property {prop}")
-
-#     value = str(rt.getUserProp(node, prop))
-#     print(f"{prop}={value}")
-#     return ast.literal_eval(value)
-
-
 # def add_callback(name, method, id):
 #     rt.callbacks.addScript(rt.name(name), method, id=rt.name(id))
 
@@ -0,0 +1,186 @@
+"""
+Run work from background threads on the 3ds Max main thread.
+
+pymxs may only be used from the main thread, so worker threads (hashing, copying,
+network fetches, ...) cannot touch the scene themselves. Instead they submit work
+items to a `MainThreadDispatcher`, which runs them on the main thread from a Qt
+timer and returns a `concurrent.futures.Future` for each.
+
+Each timer tick runs queued items until its time budget or item cap is spent, then
+returns to the event loop, so the UI stays responsive while workers keep the queue
+full. The timer only runs while items are queued.
+"""
+
+# Standard
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Optional
+
+# Qt
+from PySide2.QtCore import QObject, QTimer, Signal
+
+# Default time spent running items per timer tick, in milliseconds
+DEFAULT_BUDGET = 10.0
+
+DISPATCHER: Optional["MainThreadDispatcher"] = None
+
+
+def isMainThread() -> bool:
+    return threading.current_thread() is threading.main_thread()
+
+
+class MainThreadDispatcher(QObject):
+    """Queue of work items, submitted from any thread and run on the main thread.
+
+    Usage::
+    ```python
+    dispatcher = MainThreadDispatcher(budget=5.0)
+
+    def work(filename):
+        digest = hashFile(filename)  # On the worker thread
+        future = dispatcher.submit(scene.setProperty, node, "digest", digest)
+        future.result()  # Wait for the main thread, if needed
+
+    threading.Thread(target=work, args=[filename]).start()
+    ```
+    """
+
+    # Emitted from any thread to start the timer on the main thread
+    _wake = Signal()
+
+    def __init__(
+        self,
+        budget: float = DEFAULT_BUDGET,
+        interval: int = 0,
+        maxItems: Optional[int] = None,
+        parent: Optional[QObject] = None,
+    ) -> None:
+        """Must be created on the main thread.
+
+        Args:
+            budget (float): Time spent running items per tick, in milliseconds. At
+                least one item is run per tick.
+            interval (int): Time between ticks, in milliseconds. 0 runs a tick
+                whenever the event loop is idle.
+            maxItems (int, optional): The most items run per tick, whatever the
+                budget. Unlimited if None.
+            parent (QObject, optional): The Qt parent of the dispatcher.
+        """
+        if not isMainThread():
+            raise RuntimeError(
+                "MainThreadDispatcher must be created on the main thread"
+            )
+        super().__init__(parent)
+        self.budget = budget
+        self.maxItems = maxItems
+        self.ticks = 0
+        self.processed = 0
+        self._queue: queue.Queue = queue.Queue()
+        self._closed = False
+        # Held while checking `_closed` and queueing, so shutdown cannot miss an item
+        self._lock = threading.Lock()
+        self._timer = QTimer(self)
+        self._timer.setInterval(interval)
+        self._timer.timeout.connect(self._tick)
+        # Queued across threads, as the dispatcher lives on the main thread
+        self._wake.connect(self.start)
+
+    def __enter__(self) -> "MainThreadDispatcher":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.shutdown()
+
+    def __len__(self) -> int:
+        return self._queue.qsize()
+
+    def submit(self, func: Callable, *args: Any, **kwargs: Any) -> Future:
+        """Queue `func(*args, **kwargs)` to run on the main thread. Returns a Future
+        which resolves to its result.
+
+        Called on the main thread, `func` runs immediately, so waiting on the Future
+        cannot deadlock.
+        """
+        future: Future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Cannot submit to a dispatcher which is shut down")
+            if not isMainThread():
+                self._queue.put((future, func, args, kwargs))
+                self._wake.emit()
+                return future
+        self._run(future, func, args, kwargs)
+        return future
+
+    def call(
+        self, func: Callable, *args: Any, timeout: Optional[float] = None, **kwargs: Any
+    ) -> Any:
+        """Run `func(*args, **kwargs)` on the main thread and wait for its result."""
+        return self.submit(func, *args, **kwargs).result(timeout)
+
+    def start(self) -> None:
+        """Start running queued items. Called when items are submitted."""
+        if not self._closed and not self._timer.isActive():
+            self._timer.start()
+
+    def stop(self) -> None:
+        """Stop running queued items until `start` is called. Items submitted in the
+        meantime start it again."""
+        self._timer.stop()
+
+    def shutdown(self, cancel: bool = True) -> None:
+        """Stop the dispatcher. Queued items are cancelled, or run now if `cancel`
+        is False."""
+        with self._lock:
+            self._closed = True
+        self._timer.stop()
+        while True:
+            try:
+                future, func, args, kwargs = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if cancel:
+                future.cancel()
+            else:
+                self._run(future, func, args, kwargs)
+
+    def _run(self, future: Future, func: Callable, args: tuple, kwargs: dict) -> None:
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(func(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+        self.processed += 1
+
+    def _tick(self) -> None:
+        self.ticks += 1
+        deadline = time.perf_counter() + self.budget / 1000.0
+        count = 0
+        while True:
+            try:
+                future, func, args, kwargs = self._queue.get_nowait()
+            except queue.Empty:
+                self._timer.stop()
+                return
+            self._run(future, func, args, kwargs)
+            count += 1
+            if time.perf_counter() >= deadline or count == self.maxItems:
+                return
+
+
+def getDispatcher() -> MainThreadDispatcher:
+    """Return the shared dispatcher, creating it on first use. The first call must
+    be made on the main thread."""
+    global DISPATCHER
+    if DISPATCHER is None:
+        DISPATCHER = MainThreadDispatcher()
+    return DISPATCHER
+
+
+def runOnMainThread(func: Callable, *args: Any, **kwargs: Any) -> Future:
+    """Queue `func(*args, **kwargs)` on the shared dispatcher. See
+    `MainThreadDispatcher.submit`."""
+    return getDispatcher().submit(func, *args, **kwargs)
@@ -1,17 +1,380 @@
 # Standard
-import inspect
+import abc
+import gzip
+import hashlib
+import json
 import os
-from typing import List
+import queue
+import re
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+# Third-party
+import numpy as np
 
 # Package
 from maxp import rt
-from maxp.util import scene
+from maxp.util import context, mxs, resources, scene
 from maxp.util.exceptions import InvalidNodeError
+from maxp.util.objwriter import ObjMesh, writeObj, writeObjs
+
+# Size of the chunks read and written by post-export steps, in bytes
+STREAM_CHUNK_SIZE = 1 << 20
+
+# Returns a node's world-space mesh as flat, space-separated strings of vertices,
+# faces, UVs, UV faces and vertex normals. Indices are one-based.
+MESH_DATA_FN = """
+fn maxpMeshData node = (
+    local m = snapshotAsMesh node
+    local verts = stringStream ""
+    local faces = stringStream ""
+    local uvs = stringStream ""
+    local uvFaces = stringStream ""
+    local normals = stringStream ""
+    for i = 1 to m.numVerts do (
+        local p = getVert m i
+        local n = getNormal m i
+        format "% % % " p.x p.y p.z to:verts
+        format "% % % " n.x n.y n.z to:normals
+    )
+    for i = 1 to m.numFaces do (
+        local f = getFace m i
+        format "% % % " (f.x as integer) (f.y as integer) (f.z as integer) to:faces
+    )
+    if m.numTVerts > 0 do (
+        for i = 1 to m.numTVerts do (
+            local t = getTVert m i
+            format "% % " t.x t.y to:uvs
+        )
+        for i = 1 to m.numFaces do (
+            local f = getTVFace m i
+            format "% % % " (f.x as integer) (f.y as integer) (f.z as integer) to:uvFaces
+        )
+    )
+    delete m
+    #(verts as string, faces as string, uvs as string, uvFaces as string, normals as string)
+)
+"""
+
+# Returns the group key of each node: its layer name, or the value of a user property
+GROUP_KEYS_FN = """
+fn maxpGroupKeys nodes userProp = (
+    for n in nodes collect (
+        if userProp == undefined then n.layer.name else (
+            local value = getUserProp n userProp
+            if value == undefined then undefined else value as string
+        )
+    )
+)
+"""
+
+# Formats the class and property values of a modifier, material or map, and of its
+# sub-materials and sub-maps, to a string stream
+FORMAT_PROPS_FN = """
+fn maxpFormatProps obj ss = (
+    if obj != undefined do (
+        format "%(" (classOf obj) to:ss
+        for p in getPropNames obj do (
+            format "%=%," p (try (getProperty obj p) catch undefined) to:ss
+        )
+        if isKindOf obj Material do (
+            for i = 1 to getNumSubMtls obj do maxpFormatProps (getSubMtl obj i) ss
+        )
+        if isKindOf obj Material or isKindOf obj TextureMap do (
+            for i = 1 to getNumSubTexmaps obj do (
+                maxpFormatProps (getSubTexmap obj i) ss
+            )
+        )
+        format ")" to:ss
+    )
+)
+"""
+
+# Combines the hash `h` with the times and values of every key below `anim` in its
+# sub-anim tree (transform, base object, modifier and material tracks of a node).
+# Values getHashValue does not support are hashed as strings.
+HASH_KEYS_FN = """
+fn maxpHashValue v h = (
+    try (getHashValue v h) catch (getHashValue (v as string) h)
+)
+fn maxpHashKeys anim h = (
+    for i = 1 to anim.numSubs do (
+        local sub = anim[i]
+        if sub != undefined do (
+            local keys = try (sub.controller.keys) catch #()
+            for k in keys do (
+                h = maxpHashValue k.time h
+                h = maxpHashValue k.value h
+            )
+            h = maxpHashKeys sub h
+        )
+    )
+    h
+)
+"""
+
+# Returns a hash per node which changes when the node is renamed or moved, when its
+# world-space vertices, faces, material IDs or UVs change, when the property values
+# of its modifiers or material change, or when any of its animation keys change.
+# Values are hashed in place rather than formatted, so nothing but one integer per
+# node crosses the bridge. Requires `FORMAT_PROPS_FN` and `HASH_KEYS_FN`.
+EXPORT_SIGNATURES_FN = """
+fn maxpExportSignatures nodes = (
+    for n in nodes collect (
+        local h = getHashValue n.name 0
+        h = getHashValue n.transform h
+        if canConvertTo n TriMeshGeometry do (
+            local m = snapshotAsMesh n
+            for i = 1 to m.numVerts do h = getHashValue (getVert m i) h
+            for i = 1 to m.numFaces do (
+                h = getHashValue (getFace m i) h
+                h = getHashValue (getFaceMatID m i) h
+            )
+            for i = 1 to m.numTVerts do h = getHashValue (getTVert m i) h
+            if m.numTVerts > 0 do (
+                for i = 1 to m.numFaces do h = getHashValue (getTVFace m i) h
+            )
+            delete m
+        )
+        local ss = stringStream ""
+        for m in n.modifiers do maxpFormatProps m ss
+        format "|" to:ss
+        maxpFormatProps n.material ss
+        h = getHashValue (ss as string) h
+        maxpHashKeys n h
+    )
+)
+"""
+
+# Records the signature of each exported group, in the output directory
+EXPORT_MANIFEST_FILENAME = "maxp_export.json"
+
+# Records the position and per-node timings of an `ExportJob`, in the output directory
+EXPORT_JOB_FILENAME = "maxp_export_job.json"
+
+# Group of nodes with no layer name or user property value
+DEFAULT_GROUP = "default"
+
+INVALID_FILENAME_CHARS = re.compile(r'[<>:"/\\|?*]')
+
+
+class FileTiming(NamedTuple):
+    """Timings, in seconds, for a single file in a batch merge or import."""
+
+    filename: str
+    """The requested filename."""
+    source: str
+    """The file actually loaded, which is a local copy if it was prefetched."""
+    fetch: float
+    """Time spent copying the file to the local cache (on a background thread)."""
+    wait: float
+    """Time the main thread spent waiting for the copy to finish."""
+    load: float
+    """Time spent merging or importing the file."""
+
+
+class GroupExport(NamedTuple):
+    """The outcome of exporting a single group in `exportGroups`."""
+
+    name: str
+    """The group name."""
+    filename: str
+    """The exported file."""
+    nodes: int
+    """The number of nodes in the group."""
+    skipped: bool
+    """Whether the export was skipped, as the group was unchanged."""
+    seconds: float
+    """Time spent exporting the group."""
+
+
+class NodeExport(NamedTuple):
+    """The outcome of exporting a single node in an `ExportJob`."""
+
+    position: int
+    """The position of the node in the job."""
+    name: str
+    filename: str
+    seconds: float
+    """Time spent exporting the node."""
+
+
+class PostExportResult:
+    """The outcome of running a `PostExport` pipeline on a single file."""
+
+    def __init__(self, filename: str) -> None:
+        self.filename = filename
+        """The exported file."""
+        self.output = filename
+        """The file produced by the last step."""
+        self.values: Dict[str, Any] = {}
+        """Values recorded by each step, keyed by step name."""
+        self.timings: Dict[str, float] = {}
+        """Time spent in each step, in seconds, keyed by step name."""
+
+
+class PostExportStep(abc.ABC):
+    """Base class for a post-export step.
+
+    Steps run on worker threads, so they must not touch the 3ds Max runtime.
+    """
+
+    name: str = ""
+
+    @abc.abstractmethod
+    def run(self, filename: str, result: PostExportResult) -> str:
+        """Process `filename` and return the file the next step should receive."""
+
+
+class Checksum(PostExportStep):
+    """Record the file's hex digest as `result.values["checksum"]`."""
+
+    name = "checksum"
+
+    def __init__(self, algorithm: str = "sha256") -> None:
+        self.algorithm = algorithm
+
+    def run(self, filename: str, result: PostExportResult) -> str:
+        digest = hashlib.new(self.algorithm)
+        with open(filename, "rb") as f:
+            for chunk in iter(lambda: f.read(STREAM_CHUNK_SIZE), b""):
+                digest.update(chunk)
+        result.values[self.name] = digest.hexdigest()
+        return filename
+
+
+class Compress(PostExportStep):
+    """Gzip the file to `<filename>.gz`, optionally removing the original."""
+
+    name = "compress"
+
+    def __init__(self, level: int = 6, remove: bool = False) -> None:
+        self.level = level
+        self.remove = remove
+
+    def run(self, filename: str, result: PostExportResult) -> str:
+        output = f"{filename}.gz"
+        with open(filename, "rb") as src:
+            with gzip.open(output, "wb", compresslevel=self.level) as dst:
+                shutil.copyfileobj(src, dst, STREAM_CHUNK_SIZE)
+        if self.remove:
+            os.remove(filename)
+        result.values[self.name] = output
+        return output
+
+
+class CopyTo(PostExportStep):
+    """Copy the file into the directory `path`, e.g. a staging share."""
+
+    name = "copy"
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    def run(self, filename: str, result: PostExportResult) -> str:
+        output = os.path.join(self.path, os.path.basename(filename))
+        with open(filename, "rb") as src, open(output, "wb") as dst:
+            shutil.copyfileobj(src, dst, STREAM_CHUNK_SIZE)
+        result.values[self.name] = output
+        return output
+
+
+class PostExport:
+    """Run post-export steps on worker threads while the main thread keeps
+    exporting.
+
+    Files are queued with `submit`, which blocks once `maxPending` files are
+    waiting, so a slow share cannot grow the queue without bound.
+
+    Usage::
+    ```python
+    with PostExport([Checksum(), Compress(), CopyTo(staging)]) as post:
+        exportNodes(nodes, path, ".fbx", post=post)
+    for result in post.results():
+        print(result.output, result.values["checksum"])
+    ```
+    """
+
+    def __init__(
+        self, steps: List[PostExportStep], workers: int = 4, maxPending: int = 16
+    ) -> None:
+        self.steps = steps
+        self.futures: List[Future] = []
+        self._closed = False
+        self._queue: queue.Queue = queue.Queue(maxsize=maxPending)
+        self._threads = [
+            threading.Thread(target=self._work, name=f"maxp-post-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def __enter__(self) -> "PostExport":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def _work(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            filename, future = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(self._run(filename))
+            except BaseException as e:
+                future.set_exception(e)
+
+    def _run(self, filename: str) -> PostExportResult:
+        result = PostExportResult(filename)
+        for step in self.steps:
+            start = time.perf_counter()
+            result.output = step.run(result.output, result)
+            result.timings[step.name] = time.perf_counter() - start
+        return result
+
+    def submit(self, filename: str) -> Future:
+        """Queue `filename` for processing. Returns a Future which resolves to a
+        `PostExportResult`. Raises RuntimeError once the pipeline is closed."""
+        if self._closed:
+            raise RuntimeError("Cannot submit to a closed PostExport")
+        future: Future = Future()
+        self._queue.put((filename, future))
+        self.futures.append(future)
+        return future
+
+    def results(self) -> List[PostExportResult]:
+        """Wait for, and return, the results of every submitted file in order.
+        Raises the first step error encountered."""
+        return [future.result() for future in self.futures]
+
+    def close(self, wait: bool = True) -> None:
+        """Stop the workers once the queued files are processed. Later calls do
+        nothing."""
+        if self._closed:
+            return
+        self._closed = True
+        for _ in self._threads:
+            self._queue.put(None)
+        if wait:
+            for thread in self._threads:
+                thread.join()
 
 
 def relative(filename: str) -> str:
     """Find a file from a relative file path and name. Uses '..' to define leaves.
 
+    The path is resolved relative to the calling module's file. Both '\\' and '/'
+    separators are accepted, and results are cached.
+
     Usage::
     ```
     relative('..\\\\..\\\\test.txt')
@@ -23,15 +386,67 @@ def relative(filename: str) -> str:
     Returns:
         str: The constructed filename.
     """
-    leaves = filename.split("\\")
-    count = leaves.count("..") + 1
+    calledFrom = sys._getframe(1).f_code.co_filename
+    return resources.relativeTo(calledFrom, filename)
+
+
+def isRemote(filename: str) -> bool:
+    """Return True if `filename` is a UNC path on a network share."""
+    return filename.startswith(("\\\\", "//"))
+
+
+def _fetch(filename: str, cacheDir: str, index: int) -> Tuple[str, float]:
+    """Copy `filename` into `cacheDir`. Return the copy's filename and the copy
+    time."""
+    start = time.perf_counter()
+    local = os.path.join(cacheDir, f"{index}_{os.path.basename(filename)}")
+    shutil.copyfile(filename, local)
+    return local, time.perf_counter() - start
+
+
+def _loadFiles(
+    load: Callable[[str], None],
+    filenames: List[str],
+    prefetch: Optional[bool],
+    workers: int,
+) -> List[FileTiming]:
+    """Run `load` on every file inside a `context.performance` scope,
+    copying files to a local cache on background threads ahead of the main thread.
+    """
+    for filename in filenames:
+        if not os.path.exists(filename):
+            raise FileNotFoundError(f"{filename} not found!")
 
-    calledFrom = inspect.stack()[1].filename
-    commonLeaves = calledFrom.split("\\")
-    commonRoot = "\\".join(commonLeaves[: (len(commonLeaves) - count)])
+    timings = []
+    with tempfile.TemporaryDirectory(prefix="maxp_") as cacheDir:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures: List[Optional[Future]] = []
+            for index, filename in enumerate(filenames):
+                if prefetch or (prefetch is None and isRemote(filename)):
+                    futures.append(pool.submit(_fetch, filename, cacheDir, index))
+                else:
+                    futures.append(None)
 
-    end = [leaf for leaf in leaves if leaf != ".."]
-    return os.path.join(commonRoot, "\\".join(end))
+            try:
+                with context.performance():
+                    for filename, future in zip(filenames, futures):
+                        start = time.perf_counter()
+                        source, fetch = (filename, 0.0)
+                        if future is not None:
+                            source, fetch = future.result()
+                        wait = time.perf_counter() - start
+
+                        load(source)
+                        total = time.perf_counter() - start
+                        timings.append(
+                            FileTiming(filename, source, fetch, wait, total - wait)
+                        )
+            finally:
+                # Don't copy files which will never be loaded
+                for future in futures:
+                    if future is not None:
+                        future.cancel()
+    return timings
 
 
 def mergeFile(filename: str) -> None:
@@ -41,9 +456,37 @@ def mergeFile(filename: str) -> None:
     rt.MergeMaxFile(filename)
 
 
-def mergeFiles(filenames: List[str]) -> None:
+def mergeFiles(
+    filenames: List[str],
+    batch: bool = False,
+    prefetch: Optional[bool] = None,
+    workers: int = 4,
+) -> List[FileTiming]:
+    """Merge each of `filenames` into the current scene.
+
+    Args:
+        filenames (List[str]): The .max files to merge.
+        batch (bool): Merge all files with viewport redraw, undo and scene explorer
+            updates suspended. The merges cannot be undone.
+        prefetch (Optional[bool]): In batch mode, copy files to a local cache on
+            background threads while earlier files merge. By default only files on
+            network shares are prefetched.
+        workers (int): The number of prefetch threads.
+
+    Returns:
+        List[FileTiming]: Per-file timings, in batch mode only.
+    """
+    if batch:
+        return _loadFiles(
+            lambda source: rt.MergeMaxFile(source, rt.Name("noRedraw"), quiet=True),
+            filenames,
+            prefetch,
+            workers,
+        )
+
     for filename in filenames:
         mergeFile(filename)
+    return []
 
 
 def loadFile(filename: str) -> None:
@@ -60,14 +503,76 @@ def importFile(filename: str) -> None:
     rt.ImportFile(filename)
 
 
-def importFiles(filenames: List[str]) -> None:
+def importFiles(
+    filenames: List[str],
+    batch: bool = False,
+    prefetch: Optional[bool] = None,
+    workers: int = 4,
+) -> List[FileTiming]:
+    """Import each of `filenames` into the current scene.
+
+    See `mergeFiles` for the batch mode arguments.
+
+    Returns:
+        List[FileTiming]: Per-file timings, in batch mode only.
+    """
+    if batch:
+        return _loadFiles(
+            lambda source: rt.ImportFile(source, rt.Name("noPrompt")),
+            filenames,
+            prefetch,
+            workers,
+        )
+
     for filename in filenames:
         importFile(filename)
+    return []
+
+
+def _toArray(data: str, dtype: type, columns: int) -> np.ndarray:
+    return np.array(data.split(), dtype=dtype).reshape(-1, columns)
 
 
-def exportNode(node: rt.Node, filepath: str, fileext: str) -> str:
+def getMeshData(node: rt.Node) -> ObjMesh:
+    """Return the world-space mesh of `node` as bulk arrays.
+
+    All of the mesh data is gathered by a single MAXScript call, rather than one call
+    per vertex or face.
+    """
     if not scene.isValid(node):
         raise InvalidNodeError(node)
+
+    verts, faces, uvs, uvFaces, normals = mxs.compileFunction(MESH_DATA_FN)(node)
+    hasUvs = str(uvs) != ""
+    return ObjMesh(
+        node.name,
+        _toArray(verts, np.float64, 3),
+        _toArray(faces, np.int64, 3) - 1,
+        normals=_toArray(normals, np.float64, 3),
+        uvs=_toArray(uvs, np.float64, 2) if hasUvs else None,
+        uvFaces=_toArray(uvFaces, np.int64, 3) - 1 if hasUvs else None,
+    )
+
+
+def exportNode(node: rt.Node, filepath: str, fileext: str, native: bool = False) -> str:
+    """Export `node` to `filepath` as `<node.name><fileext>`.
+
+    Args:
+        node (rt.Node): The node to export.
+        filepath (str): The output directory.
+        fileext (str): The file format, either `.fbx` or `.obj`.
+        native (bool): Write `.obj` files with the built-in OBJ writer instead of
+            the ObjExp plugin.
+
+    Returns:
+        str: The output filename.
+    """
+    if not scene.isValid(node):
+        raise InvalidNodeError(node)
+    filename = os.path.join(filepath, f"{node.name}{fileext}")
+    if native and fileext == ".obj":
+        return writeObj(filename, getMeshData(node))
+
     rt.Select(node)
     if fileext == ".fbx":
         exporter = rt.FBXEXP
@@ -75,17 +580,281 @@ def exportNode(node: rt.Node, filepath: str, fileext: str) -> str:
         exporter = rt.ObjExp
     else:
         raise ValueError(f"Invalid export file format, got {fileext}")
-    filename = os.path.join(filepath, f"{node.name}.{fileext}")
     rt.ExportFile(filename, rt.Name("noPrompt"), selectedOnly=True, using=exporter)
 
     return filename
 
 
-def exportNodes(nodes: List[rt.Node], filepath: str, fileext: str) -> List[str]:
+def exportNodes(
+    nodes: List[rt.Node],
+    filepath: str,
+    fileext: str,
+    native: bool = False,
+    workers: Optional[int] = None,
+    post: Optional[PostExport] = None,
+) -> List[str]:
+    """Export each node in `nodes` to its own file in `filepath`.
+
+    When `native` is set and `fileext` is `.obj`, mesh data is read from the scene on
+    the main thread and the files are written from a pool of `workers` threads.
+
+    If `post` is given, each file is submitted to it as soon as it is written, so
+    post-export steps overlap with the remaining exports. Native files are
+    submitted from the writer threads, so they may be submitted out of order.
+    """
+    if native and fileext == ".obj":
+        meshes = []
+        for node in nodes:
+            if not scene.isValid(node):
+                raise InvalidNodeError(node)
+            meshes.append(getMeshData(node))
+        callback = post.submit if post is not None else None
+        return writeObjs(meshes, filepath, workers=workers, callback=callback)
+
     filenames = []
 
     for node in nodes:
         filename = exportNode(node, filepath, fileext)
         filenames.append(filename)
+        if post is not None:
+            post.submit(filename)
+
+    return filenames
+
+
+class ExportJob:
+    """Export nodes one at a time, so that the caller can return to the event loop,
+    report progress or cancel between nodes.
+
+    The job's position and the time taken by each node are recorded in a manifest in
+    `filepath` after every node. A job created for the same nodes (by name) and
+    format resumes from the recorded position, unless it had completed or `resume`
+    is False.
+
+    Usage::
+    ```python
+    job = ExportJob(nodes, "D:\\\\export", ".fbx", zero=True)
+    while not job.done:
+        result = job.step()
+        print(f"{job.position}/{job.total}", result.name, result.seconds)
+    ```
+    """
+
+    def __init__(
+        self,
+        nodes: List[rt.Node],
+        filepath: str,
+        fileext: str,
+        resume: bool = True,
+        zero: bool = False,
+    ) -> None:
+        """
+        Args:
+            nodes (List[rt.Node]): The nodes to export, each to its own file.
+            filepath (str): The output directory.
+            fileext (str): The file format, either `.fbx` or `.obj`.
+            resume (bool): Resume from the position recorded in the manifest.
+            zero (bool): Export each node at the origin (see `context.origin`).
+        """
+        self.nodes = list(nodes)
+        self.names = [str(node.name) for node in self.nodes]
+        self.filepath = filepath
+        self.fileext = fileext
+        self.zero = zero
+        self.manifestFilename = os.path.join(filepath, EXPORT_JOB_FILENAME)
+        self.position = 0
+        self.timings: List[float] = []
+        """Seconds taken by each exported node, in order."""
+
+        if resume:
+            manifest = _readManifest(self.manifestFilename)
+            if (
+                manifest.get("fileext") == fileext
+                and manifest.get("nodes") == self.names
+                and not manifest.get("complete")
+            ):
+                self.position = int(manifest.get("position", 0))
+                self.timings = list(manifest.get("timings", []))[: self.position]
+        self.resumedAt = self.position
+        """The position the job was resumed at, or 0."""
+
+    def __iter__(self) -> Iterator[NodeExport]:
+        while not self.done:
+            yield self.step()
 
+    @property
+    def total(self) -> int:
+        return len(self.nodes)
+
+    @property
+    def done(self) -> bool:
+        return self.position >= self.total
+
+    def step(self) -> NodeExport:
+        """Export the next node and record it in the manifest."""
+        if self.done:
+            raise RuntimeError("Export job is already done")
+        index = self.position
+        node = self.nodes[index]
+        start = time.perf_counter()
+        if self.zero:
+            with context.origin(node):
+                filename = exportNode(node, self.filepath, self.fileext)
+        else:
+            filename = exportNode(node, self.filepath, self.fileext)
+        seconds = time.perf_counter() - start
+
+        self.timings.append(seconds)
+        self.position += 1
+        self.save()
+        return NodeExport(index, self.names[index], filename, seconds)
+
+    def save(self) -> None:
+        manifest = {
+            "fileext": self.fileext,
+            "nodes": self.names,
+            "position": self.position,
+            "complete": self.done,
+            "timings": self.timings,
+        }
+        with open(self.manifestFilename, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=4)
+
+
+def groupNodes(
+    nodes: List[rt.Node], userProp: Optional[str] = None
+) -> Dict[str, List[rt.Node]]:
+    """Group `nodes` by layer name or, if given, by the value of the user property
+    `userProp`. Nodes without a value are grouped under `DEFAULT_GROUP`."""
+    groups: Dict[str, List[rt.Node]] = {}
+    keys = mxs.compileFunction(GROUP_KEYS_FN)(nodes, userProp)
+    for node, key in zip(nodes, keys):
+        groups.setdefault(str(key) if key else DEFAULT_GROUP, []).append(node)
+    return groups
+
+
+def getSignatures(groups: Dict[str, List[rt.Node]], fileext: str) -> Dict[str, str]:
+    """Return a signature for each group, read in a single MAXScript call. A group's
+    signature changes when any of its nodes change (see `EXPORT_SIGNATURES_FN`), or
+    nodes are added or removed."""
+    nodes = [node for group in groups.values() for node in group]
+    # Define the helpers the signatures function calls
+    mxs.compileFunction(FORMAT_PROPS_FN)
+    mxs.compileFunction(HASH_KEYS_FN)
+    signatures = iter(mxs.compileFunction(EXPORT_SIGNATURES_FN)(nodes))
+    result = {}
+    for name, group in groups.items():
+        digest = hashlib.sha1(fileext.encode("utf-8"))
+        for _ in group:
+            digest.update(str(next(signatures)).encode("utf-8"))
+        result[name] = digest.hexdigest()
+    return result
+
+
+def _readManifest(filename: str) -> Dict[str, Any]:
+    try:
+        with open(filename, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def exportGroup(nodes: List[rt.Node], filename: str, fileext: str) -> str:
+    """Export all of `nodes` to one file, with a single exporter invocation."""
+    for node in nodes:
+        if not scene.isValid(node):
+            raise InvalidNodeError(node)
+    if fileext == ".fbx":
+        exporter = rt.FBXEXP
+    elif fileext == ".obj":
+        exporter = rt.ObjExp
+    else:
+        raise ValueError(f"Invalid export file format, got {fileext}")
+    rt.Select(nodes)
+    rt.ExportFile(filename, rt.Name("noPrompt"), selectedOnly=True, using=exporter)
+    return filename
+
+
+def _groupFilenames(
+    groups: Dict[str, List[rt.Node]], filepath: str, fileext: str
+) -> Dict[str, str]:
+    """Return the output filename of each group. Raises ValueError if two groups
+    would be written to the same file."""
+    filenames: Dict[str, str] = {}
+    names: Dict[str, str] = {}
+    for name in groups:
+        basename = INVALID_FILENAME_CHARS.sub("_", name)
+        other = names.setdefault(basename.lower(), name)
+        if other != name:
+            raise ValueError(
+                f"Groups {other!r} and {name!r} would both be exported to "
+                f"{basename}{fileext}"
+            )
+        filenames[name] = os.path.join(filepath, f"{basename}{fileext}")
     return filenames
+
+
+def iterExportGroups(
+    groups: Dict[str, List[rt.Node]],
+    filepath: str,
+    fileext: str,
+    force: bool = False,
+) -> Iterator[GroupExport]:
+    """Export each group in `groups` (see `groupNodes`), yielding after each one.
+    See `exportGroups`.
+
+    The manifest is written after every exported group, so groups exported before
+    the iteration is stopped are skipped by the next export. Each group's signature
+    is read as the group is reached, so no step reads the whole queue.
+    """
+    filenames = _groupFilenames(groups, filepath, fileext)
+    manifestFilename = os.path.join(filepath, EXPORT_MANIFEST_FILENAME)
+    manifest = _readManifest(manifestFilename)
+
+    for name, group in groups.items():
+        filename = filenames[name]
+        signature = getSignatures({name: group}, fileext)[name]
+        entry = manifest.get(name, {})
+        unchanged = entry.get("signature") == signature
+        if unchanged and not force and os.path.exists(filename):
+            yield GroupExport(name, filename, len(group), True, 0.0)
+            continue
+
+        start = time.perf_counter()
+        exportGroup(group, filename, fileext)
+        seconds = time.perf_counter() - start
+        manifest[name] = {
+            "signature": signature,
+            "filename": filename,
+            "seconds": seconds,
+        }
+        with open(manifestFilename, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=4)
+        yield GroupExport(name, filename, len(group), False, seconds)
+
+
+def exportGroups(
+    nodes: List[rt.Node],
+    filepath: str,
+    fileext: str,
+    userProp: Optional[str] = None,
+    force: bool = False,
+) -> List[GroupExport]:
+    """Export `nodes` as one file per group (see `groupNodes`), named
+    `<group><fileext>`.
+
+    Group names are made into filenames by replacing invalid characters, and
+    ValueError is raised if two groups would be written to the same file.
+
+    The signature of each exported group is recorded in a manifest in `filepath`.
+    Groups whose signature matches the manifest, and whose file still exists, are
+    skipped unless `force` is set.
+
+    Usage::
+    ```python
+    for result in exportGroups(scene.getNodes(), "D:\\\\level", ".fbx"):
+        print(result.name, result.skipped, result.seconds)
+    ```
+    """
+    groups = groupNodes(nodes, userProp)
+    return list(iterExportGroups(groups, filepath, fileext, force))
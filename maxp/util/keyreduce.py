@@ -0,0 +1,182 @@
+"""
+Keyframe reduction for sampled animation (see `scene.sample`).
+
+Each curve starts with keys on its first and last frames. Every pass measures, for
+all curves at once, how far each sample is from the curve interpolated between its
+current keys. In each span between keys, the sample with the largest error becomes a
+key if that error is over the tolerance. Passes repeat until every sample is within
+tolerance, so each span is split as in Ramer-Douglas-Peucker, but all spans of all
+curves are split together.
+
+Values are interpolated linearly, and rotations spherically, to match 3ds Max's
+linear controllers (see `scene.setKeys`).
+"""
+
+# Standard
+import math
+from typing import Callable
+
+# Third-party
+import numpy as np
+
+# (samples, previous keys, following keys, interpolation factors) -> errors
+ErrorFunction = Callable[[np.ndarray, np.ndarray, np.ndarray, np.ndarray], np.ndarray]
+
+
+def _linearError(
+    values: np.ndarray, previous: np.ndarray, following: np.ndarray, u: np.ndarray
+) -> np.ndarray:
+    interpolated = previous + (following - previous) * u[..., np.newaxis]
+    return np.linalg.norm(values - interpolated, axis=-1)
+
+
+def _slerpError(
+    quats: np.ndarray, previous: np.ndarray, following: np.ndarray, u: np.ndarray
+) -> np.ndarray:
+    """Return the angle, in radians, between each quaternion in `quats` and the
+    spherical interpolation between `previous` and `following`."""
+    dot = np.sum(previous * following, axis=-1)
+    following = np.where(dot[..., np.newaxis] < 0.0, -following, following)
+    theta = np.arccos(np.clip(np.abs(dot), 0.0, 1.0))
+    sinTheta = np.sin(theta)
+    small = sinTheta < 1e-6
+    safe = np.where(small, 1.0, sinTheta)
+    w0 = np.where(small, 1.0 - u, np.sin((1.0 - u) * theta) / safe)
+    w1 = np.where(small, u, np.sin(u * theta) / safe)
+    interpolated = w0[..., np.newaxis] * previous + w1[..., np.newaxis] * following
+    interpolated /= np.linalg.norm(interpolated, axis=-1, keepdims=True)
+    cos = np.abs(np.sum(quats * interpolated, axis=-1))
+    return 2.0 * np.arccos(np.clip(cos, 0.0, 1.0))
+
+
+def _reduce(
+    times: np.ndarray, values: np.ndarray, tolerance: float, error: ErrorFunction
+) -> np.ndarray:
+    """Reduce the curves in `values`, shaped (F, K, D), and return which of the F
+    samples of each of the K curves to key, as an (F, K) boolean array."""
+    frameCount, curveCount = values.shape[:2]
+    keep = np.zeros((frameCount, curveCount), dtype=bool)
+    keep[0] = keep[-1] = True
+    if frameCount < 3:
+        return keep
+
+    frames = np.arange(frameCount)[:, np.newaxis]
+    # Curves which may still have samples over the tolerance
+    active = np.arange(curveCount)
+
+    while active.size:
+        curves = values[:, active]
+        current = keep[:, active]
+        previous = np.maximum.accumulate(np.where(current, frames, 0), axis=0)
+        following = np.minimum.accumulate(
+            np.where(current, frames, frameCount - 1)[::-1], axis=0
+        )[::-1]
+        t0 = times[previous]
+        span = times[following] - t0
+        u = np.divide(
+            times[:, np.newaxis] - t0, span, out=np.zeros_like(t0), where=span > 0
+        )
+        errors = error(
+            curves,
+            np.take_along_axis(curves, previous[..., np.newaxis], axis=0),
+            np.take_along_axis(curves, following[..., np.newaxis], axis=0),
+            u,
+        )
+        errors[current] = 0.0
+
+        over = errors > tolerance
+        # Span indices, made unique across curves
+        spans = (previous + np.arange(active.size) * frameCount)[over]
+        overErrors = errors[over]
+        spanMax = np.zeros(frameCount * active.size)
+        np.maximum.at(spanMax, spans, overErrors)
+        current[over] |= overErrors >= spanMax[spans]
+        keep[:, active] = current
+        active = active[over.any(axis=0)]
+
+    return keep
+
+
+def _prepare(times: np.ndarray, values: np.ndarray, width: int) -> np.ndarray:
+    times = np.asarray(times, dtype=np.float64)
+    if values.shape[0] != times.shape[0]:
+        raise ValueError(f"Got {times.shape[0]} times but {values.shape[0]} samples")
+    return values.reshape(values.shape[0], -1, width)
+
+
+def reduceScalars(
+    times: np.ndarray, values: np.ndarray, tolerance: float
+) -> np.ndarray:
+    """Reduce curves of numbers, e.g. `scene.sample(nodes, "radius", frames)`.
+
+    Args:
+        times (np.ndarray): The (F,) sample times.
+        values (np.ndarray): The (F, ...) samples. Each trailing element is its own
+            curve.
+        tolerance (float): The largest allowed difference from the samples.
+
+    Returns:
+        np.ndarray: An (F, ...) boolean array of the samples to key.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    curves = _prepare(times, values, 1)
+    keep = _reduce(np.asarray(times, np.float64), curves, tolerance, _linearError)
+    return keep.reshape(values.shape)
+
+
+def reduceVectors(
+    times: np.ndarray, values: np.ndarray, tolerance: float
+) -> np.ndarray:
+    """Reduce curves of vectors, e.g. positions or scales, keying all components of
+    a vector together.
+
+    Args:
+        times (np.ndarray): The (F,) sample times.
+        values (np.ndarray): The (F, ..., D) samples.
+        tolerance (float): The largest allowed distance from the samples.
+
+    Returns:
+        np.ndarray: An (F, ...) boolean array of the samples to key.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    curves = _prepare(times, values, values.shape[-1])
+    keep = _reduce(np.asarray(times, np.float64), curves, tolerance, _linearError)
+    return keep.reshape(values.shape[:-1])
+
+
+def makeContinuous(quats: np.ndarray) -> np.ndarray:
+    """Return normalized `quats`, shaped (F, ..., 4), with signs flipped so that
+    consecutive samples are in the same hemisphere."""
+    quats = np.asarray(quats, dtype=np.float64)
+    quats = quats / np.linalg.norm(quats, axis=-1, keepdims=True)
+    dots = np.sum(quats[1:] * quats[:-1], axis=-1)
+    signs = np.cumprod(np.where(dots < 0.0, -1.0, 1.0), axis=0)
+    quats[1:] *= signs[..., np.newaxis]
+    return quats
+
+
+def reduceRotations(
+    times: np.ndarray, quats: np.ndarray, tolerance: float
+) -> np.ndarray:
+    """Reduce curves of rotations, given as (x, y, z, w) quaternions.
+
+    Args:
+        times (np.ndarray): The (F,) sample times.
+        quats (np.ndarray): The (F, ..., 4) samples.
+        tolerance (float): The largest allowed angle from the samples, in degrees.
+
+    Returns:
+        np.ndarray: An (F, ...) boolean array of the samples to key.
+    """
+    quats = makeContinuous(quats)
+    curves = _prepare(times, quats, 4)
+    keep = _reduce(
+        np.asarray(times, np.float64), curves, math.radians(tolerance), _slerpError
+    )
+    return keep.reshape(quats.shape[:-1])
+
+
+def compressionRatio(keep: np.ndarray) -> float:
+    """Return the number of samples per key in the boolean array `keep`."""
+    count = np.count_nonzero(keep)
+    return keep.size / count if count else float("inf")
@@ -1,26 +1,176 @@
+# Standard
+import time
+from typing import Dict, List, Optional
+
 # Package
 from maxp import rt
-from maxp.util import fileio
+from maxp.util import mxs, resources, scene
 
 LIGHT_DOME_NAME = "_Dome"
 LIGHT_ACCENT_BACK_NAME = "_AccentBack"
 LIGHT_ACCENT_SIDE_NAME = "_AccentSide"
+LIGHT_NAMES = [LIGHT_DOME_NAME, LIGHT_ACCENT_BACK_NAME, LIGHT_ACCENT_SIDE_NAME]
+
+# Hidden, frozen layer holding the merged rig, which rigs are cloned from. Hidden
+# lights still light the scene, so the template's lights are switched off.
+TEMPLATE_LAYER_NAME = "_maxpLightRigTemplate"
+TEMPLATE_SUFFIX = "_maxpTemplate"
+
+# The template is not part of the user's scene
+scene.INTERNAL_LAYERS.append(TEMPLATE_LAYER_NAME)
+
+# Handles of the template nodes and of the live rig, keyed by node name
+TEMPLATE_HANDLES: Dict[str, int] = {}
+RIG_HANDLES: Dict[str, int] = {}
+
+# Whether each template light was on in the rig file (None for other nodes), keyed
+# by template node name
+TEMPLATE_ON: Dict[str, Optional[bool]] = {}
+
+# Seconds taken by the last cold (merge) and warm (clone) rig setup
+TIMINGS: Dict[str, float] = {}
+
+# Merges the rig file onto the template layer, renaming the merged nodes with the
+# template suffix and switching its lights off. Returns #(#(name, handle, on), ...)
+# for the merged nodes, where `on` is undefined for nodes which are not lights.
+LOAD_TEMPLATE_FN = """
+fn maxpLoadLightRigTemplate filename layerName suffix = (
+    clearSelection()
+    mergeMaxFile filename #noRedraw #select quiet:true
+    local nodes = for n in selection collect n
+    clearSelection()
+    local layer = LayerManager.getLayerFromName layerName
+    if layer == undefined do layer = LayerManager.newLayerFromName layerName
+    local states = for n in nodes collect (
+        layer.addNode n
+        n.name = n.name + suffix
+        if isProperty n #on then (
+            local wasOn = n.on
+            n.on = false
+            wasOn
+        ) else undefined
+    )
+    layer.isHidden = true
+    layer.isFrozen = true
+    for i = 1 to nodes.count collect #(nodes[i].name, nodes[i].handle, states[i])
+)
+"""
+
+# Copies the template nodes onto the current layer, restoring their original names
+# and switching their lights back on as in the rig file. Lights are copied, not
+# instanced, as instances would share the template's switched off state. Returns
+# #(#(name, handle), ...) for the clones.
+CLONE_TEMPLATE_FN = """
+fn maxpCloneLightRigTemplate handles states suffix = (
+    local sources = for h in handles collect maxOps.getNodeByHandle h
+    local clones = #()
+    maxOps.cloneNodes sources cloneType:#copy newNodes:&clones
+    local layer = LayerManager.current
+    for i = 1 to clones.count do (
+        layer.addNode clones[i]
+        clones[i].isHidden = false
+        clones[i].isFrozen = false
+        clones[i].name = substituteString sources[i].name suffix ""
+        if states[i] != undefined do clones[i].on = states[i]
+    )
+    for n in clones collect #(n.name, n.handle)
+)
+"""
+
+# Returns true if every handle resolves to a node with the matching name
+HANDLES_VALID_FN = """
+fn maxpHandlesValid handles names = (
+    if handles.count == 0 do return false
+    for i = 1 to handles.count do (
+        local n = maxOps.getNodeByHandle handles[i]
+        if not isValidNode n or n.name != names[i] do return false
+    )
+    true
+)
+"""
+
+# Returns the handles of the named nodes, or 0 where no node has the name
+FIND_HANDLES_FN = """
+fn maxpFindHandles names = (
+    for name in names collect (
+        local n = getNodeByName name
+        if n == undefined then 0 else n.handle
+    )
+)
+"""
+
+
+def _handlesValid(index: Dict[str, int]) -> bool:
+    names = list(index.keys())
+    handles = [index[name] for name in names]
+    return bool(mxs.compileFunction(HANDLES_VALID_FN)(handles, names))
+
+
+def _loadTemplate() -> None:
+    rigFile = resources.resource("maxp", "resources/LightRig.max")
+    loaded = mxs.compileFunction(LOAD_TEMPLATE_FN)(
+        rigFile, TEMPLATE_LAYER_NAME, TEMPLATE_SUFFIX
+    )
+    TEMPLATE_HANDLES.clear()
+    TEMPLATE_ON.clear()
+    for name, handle, on in loaded:
+        TEMPLATE_HANDLES[str(name)] = int(handle)
+        TEMPLATE_ON[str(name)] = None if on is None else bool(on)
+
+
+def isTemplateLoaded() -> bool:
+    """Return True if the rig template is merged into the current scene."""
+    return bool(TEMPLATE_HANDLES) and _handlesValid(TEMPLATE_HANDLES)
 
 
 def importLightRig() -> bool:
-    print("importing...")
-    rigFile = fileio.relative("..\\resources\\LightRig.max")
-    print(rigFile)
-    rt.mergeMaxFile(rigFile)  # MAXScript
+    """Add the light rig to the scene, unless it already exists.
+
+    The first time in a scene, the rig file is merged onto a hidden, frozen template
+    layer (cold), with its lights switched off. The rig is then copied from the
+    template, so setting it up again in the same scene does not touch the disk
+    (warm). The time taken is recorded in `TIMINGS`.
+
+    Returns:
+        bool: True once the rig exists.
+    """
+    if doesRigExist():
+        return True
+
+    start = time.perf_counter()
+    cold = not isTemplateLoaded()
+    if cold:
+        _loadTemplate()
+
+    handles = list(TEMPLATE_HANDLES.values())
+    states = [TEMPLATE_ON.get(name) for name in TEMPLATE_HANDLES]
+    clones = mxs.compileFunction(CLONE_TEMPLATE_FN)(handles, states, TEMPLATE_SUFFIX)
+    RIG_HANDLES.clear()
+    RIG_HANDLES.update({str(name): int(handle) for name, handle in clones})
+
+    TIMINGS["cold" if cold else "warm"] = time.perf_counter() - start
     return True
 
 
+def getRigNodes() -> List[rt.Node]:
+    """Return the nodes of the live rig, if it exists."""
+    if not doesRigExist():
+        return []
+    return [rt.MaxOps.GetNodeByHandle(handle) for handle in RIG_HANDLES.values()]
+
+
 def doesRigExist() -> bool:
-    results = []
-    for name in [LIGHT_DOME_NAME, LIGHT_ACCENT_BACK_NAME, LIGHT_ACCENT_SIDE_NAME]:
-        node = rt.getNodeFromName(name)
-        if node is None:
-            results.append(False)
-            continue
-        results.append(True)
-    return False if False in results else True
+    """Return True if all of the rig's lights are in the scene.
+
+    Checks the handle index of the last rig set up. If that is stale (e.g. a scene
+    with a rig was opened) the index is rebuilt by name, once.
+    """
+    if RIG_HANDLES and _handlesValid(RIG_HANDLES):
+        return True
+
+    handles = list(mxs.compileFunction(FIND_HANDLES_FN)(LIGHT_NAMES))
+    if 0 in handles:
+        return False
+    RIG_HANDLES.clear()
+    RIG_HANDLES.update(dict(zip(LIGHT_NAMES, [int(h) for h in handles])))
+    return True
@@ -1,40 +1,230 @@
 # Standard
-import inspect
+import atexit
+import json
 import logging
 import os
+import queue
+import sys
+import tempfile
+import threading
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Any, Optional, Tuple
 
 # Globals
-LOGGER = logging.Logger("maxp")
-TEMP = os.getenv("temp")
-if TEMP is None:
-    raise
-LOGGER_FILENAME = os.path.join(TEMP, "maxp.log")
-LOGGER.addHandler(logging.FileHandler(LOGGER_FILENAME))
-
-
-def log(msg: str, level: int = logging.INFO, indentLevel: int = 0) -> None:
-    # Get the execution stack and determine if we executed from a class
-    # or from a standalone method.
-    stack = inspect.stack()
-    firstLayer = stack[1][0]
-    if "self" in firstLayer.f_locals:
-        name = firstLayer.f_locals["self"].__class__.__name__
-    else:
-        name = firstLayer.f_code.co_name
+LOGGER = logging.getLogger("maxp")
+LOGGER.propagate = False
+LOGGER.setLevel(logging.DEBUG)
+LOGGER_FILENAME = os.path.join(tempfile.gettempdir(), "maxp.log")
+LOGGER_MAX_BYTES = 10 * 1024 * 1024
+LOGGER_BACKUP_COUNT = 3
+LOGGER_STRUCTURED = False
+
+# Records are handed to a background thread which does the formatting and writing
+QUEUE: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+LISTENER: Optional[QueueListener] = None
+# Guards starting and stopping the listener
+LISTENER_LOCK = threading.Lock()
+
+# pymxs values, which may only be used on the main thread
+MAX_VALUE_TYPES = ["MXSWrapperBase", "MXSWrapperObjectSet", "MXSWrapperObjectSetIter"]
+
+
+class TextFormatter(logging.Formatter):
+    """Format records as `[date/time] [caller] <indent> message`."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        now = f"[{datetime.fromtimestamp(record.created)}]"
+        name = f"[{getattr(record, 'caller', record.funcName)}]"
+        indent = " " * getattr(record, "indent", 0) * 4
+        line = " ".join([now, name, indent, record.getMessage()])
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            line = f"{line}\n{record.exc_text}"
+        return line
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as a single JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created).isoformat(),
+            "level": record.levelname,
+            "caller": getattr(record, "caller", record.funcName),
+            "indent": getattr(record, "indent", 0),
+            "msg": record.getMessage(),
+            "file": record.pathname,
+            "line": record.lineno,
+            "thread": record.threadName,
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry)
+
+
+def _maxValueTypes() -> Tuple[type, ...]:
+    # pymxs is only looked up, so logging does not import it
+    pymxs = sys.modules.get("pymxs")
+    if pymxs is None:
+        return ()
+    return tuple(
+        getattr(pymxs, name) for name in MAX_VALUE_TYPES if hasattr(pymxs, name)
+    )
+
+
+def _hasMaxValue(value: Any, types: Tuple[type, ...]) -> bool:
+    if isinstance(value, (list, tuple, set)):
+        return any(_hasMaxValue(v, types) for v in value)
+    if isinstance(value, dict):
+        return any(_hasMaxValue(v, types) for v in value.values())
+    return isinstance(value, types)
+
+
+def _stringifyArgs(args: Any, types: Tuple[type, ...]) -> Any:
+    if isinstance(args, dict):
+        return {
+            key: str(value) if _hasMaxValue(value, types) else value
+            for key, value in args.items()
+        }
+    return tuple(str(arg) if _hasMaxValue(arg, types) else arg for arg in args)
+
+
+class LazyQueueHandler(QueueHandler):
+    """Queue handler which leaves message formatting to the listener thread.
 
-    # Current date/time
-    now = f"[{datetime.now()}]"
+    The default `QueueHandler.prepare` formats the message on the calling thread,
+    which defeats the point of handing the record off. Arguments holding pymxs
+    values are still converted to strings on the calling thread, as pymxs may not
+    be used from the listener thread.
+    """
 
-    # The name of the entry
-    name = f"[{name}]"
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.exc_info:
+            return super().prepare(record)
+        if record.args:
+            types = _maxValueTypes()
+            if types:
+                record.args = _stringifyArgs(record.args, types)
+        return record
 
-    # Calculate indent
-    indent: str = " " * indentLevel * 4 if indentLevel > 0 else ""
 
-    # Log to the file
-    LOGGER.log(level, " ".join([now, name, indent, msg]))
+def _createFileHandler() -> logging.Handler:
+    handler = RotatingFileHandler(
+        LOGGER_FILENAME,
+        maxBytes=LOGGER_MAX_BYTES,
+        backupCount=LOGGER_BACKUP_COUNT,
+        delay=True,
+    )
+    handler.setFormatter(JsonFormatter() if LOGGER_STRUCTURED else TextFormatter())
+    return handler
+
+
+def _start() -> None:
+    """Start the background listener, unless another thread already has. The log
+    file is not opened until the first record is written."""
+    global LISTENER
+    with LISTENER_LOCK:
+        if LISTENER is not None:
+            return
+        listener = QueueListener(
+            QUEUE, _createFileHandler(), respect_handler_level=True
+        )
+        listener.start()
+        LOGGER.addHandler(LazyQueueHandler(QUEUE))  # type: ignore
+        LISTENER = listener
+
+
+def stop() -> None:
+    """Flush any pending records and stop the background listener."""
+    global LISTENER
+    with LISTENER_LOCK:
+        if LISTENER is None:
+            return
+        for handler in list(LOGGER.handlers):
+            if isinstance(handler, LazyQueueHandler):
+                LOGGER.removeHandler(handler)
+        LISTENER.stop()
+        for handler in LISTENER.handlers:
+            handler.close()
+        LISTENER = None
+
+
+def configure(
+    filename: Optional[str] = None,
+    structured: Optional[bool] = None,
+    maxBytes: Optional[int] = None,
+    backupCount: Optional[int] = None,
+    level: Optional[int] = None,
+) -> None:
+    """Change the logger's output. Arguments left as None are unchanged.
+
+    Args:
+        filename (str): The log file.
+        structured (bool): Write JSON lines instead of plain text.
+        maxBytes (int): Size at which the log file is rotated.
+        backupCount (int): Number of rotated files to keep.
+        level (int): The minimum level written to the log.
+    """
+    global LOGGER_FILENAME, LOGGER_STRUCTURED, LOGGER_MAX_BYTES, LOGGER_BACKUP_COUNT
+    stop()
+    if filename is not None:
+        LOGGER_FILENAME = filename
+    if structured is not None:
+        LOGGER_STRUCTURED = structured
+    if maxBytes is not None:
+        LOGGER_MAX_BYTES = maxBytes
+    if backupCount is not None:
+        LOGGER_BACKUP_COUNT = backupCount
+    if level is not None:
+        LOGGER.setLevel(level)
+
+
+def log(msg: str, *args: Any, level: int = logging.INFO, indentLevel: int = 0) -> None:
+    """Log `msg` to the maxp log file.
+
+    `msg` is formatted with `args` (`%` style) on the logging thread, and only if
+    `level` is enabled, so prefer `log("Exporting %s", name)` over f-strings.
+
+    Args:
+        msg (str): The message, optionally with `%` placeholders.
+        *args (Any): Values for the placeholders in `msg`.
+        level (int): The logging level.
+        indentLevel (int): The number of indents (4 spaces each) before `msg`.
+    """
+    if not LOGGER.isEnabledFor(level):
+        return
+    if LISTENER is None:
+        _start()
+
+    # Determine if we executed from a class or from a standalone method. Only the
+    # calling frame is looked at, and its locals are only read if it has a `self`.
+    frame = sys._getframe(1)
+    code = frame.f_code
+    if code.co_argcount and code.co_varnames[0] == "self":
+        name = frame.f_locals["self"].__class__.__name__
+    else:
+        name = code.co_name
+
+    record = LOGGER.makeRecord(
+        LOGGER.name,
+        level,
+        code.co_filename,
+        frame.f_lineno,
+        msg,
+        args,
+        None,
+        func=code.co_name,
+        extra={"caller": name, "indent": indentLevel},
+    )
+    LOGGER.handle(record)
 
 
 def getLogFileName() -> str:
     return LOGGER_FILENAME
+
+
+atexit.register(stop)
@@ -1,7 +1,9 @@
 # Standard
+import hashlib
+import os
 import re
 from collections import namedtuple
-from typing import Callable, List
+from typing import Callable, Dict, List, Optional, Tuple, Union
 
 # Package
 from maxp import rt
@@ -20,26 +22,93 @@ Macro = namedtuple(
     ],
 )
 
+# Defines the arguments of a macro to be added with addMacros
+MacroSpec = namedtuple("MacroSpec", ["action", "category", "title", "tooltip", "func"])
+
+# Matches a quoted string (group 1) or an integer (group 2) in a Macros.list line
+FIELD_PATTERN = re.compile(r'"((?:[^"\\]|\\.)*)"|(-?\d+)')
+
+# MacroScript names must be valid MAXScript identifiers
+ACTION_PATTERN = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+def _parseLine(line: str) -> Optional[Macro]:
+    fields = [
+        text if number == "" else int(number)
+        for text, number in FIELD_PATTERN.findall(line)
+    ]
+    if len(fields) < 3:
+        return None
+    fields = (fields + [""] * len(Macro._fields))[: len(Macro._fields)]
+    return Macro(*fields)
+
+
+class MacroRegistry:
+    """Index of the macros defined in the current 3ds Max session, keyed by
+    (category, action).
+
+    `Macros.list` is only parsed on first use (or after `refresh`). Macros added
+    through this module are added to the index directly.
+    """
+
+    def __init__(self) -> None:
+        self._macros: Optional[Dict[Tuple[str, str], Macro]] = None
+
+    def _index(self) -> Dict[Tuple[str, str], Macro]:
+        if self._macros is None:
+            self.refresh()
+        return self._macros  # type: ignore
+
+    def refresh(self) -> None:
+        """Rebuild the index from `Macros.list`."""
+        stream = rt.StringStream("")
+        rt.Macros.list(to=stream)
+        self._macros = {}
+        for line in str(stream).splitlines():
+            macro = _parseLine(line)
+            if macro is not None:
+                self._macros[(macro.category, macro.action)] = macro
+
+    def get(self, action: str, category: str) -> Optional[Macro]:
+        return self._index().get((category, action))
+
+    def add(self, macro: Macro) -> None:
+        self._index()[(macro.category, macro.action)] = macro
+
+    def macros(self) -> List[Macro]:
+        return list(self._index().values())
+
+
+REGISTRY = MacroRegistry()
+
 
 def getMacros() -> List[Macro]:
     """Return all macros in the current 3ds Max session."""
-    macros = []
-    stream = rt.StringStream("")
-    rt.Macros.list(to=stream)
-    lines = str(stream).splitlines()
-    for line in lines:
-        fields = re.findall("([\"'])(?:(?=(\\?))\2.)*?\1|[0-9]", line)
-        macros.append(Macro(*fields))
-    return macros
+    return REGISTRY.macros()
 
 
 def isMacroDefined(action: str, category: str) -> bool:
     """Return if the given action (in category) exists as a macro."""
-    return any([m.action == action and m.category == category for m in getMacros()])
+    return REGISTRY.get(action, category) is not None
+
+
+def _quote(text: str) -> str:
+    """Return `text` as a MAXScript string literal."""
+    return '"' + text.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def _body(func: Union[Callable, str]) -> str:
+    """Return the MAXScript which runs the Python function `func`, or the Python
+    source `func`."""
+    if isinstance(func, str):
+        python = func
+    else:
+        python = f"from {func.__module__} import {func.__name__}; {func.__name__}()"
+    return f"python.Execute {_quote(python)}"
 
 
 def addMacro(
-    action: str, category: str, title: str, tooltip: str, func: Callable
+    action: str, category: str, title: str, tooltip: str, func: Union[Callable, str]
 ) -> None:
     """Add a new macro to 3ds Max.
 
@@ -48,10 +117,44 @@ def addMacro(
         category (str): The category the macro can be found in.
         title (str): The button text or menu entry name.
         tooltip (str): Text displayed when hovered.
-        func (Callable): The method to execute when calling the macro.
+        func (Union[Callable, str]): The method to execute when calling the macro,
+            or Python source to run. Passing source (e.g. an import and call) avoids
+            importing the method's module until the macro runs.
     """
-    mxs = f"""
-    from {func.__module__} import {func.__name__}
-    {func}()
+    id = rt.Macros.new(category, action, tooltip, title, _body(func))
+    REGISTRY.add(Macro(id, action, category, category, "", "", 0))
+
+
+def addMacros(specs: List[MacroSpec]) -> None:
+    """Add many macros to 3ds Max at once.
+
+    All macros are written to a single MAXScript file which is evaluated once, and
+    `Macros.list` is parsed once afterwards, rather than once per macro.
+
+    3ds Max reads a macro's definition back from its source file (e.g. to edit it or
+    rebuild the UI), so the file is kept in the user macros directory. Its name is
+    derived from the macros it defines, so adding the same macros again overwrites
+    it rather than leaving another file behind.
+
+    Args:
+        specs (List[MacroSpec]): The macros to add. See `addMacro` for the fields.
     """
-    rt.Macros.new(category, action, tooltip, title, mxs)
+    lines = []
+    for spec in specs:
+        if not ACTION_PATTERN.match(spec.action):
+            raise ValueError(f"Invalid macro name: {spec.action}")
+        lines.append(
+            f"macroScript {spec.action} category:{_quote(spec.category)} "
+            f"buttonText:{_quote(spec.title)} tooltip:{_quote(spec.tooltip)}\n"
+            f"(\n    on execute do {_body(spec.func)}\n)\n"
+        )
+
+    key = "\n".join(sorted(f"{spec.category}-{spec.action}" for spec in specs))
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:12]
+    filename = os.path.join(
+        str(rt.GetDir(rt.Name("userMacros"))), f"maxp_macros_{digest}.ms"
+    )
+    with open(filename, "w") as f:
+        f.write("\n".join(lines))
+    rt.FileIn(filename)
+    REGISTRY.refresh()
@@ -0,0 +1,38 @@
+"""
+Helpers for evaluating MAXScript source from Python.
+"""
+
+# Standard
+from typing import Any, Dict
+
+# Package
+from maxp import rt
+
+# Compiled MAXScript functions, keyed by their source
+FUNCTIONS: Dict[str, Any] = {}
+
+
+def compileFunction(source: str) -> Any:
+    """Return the MAXScript function defined by `source`.
+
+    The source is only evaluated the first time it is seen; later calls return the
+    cached function value, so helpers can call this on every invocation without
+    re-parsing the script.
+
+    Usage::
+    ```python
+    fn = compileFunction("fn add a b = (a + b)")
+    fn(1, 2) # 3
+    ```
+
+    Args:
+        source (str): MAXScript source which evaluates to a function.
+
+    Returns:
+        Any: The compiled MAXScript function.
+    """
+    func = FUNCTIONS.get(source)
+    if func is None:
+        func = rt.Execute(source)
+        FUNCTIONS[source] = func
+    return func
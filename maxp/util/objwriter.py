@@ -0,0 +1,167 @@
+"""
+Streaming Wavefront OBJ writer.
+
+Mesh data is given as bulk NumPy arrays and formatted in large chunks rather than
+line by line. This module does not touch the 3ds Max runtime, so it can be used and
+benchmarked outside of 3ds Max.
+"""
+
+# Standard
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+
+# Third-party
+import numpy as np
+
+# Size of the file write buffer, in bytes
+BUFFER_SIZE = 1 << 20
+
+# Number of rows formatted per chunk
+CHUNK_SIZE = 1 << 16
+
+# Decimal places written for vertex, normal and UV components
+PRECISION = 6
+
+
+class ObjMesh(NamedTuple):
+    """Bulk mesh data for a single OBJ object.
+
+    All face arrays hold zero-based indices and share the same (F, K) shape. If
+    `uvFaces` or `normalFaces` are not given, `faces` is used to index the UVs and
+    normals.
+    """
+
+    name: str
+    vertices: np.ndarray
+    faces: np.ndarray
+    normals: Optional[np.ndarray] = None
+    uvs: Optional[np.ndarray] = None
+    normalFaces: Optional[np.ndarray] = None
+    uvFaces: Optional[np.ndarray] = None
+
+
+def _formatRows(line: str, rows: np.ndarray) -> Iterator[str]:
+    """Yield `rows` formatted with the `line` template, one chunk at a time."""
+    for start in range(0, len(rows), CHUNK_SIZE):
+        chunk = rows[start : start + CHUNK_SIZE]
+        yield (line * len(chunk)) % tuple(chunk.ravel().tolist())
+
+
+def _formatFaces(
+    mesh: ObjMesh, offsets: Tuple[int, int, int]
+) -> Tuple[np.ndarray, str]:
+    """Return the one-based face index table and the format of a single corner."""
+    faces = np.asarray(mesh.faces, dtype=np.int64)
+    columns = [faces + offsets[0] + 1]
+    corner = "%d"
+
+    if mesh.uvs is not None:
+        uvFaces = mesh.faces if mesh.uvFaces is None else mesh.uvFaces
+        columns.append(np.asarray(uvFaces, dtype=np.int64) + offsets[1] + 1)
+        corner += "/%d"
+
+    if mesh.normals is not None:
+        normalFaces = mesh.faces if mesh.normalFaces is None else mesh.normalFaces
+        columns.append(np.asarray(normalFaces, dtype=np.int64) + offsets[2] + 1)
+        corner += "/%d" if mesh.uvs is not None else "//%d"
+
+    # Interleave so each face row reads v/vt/vn v/vt/vn ...
+    table = np.stack(columns, axis=-1).reshape(len(faces), -1)
+    return table, corner
+
+
+def iterObj(mesh: ObjMesh, offsets: Tuple[int, int, int] = (0, 0, 0)) -> Iterator[str]:
+    """Yield the OBJ text for `mesh` in chunks.
+
+    Args:
+        mesh (ObjMesh): The mesh to format.
+        offsets (Tuple[int, int, int]): The number of vertices, UVs and normals
+            already written to the file, used to offset the face indices.
+    """
+    yield f"o {mesh.name}\n"
+    for prefix, rows in (("v", mesh.vertices), ("vt", mesh.uvs), ("vn", mesh.normals)):
+        if rows is None:
+            continue
+        rows = np.asarray(rows, dtype=np.float64)
+        line = prefix + f" %.{PRECISION}f" * rows.shape[1] + "\n"
+        yield from _formatRows(line, rows)
+
+    table, corner = _formatFaces(mesh, offsets)
+    sides = table.shape[1] // corner.count("%")
+    yield from _formatRows("f" + f" {corner}" * sides + "\n", table)
+
+
+def writeObj(filename: str, meshes: Union[ObjMesh, Iterable[ObjMesh]]) -> str:
+    """Write one or more meshes to a single OBJ file.
+
+    Usage::
+    ```python
+    verts = np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0]])
+    faces = np.array([[0, 1, 2]])
+    writeObj("triangle.obj", ObjMesh("triangle", verts, faces))
+    ```
+
+    Args:
+        filename (str): The output filename.
+        meshes (Union[ObjMesh, Iterable[ObjMesh]]): The mesh(es) to write. Each mesh
+            is written as its own object.
+
+    Returns:
+        str: The output filename.
+    """
+    if isinstance(meshes, ObjMesh):
+        meshes = [meshes]
+
+    offsets = (0, 0, 0)
+    with open(filename, "w", buffering=BUFFER_SIZE, newline="\n") as f:
+        for mesh in meshes:
+            f.writelines(iterObj(mesh, offsets))
+            offsets = (
+                offsets[0] + len(mesh.vertices),
+                offsets[1] + (0 if mesh.uvs is None else len(mesh.uvs)),
+                offsets[2] + (0 if mesh.normals is None else len(mesh.normals)),
+            )
+    return filename
+
+
+def writeObjs(
+    meshes: Iterable[ObjMesh],
+    filepath: str,
+    workers: Optional[int] = None,
+    callback: Optional[Callable[[str], Any]] = None,
+) -> List[str]:
+    """Write each mesh to its own `<name>.obj` file in `filepath`, using a thread
+    pool.
+
+    Args:
+        meshes (Iterable[ObjMesh]): The meshes to write.
+        filepath (str): The output directory.
+        workers (Optional[int]): The maximum number of writer threads. Defaults to
+            the ThreadPoolExecutor default.
+        callback (Optional[Callable[[str], Any]]): Called with each filename as soon
+            as the file is written, on the writer thread.
+
+    Returns:
+        List[str]: The output filenames, in the same order as `meshes`.
+    """
+
+    def write(mesh: ObjMesh) -> str:
+        filename = writeObj(os.path.join(filepath, f"{mesh.name}.obj"), mesh)
+        if callback is not None:
+            callback(filename)
+        return filename
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(write, mesh) for mesh in meshes]
+        return [future.result() for future in futures]
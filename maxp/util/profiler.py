@@ -0,0 +1,367 @@
+"""
+Measure traffic across the pymxs bridge.
+
+maxp modules access 3ds Max through their module-level `rt` global. Profiling
+temporarily replaces that global with a proxy in every loaded maxp module, so there
+is no cost at all while profiling is off.
+
+What is measured, by kind:
+
+- `call`: calls of MAXScript functions and classes (constructors) looked up on `rt`,
+  of functions read from MAXScript values, and of pymxs wrapper methods (e.g.
+  `node.getmxsprop`, recorded as `.getmxsprop`). The time includes the lookup.
+- `get` / `set`: global variables read or written on `rt` (e.g. `rt.selection`), and
+  properties read or written on MAXScript values returned through `rt` (e.g.
+  `node.transform`, recorded as `.transform`). Indexing is recorded as `[]`.
+- `iter` / `len`: iterating or taking the length of MAXScript collections.
+
+MAXScript values returned while profiling are wrapped in a proxy which records these
+operations and forwards everything else, including arithmetic and comparisons.
+Proxies are unwrapped, also inside lists, tuples and dicts, before being passed to
+pymxs. Operations on values obtained before profiling started are not measured.
+
+The cache of compiled MAXScript functions is emptied while profiling, so that
+functions compiled inside are not proxies left bound to the profiler afterwards.
+"""
+
+# Standard
+import sys
+import time
+from contextlib import contextmanager
+from types import FrameType
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+# (kind, runtime name, calling maxp function)
+StatKey = Tuple[str, str, str]
+
+CALL = "call"
+GET = "get"
+SET = "set"
+ITER = "iter"
+LEN = "len"
+
+# MAXScript classes of values which are called rather than read
+FUNCTION_CLASSES = {
+    "MAXScriptFunction",
+    "Primitive",
+    "MappedPrimitive",
+    "Generic",
+    "MappedGeneric",
+    "NodeGeneric",
+    "StructDef",
+    "MAXClass",
+}
+
+# Operators forwarded by `ProfiledValue` to the wrapped value, without recording
+FORWARDED_OPERATORS = [
+    "__add__",
+    "__radd__",
+    "__sub__",
+    "__rsub__",
+    "__mul__",
+    "__rmul__",
+    "__truediv__",
+    "__rtruediv__",
+    "__neg__",
+    "__lt__",
+    "__le__",
+    "__gt__",
+    "__ge__",
+]
+
+
+def _caller(frame: Optional[FrameType]) -> str:
+    """Return the nearest maxp function on the stack, as `module.function`."""
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module.startswith("maxp.") and module != __name__:
+            return f"{module}.{frame.f_code.co_name}"
+        frame = frame.f_back
+    return "<external>"
+
+
+def _unwrap(value: Any) -> Any:
+    """Return `value` with every `ProfiledValue` replaced by its wrapped value,
+    including inside lists, tuples and dicts."""
+    if isinstance(value, ProfiledValue):
+        return object.__getattribute__(value, "_value")
+    if isinstance(value, list):
+        return [_unwrap(v) for v in value]
+    if isinstance(value, tuple):
+        return tuple(_unwrap(v) for v in value)
+    if isinstance(value, dict):
+        return {k: _unwrap(v) for k, v in value.items()}
+    return value
+
+
+class ProfiledValue:
+    """Proxy for a runtime function, class or value returned through
+    `BridgeProfiler`, which records the operations made on it. Passes `isinstance`
+    checks for the wrapped value's type."""
+
+    def __init__(
+        self, profiler: "BridgeProfiler", name: str, value: Any, lookup: float = 0.0
+    ) -> None:
+        object.__setattr__(self, "_profiler", profiler)
+        object.__setattr__(self, "_name", name)
+        object.__setattr__(self, "_value", value)
+        object.__setattr__(self, "_lookup", lookup)
+
+    @property  # type: ignore
+    def __class__(self) -> type:
+        return type(self._value)
+
+    def _measure(self, kind: str, name: str, func: Callable[[], Any]) -> Any:
+        return self._profiler.measure(kind, name, func)
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        def call() -> Any:
+            return self._value(*_unwrap(args), **_unwrap(kwargs))
+
+        return self._profiler.measure(CALL, self._name, call, self._lookup)
+
+    def __getattr__(self, name: str) -> Any:
+        if callable(getattr(type(self._value), name, None)):
+            # A method of the pymxs wrapper, e.g. getmxsprop, rather than a property
+            method = getattr(self._value, name)
+
+            def call(*args: Any, **kwargs: Any) -> Any:
+                return self._measure(
+                    CALL, f".{name}", lambda: method(*_unwrap(args), **_unwrap(kwargs))
+                )
+
+            return call
+        return self._measure(GET, f".{name}", lambda: getattr(self._value, name))
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        self._measure(
+            SET, f".{name}", lambda: setattr(self._value, name, _unwrap(value))
+        )
+
+    def __getitem__(self, key: Any) -> Any:
+        return self._measure(GET, "[]", lambda: self._value[_unwrap(key)])
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        def setItem() -> None:
+            self._value[_unwrap(key)] = _unwrap(value)
+
+        self._measure(SET, "[]", setItem)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._measure(ITER, self._name, lambda: list(self._value)))
+
+    def __len__(self) -> int:
+        return self._measure(LEN, self._name, lambda: len(self._value))
+
+    def __contains__(self, item: Any) -> bool:
+        return _unwrap(item) in self._value
+
+    def __eq__(self, other: Any) -> bool:
+        return self._value == _unwrap(other)
+
+    def __ne__(self, other: Any) -> bool:
+        return self._value != _unwrap(other)
+
+    def __hash__(self) -> int:
+        return hash(self._value)
+
+    def __bool__(self) -> bool:
+        return bool(self._value)
+
+    def __str__(self) -> str:
+        return str(self._value)
+
+    def __repr__(self) -> str:
+        return repr(self._value)
+
+
+def _forward(operator: str) -> Callable[..., Any]:
+    def method(self: ProfiledValue, *args: Any) -> Any:
+        value = object.__getattribute__(self, "_value")
+        func = getattr(type(value), operator, None)
+        if func is None:
+            return NotImplemented
+        profiler = object.__getattribute__(self, "_profiler")
+        return profiler.wrap(self._name, func(value, *_unwrap(args)))
+
+    method.__name__ = operator
+    return method
+
+
+for _operator in FORWARDED_OPERATORS:
+    setattr(ProfiledValue, _operator, _forward(_operator))
+
+
+class BridgeProfiler:
+    """Proxy for `rt` which counts and times runtime function calls, global and
+    property access, attributed to the calling maxp function. See the module
+    docstring for what is measured."""
+
+    def __init__(self, runtime: Any) -> None:
+        from maxp.runtime import (
+            MXSWrapperBase,
+            MXSWrapperObjectSet,
+            MXSWrapperObjectSetIter,
+        )
+
+        object.__setattr__(self, "_runtime", runtime)
+        object.__setattr__(
+            self,
+            "_types",
+            (MXSWrapperBase, MXSWrapperObjectSet, MXSWrapperObjectSetIter),
+        )
+        object.__setattr__(self, "_functions", {})
+        object.__setattr__(self, "stats", {})
+
+    def _isFunction(self, name: str, value: Any) -> bool:
+        """Return whether the runtime global `name` is a function or class. Decided
+        once per name."""
+        isFunction = self._functions.get(name)
+        if isFunction is None:
+            if isinstance(value, self._types):
+                cls = str(self._runtime.classOf(value))
+                isFunction = cls in FUNCTION_CLASSES
+            else:
+                isFunction = callable(value)
+            self._functions[name] = isFunction
+        return isFunction
+
+    def __getattr__(self, name: str) -> Any:
+        caller = _caller(sys._getframe(1))
+        start = time.perf_counter()
+        value = getattr(self._runtime, name)
+        elapsed = time.perf_counter() - start
+        if self._isFunction(name, value):
+            return ProfiledValue(self, name, value, elapsed)
+        self.record(GET, name, caller, elapsed)
+        return self.wrap(name, value)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        caller = _caller(sys._getframe(1))
+        start = time.perf_counter()
+        setattr(self._runtime, name, _unwrap(value))
+        self.record(SET, name, caller, time.perf_counter() - start)
+
+    def wrap(self, name: str, value: Any) -> Any:
+        """Return `value` wrapped in a `ProfiledValue` if it is a MAXScript value."""
+        if isinstance(value, self._types) and not isinstance(value, ProfiledValue):
+            return ProfiledValue(self, name, value)
+        return value
+
+    def measure(
+        self, kind: str, name: str, func: Callable[[], Any], extra: float = 0.0
+    ) -> Any:
+        """Run `func`, record it as one crossing, and return its result wrapped."""
+        caller = _caller(sys._getframe(1))
+        start = time.perf_counter()
+        try:
+            result = func()
+        finally:
+            elapsed = time.perf_counter() - start + extra
+            self.record(kind, name, caller, elapsed)
+        if isinstance(result, list):
+            return [self.wrap(name, item) for item in result]
+        return self.wrap(name, result)
+
+    def record(self, kind: str, name: str, caller: str, elapsed: float) -> None:
+        stat = self.stats.get((kind, name, caller))
+        if stat is None:
+            self.stats[(kind, name, caller)] = [1, elapsed]
+        else:
+            stat[0] += 1
+            stat[1] += elapsed
+
+    @property
+    def calls(self) -> int:
+        """The total number of bridge crossings recorded."""
+        return sum(count for count, _ in self.stats.values())
+
+    @property
+    def elapsed(self) -> float:
+        """The total time, in seconds, spent in recorded crossings."""
+        return sum(seconds for _, seconds in self.stats.values())
+
+    def totals(self, by: str = "name") -> Dict[str, List[float]]:
+        """Return [count, seconds] totals grouped `by` "name" or "caller"."""
+        index = 1 if by == "name" else 2
+        totals: Dict[str, List[float]] = {}
+        for key, (count, seconds) in self.stats.items():
+            total = totals.setdefault(key[index], [0, 0.0])
+            total[0] += count
+            total[1] += seconds
+        return totals
+
+    def report(self, limit: Optional[int] = 25, file: Any = None) -> str:
+        """Print (to `file`, default stdout) and return a table of the recorded
+        crossings, most expensive first."""
+        rows = sorted(self.stats.items(), key=lambda item: item[1][1], reverse=True)
+        if limit is not None:
+            rows = rows[:limit]
+        lines = [
+            f"{self.calls} bridge crossings, {self.elapsed * 1000:.3f} ms",
+            f"{'count':>8} {'total ms':>10} {'per us':>9}  {'kind':<4} "
+            f"{'name':<30} caller",
+        ]
+        for (kind, name, caller), (count, seconds) in rows:
+            lines.append(
+                f"{count:>8} {seconds * 1000:>10.3f} {seconds / count * 1e6:>9.2f}  "
+                f"{kind:<4} {name:<30} {caller}"
+            )
+        text = "\n".join(lines)
+        print(text, file=file)
+        return text
+
+
+def _modules() -> List[Any]:
+    return [
+        module
+        for name, module in list(sys.modules.items())
+        if (name == "maxp" or name.startswith("maxp.")) and "rt" in vars(module)
+    ]
+
+
+@contextmanager
+def installRuntime(proxy: Any) -> Iterator[Any]:
+    """Contextually replace `rt` in every loaded maxp module with `proxy`.
+
+    The cache of compiled MAXScript functions is emptied, as functions compiled
+    before would bypass `proxy` and functions compiled inside are bound to it. The
+    previous values and cache are restored on exit, so installs can be nested.
+    """
+    from maxp.util import mxs
+
+    functions = dict(mxs.FUNCTIONS)
+    mxs.FUNCTIONS.clear()
+    previous: List[Tuple[Any, Any]] = []
+    for module in _modules():
+        previous.append((module, module.rt))
+        module.rt = proxy
+    try:
+        yield proxy
+    finally:
+        for module, runtime in reversed(previous):
+            module.rt = runtime
+        mxs.FUNCTIONS.clear()
+        mxs.FUNCTIONS.update(functions)
+
+
+def currentRuntime() -> Any:
+    """Return the `rt` currently installed in maxp (possibly a proxy)."""
+    import maxp.runtime
+
+    return maxp.runtime.rt
+
+
+@contextmanager
+def profileBridge() -> Iterator[BridgeProfiler]:
+    """Contextually count and time runtime calls made by maxp.
+
+    Usage::
+    ```python
+    with profileBridge() as p:
+        exporter.exportQueue()
+    p.report()
+    ```
+    """
+    with installRuntime(BridgeProfiler(currentRuntime())) as profiler:
+        yield profiler
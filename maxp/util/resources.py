@@ -0,0 +1,70 @@
+"""
+Resolve paths to files shipped alongside maxp modules.
+
+Results are memoized, and both '\\' and '/' separators are accepted regardless of
+the current platform. This module does not touch the 3ds Max runtime.
+"""
+
+# Standard
+import importlib.util
+import os
+import re
+from functools import lru_cache
+from typing import List
+
+SEPARATORS = re.compile(r"[\\/]+")
+
+
+def _leaves(filename: str) -> List[str]:
+    return [leaf for leaf in SEPARATORS.split(filename) if leaf not in ("", ".")]
+
+
+@lru_cache(maxsize=None)
+def relativeTo(anchor: str, filename: str) -> str:
+    """Resolve `filename` relative to the directory containing the file `anchor`.
+
+    Usage::
+    ```python
+    relativeTo(__file__, "..\\\\resources\\\\LightRig.max")
+    relativeTo(__file__, "../resources/LightRig.max")
+    ```
+
+    Args:
+        anchor (str): The file to resolve from, usually a module's `__file__`.
+        filename (str): The relative filename. Use '..' to go up a directory.
+
+    Returns:
+        str: The absolute, normalized filename.
+    """
+    root = os.path.dirname(os.path.abspath(anchor))
+    return os.path.normpath(os.path.join(root, *_leaves(filename)))
+
+
+@lru_cache(maxsize=None)
+def packagePath(package: str) -> str:
+    """Return the directory of the (importable) package `package`."""
+    spec = importlib.util.find_spec(package)
+    if spec is None or not spec.submodule_search_locations:
+        raise ModuleNotFoundError(f"{package} is not a package")
+    return os.path.abspath(list(spec.submodule_search_locations)[0])
+
+
+@lru_cache(maxsize=None)
+def resource(package: str, filename: str) -> str:
+    """Resolve `filename` relative to the directory of `package`.
+
+    Unlike `relativeTo`, this does not depend on which module asks for the file.
+
+    Usage::
+    ```python
+    resource("maxp", "resources/LightRig.max")
+    ```
+
+    Args:
+        package (str): The dotted package name, e.g. `maxp.tools`.
+        filename (str): The filename, relative to the package directory.
+
+    Returns:
+        str: The absolute, normalized filename.
+    """
+    return os.path.normpath(os.path.join(packagePath(package), *_leaves(filename)))
@@ -5,10 +5,203 @@ but handle Python typing.
 
 # Standard
 from cmath import isclose
-from typing import Any, List, Union
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Sequence, Tuple, Union
+
+# Third-party
+import numpy as np
 
 # Package
-from maxp import MXSWrapperBase, rt
+from maxp import MXSWrapperBase, pymxs, rt
+from maxp.util import keyreduce, mxs
+from maxp.util.batch import IDENTIFIER_PATTERN
+
+# Bulk transform access. Each of these reads or writes the transforms of every node
+# in a single MAXScript call.
+GET_TRANSFORMS_FN = """
+fn maxpGetTransforms nodes = (
+    for n in nodes collect n.transform
+)
+"""
+
+# Returns the indices of `nodes` ordered so that parents come before their children.
+# Moving a parent moves its children, so transforms are written in this order.
+HIERARCHY_ORDER_FN = """
+fn maxpHierarchyOrder nodes = (
+    local depths = for n in nodes collect (
+        local depth = 0
+        local p = n.parent
+        while p != undefined do (
+            depth += 1
+            p = p.parent
+        )
+        depth
+    )
+    local maxDepth = 0
+    for d in depths where d > maxDepth do maxDepth = d
+    local order = #()
+    for d = 0 to maxDepth do (
+        for i = 1 to nodes.count where depths[i] == d do append order i
+    )
+    order
+)
+"""
+
+SET_TRANSFORMS_FN = """
+fn maxpSetTransforms nodes transforms = (
+    for i in (maxpHierarchyOrder nodes) do nodes[i].transform = transforms[i]
+    ok
+)
+"""
+
+# All transforms are read before any is written, as zeroing a parent moves its
+# children
+ZERO_TRANSFORMS_FN = """
+fn maxpZeroTransforms nodes pos rot scl = (
+    local transforms = for n in nodes collect n.transform
+    for i in (maxpHierarchyOrder nodes) do (
+        local t = transforms[i]
+        local p = if pos then [0, 0, 0] else t.translationPart
+        local r = if rot then (quat 0 0 0 1) else t.rotationPart
+        local s = if scl then [1, 1, 1] else t.scalePart
+        nodes[i].transform = (scaleMatrix s) * (r as matrix3) * (transMatrix p)
+    )
+    transforms
+)
+"""
+
+# Read and write dotted property paths (e.g. "pos.x") by name. Writing a property of a
+# value type, such as a Point3, writes the changed value back to its owner, as
+# MAXScript does for `n.pos.x = 1`.
+PROPERTY_PATH_FN = """
+fn maxpGetPath obj path = (
+    for p in filterString path "." do obj = getProperty obj (p as name)
+    obj
+)
+fn maxpSetPath obj path value = (
+    local parts = for p in filterString path "." collect (p as name)
+    local objs = #(obj)
+    for i = 1 to parts.count - 1 do append objs (getProperty objs[i] parts[i])
+    local k = parts.count
+    setProperty objs[k] parts[k] value
+    while k > 1 and not isKindOf objs[k] MAXWrapper do (
+        setProperty objs[k - 1] parts[k - 1] objs[k]
+        k -= 1
+    )
+    ok
+)
+fn maxpMatches actual expected = (
+    local isFloat = isKindOf expected Float or isKindOf expected Double
+    if isFloat and isKindOf actual Number then (
+        local tolerance = 0.001 * (amax (abs actual) (abs expected))
+        (abs (actual - expected)) <= tolerance
+    ) else actual == expected
+)
+"""
+
+# Applies a transaction's writes. The current values are read first, so a missing
+# property fails before anything is written. The writes are then applied and read
+# back; if one fails or does not match, every property is restored, in reverse, and
+# #(index, actual value, error) of the failure is returned. Requires
+# `PROPERTY_PATH_FN`.
+TRANSACTION_FN = """
+fn maxpTransaction nodes props values = (
+    local previous = for j = 1 to nodes.count collect (maxpGetPath nodes[j] props[j])
+    local failure = undefined
+    local i = 0
+    try (
+        for j = 1 to nodes.count do (
+            i = j
+            maxpSetPath nodes[j] props[j] values[j]
+        )
+        for j = 1 to nodes.count while failure == undefined do (
+            i = j
+            local actual = maxpGetPath nodes[j] props[j]
+            if not maxpMatches actual values[j] do failure = #(j, actual, undefined)
+        )
+    ) catch (
+        failure = #(i, undefined, getCurrentException())
+    )
+    if failure != undefined do (
+        for j = nodes.count to 1 by -1 do (
+            try (maxpSetPath nodes[j] props[j] previous[j]) catch ()
+        )
+    )
+    failure
+)
+"""
+
+# Layers of nodes which maxp keeps for itself (e.g. the light rig template), which
+# `getNodes` leaves out
+INTERNAL_LAYERS: List[str] = []
+
+GET_NODES_FN = """
+fn maxpGetNodes layerNames = (
+    for n in objects where isValidNode n and findItem layerNames n.layer.name == 0 \\
+        collect n
+)
+"""
+
+# Animation sampling. Values are written as plain numbers, 9 significant digits each
+# so single precision values round-trip.
+FORMAT_VALUE_FN = """
+fn maxpFormatValue v ss = (
+    local parts = case classOf v of (
+        Matrix3: #(v.row1.x, v.row1.y, v.row1.z, v.row2.x, v.row2.y, v.row2.z, \\
+            v.row3.x, v.row3.y, v.row3.z, v.row4.x, v.row4.y, v.row4.z)
+        Point3: #(v.x, v.y, v.z)
+        Point2: #(v.x, v.y)
+        Point4: #(v.x, v.y, v.z, v.w)
+        Quat: #(v.x, v.y, v.z, v.w)
+        Color: #(v.r, v.g, v.b)
+        BooleanClass: #(if v then 1 else 0)
+        default: #(v as float)
+    )
+    for x in parts do format "% " (formattedPrint (x as float) format:".9g") to:ss
+)
+"""
+
+# The shape of each sampled value, by MAXScript class
+SAMPLE_SHAPES: Dict[str, Tuple[int, ...]] = {
+    "Matrix3": (4, 3),
+    "Point3": (3,),
+    "Point2": (2,),
+    "Point4": (4,),
+    "Quat": (4,),
+    "Color": (3,),
+}
+
+# Frames evaluated per MAXScript call by `iterSample`
+SAMPLE_CHUNK_SIZE = 100
+
+# Sample times, in frames
+Frames = Union[Sequence[float], np.ndarray]
+
+# Linear controllers assigned by `setKeys`, by node property, and the MAXScript
+# expression building a key value from `values` at offset `j`
+KEY_CONTROLLERS: Dict[str, Tuple[str, int, str]] = {
+    "pos": ("Linear_Position", 3, "[values[j + 1], values[j + 2], values[j + 3]]"),
+    "rotation": (
+        "Linear_Rotation",
+        4,
+        "quat values[j + 1] values[j + 2] values[j + 3] values[j + 4]",
+    ),
+    "scale": ("Linear_Scale", 3, "[values[j + 1], values[j + 2], values[j + 3]]"),
+}
+
+SET_KEYS_FN = """
+fn maxpSetKeys_{prop} nodes indices times values = (
+    for n in nodes do n.{prop}.controller = {controller}()
+    for k = 1 to indices.count do (
+        local j = (k - 1) * {width}
+        local v = {value}
+        with animate on at time (times[k] as time) (
+            nodes[indices[k]].{prop}.controller.value = v
+        )
+    )
+    ok
+)
+"""
 
 
 def isValid(node: rt.Node) -> bool:
@@ -77,14 +270,16 @@ def getNodesByName(names: List[str]) -> List[rt.Node]:
 
 
 def getNodes(type: Any = None, selected: bool = False) -> List[rt.Node]:
-    """Return all nodes in the scene. Optionally, if `type` is specified, return
-    only nodes of the specified type.
+    """Return all nodes in the scene, except those on `INTERNAL_LAYERS`. Optionally,
+    if `type` is specified, return only nodes of the specified type.
     """
     if selected:
         nodes = rt.GetCurrentSelection()
+    elif INTERNAL_LAYERS:
+        nodes = list(mxs.compileFunction(GET_NODES_FN)(INTERNAL_LAYERS))
     else:
         nodes = [node for node in rt.Objects if isValid(node)]
-    if not type:
+    if type:
         nodes = [node for node in nodes if isClass(node, type)]
     return nodes
 
@@ -139,7 +334,12 @@ def setProperty(node: rt.Node, name: str, value: Any) -> None:
 
     See Accessing Object Properties and Controllers on 3ds Max Python docs
     for more details.
+
+    Inside `transaction`, the value is buffered until the transaction ends.
     """
+    if TRANSACTIONS:
+        TRANSACTIONS[-1].setProperty(node, name, value)
+        return
     if not hasProperty(node, name):
         raise AttributeError(f"{node} has no property {name}")
     if isinstance(node, MXSWrapperBase):
@@ -150,3 +350,293 @@ def setProperty(node: rt.Node, name: str, value: Any) -> None:
         assert isclose(getProperty(node, name), (value), rel_tol=0.001)
     else:
         assert getProperty(node, name) == value
+
+
+def getTransforms(nodes: List[rt.Node]) -> rt.Array:
+    """Return the transform of every node in `nodes`, in one MAXScript call."""
+    return mxs.compileFunction(GET_TRANSFORMS_FN)(nodes)
+
+
+def setTransforms(
+    nodes: List[rt.Node], transforms: List[rt.Matrix3], buffer: bool = True
+) -> None:
+    """Set the transform of every node in `nodes`, in one MAXScript call.
+
+    Inside `transaction`, the transforms are buffered until the transaction ends,
+    unless `buffer` is False. `zeroTransforms` is never buffered, so transforms it
+    returns are restored with `buffer=False`.
+    """
+    if len(nodes) != len(transforms):
+        raise ValueError(f"Got {len(nodes)} nodes but {len(transforms)} transforms")
+    if TRANSACTIONS and buffer:
+        for node, transform in zip(nodes, transforms):
+            TRANSACTIONS[-1].setProperty(node, "transform", transform)
+        return
+    # Define maxpHierarchyOrder, which the transforms function calls
+    mxs.compileFunction(HIERARCHY_ORDER_FN)
+    mxs.compileFunction(SET_TRANSFORMS_FN)(nodes, transforms)
+
+
+def zeroTransforms(
+    nodes: List[rt.Node], pos: bool = True, rot: bool = True, scale: bool = True
+) -> rt.Array:
+    """Zero the position, rotation and/or scale of every node in `nodes`, in one
+    MAXScript call. Parents are zeroed before their children, so every node ends
+    up zeroed even when both a parent and its child are in `nodes`.
+
+    Returns:
+        rt.Array: The nodes' original transforms, for use with `setTransforms`.
+    """
+    # Define maxpHierarchyOrder, which the transforms function calls
+    mxs.compileFunction(HIERARCHY_ORDER_FN)
+    return mxs.compileFunction(ZERO_TRANSFORMS_FN)(nodes, pos, rot, scale)
+
+
+class Transaction:
+    """Buffered property writes, applied together by `flush`.
+
+    Use `transaction` rather than creating one directly.
+    """
+
+    def __init__(self, label: str) -> None:
+        self.label = label
+        self._writes: List[Tuple[rt.Node, str, Any]] = []
+
+    def __len__(self) -> int:
+        return len(self._writes)
+
+    def setProperty(self, node: rt.Node, name: str, value: Any) -> None:
+        self._writes.append((node, name, value))
+
+    def flush(self) -> None:
+        """Apply and verify the buffered writes under a single undo record, in one
+        MAXScript call with the same shape for every transaction.
+
+        The current values are read first, which fails before anything is written
+        if a property does not exist. The writes are then applied and read back. If
+        a write fails (RuntimeError), or a value does not match (ValueError), every
+        property is restored to its previous value and the error is raised.
+        """
+        writes, self._writes = self._writes, []
+        if not writes:
+            return
+
+        nodes, names, values = (list(column) for column in zip(*writes))
+        mxs.compileFunction(PROPERTY_PATH_FN)
+        with pymxs.undo(True, self.label):
+            failure = mxs.compileFunction(TRANSACTION_FN)(nodes, names, values)
+        if failure is None:
+            return
+        index, actual, error = failure
+        node, name, value = writes[index - 1]
+        if error is not None:
+            raise RuntimeError(f"Failed to set {node}.{name} to {value}: {error}")
+        raise ValueError(f"{node}.{name} is {actual}, expected {value}")
+
+
+# Active transactions, innermost last
+TRANSACTIONS: List[Transaction] = []
+
+
+@contextmanager
+def transaction(label: str = "maxp") -> Iterator[Transaction]:
+    """Contextually buffer `setProperty` and `setTransforms` writes, and apply them
+    atomically on exit, in one batched call under one undo record named `label`.
+
+    Reads made inside the transaction return the values from before it. If the block
+    raises, nothing is written. Nested transactions join the outermost one.
+
+    Usage::
+    ```python
+    with scene.transaction("Align props"):
+        for node in nodes:
+            scene.setProperty(node, "pos.z", 0.0)
+        scene.setTransforms(others, transforms)
+    ```
+    """
+    if TRANSACTIONS:
+        yield TRANSACTIONS[-1]
+        return
+
+    current = Transaction(label)
+    TRANSACTIONS.append(current)
+    try:
+        yield current
+    finally:
+        TRANSACTIONS.pop()
+    current.flush()
+
+
+def _sampleSources(props: Sequence[str]) -> Tuple[str, str]:
+    """Return the MAXScript sources which read the classes of `props` on a node, and
+    which sample `props` on many nodes over many frames."""
+    for prop in props:
+        if not IDENTIFIER_PATTERN.match(prop):
+            raise ValueError(f"Invalid property: {prop}")
+    classes = ", ".join(f"(classOf n.{prop}) as string" for prop in props)
+    formats = "\n".join(f"            maxpFormatValue n.{prop} ss" for prop in props)
+    classesFn = f"fn maxpSampleClasses n = #({classes})"
+    sampleFn = (
+        "fn maxpSample nodes frames = (\n"
+        '    local ss = stringStream ""\n'
+        "    for f in frames do at time (f as time) (\n"
+        "        for n in nodes do (\n"
+        f"{formats}\n"
+        "        )\n"
+        "    )\n"
+        "    ss as string\n"
+        ")"
+    )
+    return classesFn, sampleFn
+
+
+def iterSample(
+    nodes: List[rt.Node],
+    props: Union[str, Sequence[str]],
+    frames: Frames,
+    chunkSize: int = SAMPLE_CHUNK_SIZE,
+) -> Iterator[Tuple[np.ndarray, Dict[str, np.ndarray]]]:
+    """Sample `props` on `nodes` at `frames`, `chunkSize` frames at a time.
+
+    Each chunk is evaluated in one MAXScript call, which sets the time once per frame
+    and reads every property of every node at that time.
+
+    Yields:
+        Tuple[np.ndarray, Dict[str, np.ndarray]]: The frames in the chunk, and the
+            samples of each property as an (F, N, ...) array.
+    """
+    props = [props] if isinstance(props, str) else list(props)
+    frameArray: np.ndarray = np.asarray(frames, dtype=np.float64).ravel()
+    if not len(nodes) or not len(frameArray):
+        return
+
+    classesFn, sampleFn = _sampleSources(props)
+    mxs.compileFunction(FORMAT_VALUE_FN)
+    classes = list(mxs.compileFunction(classesFn)(nodes[0]))
+    shapes = [SAMPLE_SHAPES.get(str(cls), ()) for cls in classes]
+    widths = [int(np.prod(shape)) for shape in shapes]
+    offsets = np.cumsum([0] + widths)
+    sample = mxs.compileFunction(sampleFn)
+
+    for start in range(0, len(frameArray), chunkSize):
+        chunk = frameArray[start : start + chunkSize]
+        data = np.array(sample(nodes, chunk.tolist()).split(), dtype=np.float64)
+        expected = len(chunk) * len(nodes) * offsets[-1]
+        if data.size != expected:
+            raise ValueError(
+                f"Sampled {data.size} values, expected {expected}. Do all nodes "
+                f"have the same type of value for {props}?"
+            )
+        data = data.reshape(len(chunk), len(nodes), offsets[-1])
+        yield chunk, {
+            prop: data[:, :, offsets[i] : offsets[i + 1]].reshape(
+                (len(chunk), len(nodes)) + shapes[i]
+            )
+            for i, prop in enumerate(props)
+        }
+
+
+def sample(
+    nodes: List[rt.Node],
+    props: Union[str, Sequence[str]],
+    frames: Frames,
+    chunkSize: int = SAMPLE_CHUNK_SIZE,
+) -> Union[np.ndarray, Dict[str, np.ndarray]]:
+    """Sample animated `props` (e.g. "transform", or ["pos", "rotation"]) on
+    `nodes` at each of `frames`, which may include sub-frames.
+
+    Matrix3 values have the shape (4, 3) (rows), Point3 (3,), Quat (4,) (x, y, z, w)
+    and numbers (). See `iterSample` to process long frame ranges in chunks.
+
+    Usage::
+    ```python
+    transforms = scene.sample(bones, "transform", np.arange(0, 2000, 0.5))
+    transforms.shape  # (4000, len(bones), 4, 3)
+    ```
+
+    Returns:
+        Union[np.ndarray, Dict[str, np.ndarray]]: An (F, N, ...) array if `props`
+            is a single property, otherwise one array per property.
+    """
+    chunks = [samples for _, samples in iterSample(nodes, props, frames, chunkSize)]
+    names = [props] if isinstance(props, str) else list(props)
+    if chunks:
+        result = {n: np.concatenate([c[n] for c in chunks]) for n in names}
+    else:
+        result = {n: np.empty((0, len(nodes))) for n in names}
+    return result[props] if isinstance(props, str) else result
+
+
+def setKeys(
+    nodes: List[rt.Node],
+    prop: str,
+    frames: np.ndarray,
+    values: np.ndarray,
+    keys: np.ndarray,
+) -> int:
+    """Replace the `prop` ("pos", "rotation" or "scale") controller of each node
+    with a linear controller, keyed from sampled values in one MAXScript call.
+
+    Args:
+        nodes (List[rt.Node]): The N nodes.
+        prop (str): The transform property.
+        frames (np.ndarray): The (F,) sample times, in frames.
+        values (np.ndarray): The (F, N, ...) controller values, as returned by
+            `sample(nodes, f"{prop}.controller.value", frames)`.
+        keys (np.ndarray): An (F, N) boolean array of the samples to key, e.g. from
+            `keyreduce`.
+
+    Returns:
+        int: The number of keys set.
+    """
+    if prop not in KEY_CONTROLLERS:
+        raise ValueError(f"Cannot set keys on {prop}")
+    controller, width, value = KEY_CONTROLLERS[prop]
+    frameIndices, nodeIndices = np.nonzero(keys)
+    values = np.asarray(values, dtype=np.float64)
+    source = SET_KEYS_FN.format(
+        prop=prop, controller=controller, width=width, value=value
+    )
+    mxs.compileFunction(source)(
+        nodes,
+        (nodeIndices + 1).tolist(),
+        np.asarray(frames, dtype=np.float64)[frameIndices].tolist(),
+        values[frameIndices, nodeIndices].reshape(-1).tolist(),
+    )
+    return len(frameIndices)
+
+
+def reduceKeys(
+    nodes: List[rt.Node],
+    frames: Frames,
+    posTolerance: float = 0.01,
+    rotTolerance: float = 0.1,
+    scaleTolerance: float = 0.001,
+) -> Dict[str, float]:
+    """Bake the position, rotation and scale of `nodes` at `frames` onto linear
+    controllers, keeping only the keys needed to stay within tolerance.
+
+    Args:
+        posTolerance (float): The largest position error, in scene units.
+        rotTolerance (float): The largest rotation error, in degrees.
+        scaleTolerance (float): The largest scale error.
+
+    Returns:
+        Dict[str, float]: The compression ratio (samples per key) of each
+            property.
+    """
+    frameArray: np.ndarray = np.asarray(frames, dtype=np.float64)
+    props = {f"{prop}.controller.value": prop for prop in KEY_CONTROLLERS}
+    samples = sample(nodes, list(props), frameArray)
+    reducers = {
+        "pos": (keyreduce.reduceVectors, posTolerance),
+        "rotation": (keyreduce.reduceRotations, rotTolerance),
+        "scale": (keyreduce.reduceVectors, scaleTolerance),
+    }
+    ratios = {}
+    for path, prop in props.items():
+        reducer, tolerance = reducers[prop]
+        keys = reducer(frameArray, samples[path], tolerance)
+        setKeys(nodes, prop, frameArray, samples[path], keys)
+        ratios[prop] = keyreduce.compressionRatio(keys)
+    return ratios
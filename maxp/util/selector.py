@@ -0,0 +1,182 @@
+"""
+Select nodes with a query string, evaluated in a single MAXScript call.
+
+A query is a list of terms, all of which a node must match::
+
+    class:Editable_Poly layer:Props name:rock_* -hidden
+
+- `class:<class>` - the node's class is `<class>` (as `scene.isClass`).
+- `kind:<class>` - the node's class is or inherits `<class>` (as `scene.isSubClass`).
+- `name:<pattern>` - the node's name matches a pattern, where `*` matches any
+  characters and `?` any single character. Case-insensitive.
+- `layer:<pattern>` - the node's layer name matches a pattern.
+- `hidden`, `frozen`, `selected` - the node is hidden, frozen or selected.
+
+Terms can be negated with a leading `-`, values can be separated by commas to match
+any of them (`class:Box,Sphere`), and values with spaces can be quoted.
+
+Queries are parsed once into a cached `Plan`. The values of a query are passed to
+its MAXScript function as arguments, so queries of the same shape (e.g. differing
+only in names) share one compiled function. Exact (wildcard-free) names, layers and
+the selection are looked up directly, rather than by filtering every object.
+"""
+
+# Standard
+import shlex
+from functools import lru_cache
+from typing import Any, List, NamedTuple, Optional, Tuple
+
+# Package
+from maxp import rt
+from maxp.util import mxs
+from maxp.util.batch import IDENTIFIER_PATTERN
+
+HELPERS_FN = """
+fn maxpResolveClasses names = (
+    for name in names collect (execute name)
+)
+fn maxpMatchAny s patterns = (
+    for p in patterns do if matchPattern s pattern:p ignoreCase:true do return true
+    false
+)
+fn maxpIsAnyKindOf n classes = (
+    for c in classes do if isKindOf n c do return true
+    false
+)
+fn maxpNodesByName names = (
+    local result = #()
+    for name in names do join result (getNodeByName name all:true)
+    result
+)
+fn maxpLayerNodes names = (
+    local result = #()
+    for name in names do (
+        local layer = LayerManager.getLayerFromName name
+        if layer != undefined do (
+            local nodes
+            layer.nodes &nodes
+            join result nodes
+        )
+    )
+    result
+)
+"""
+
+# MAXScript conditions for each key, given the node `n` and the term's values `v`
+CONDITIONS = {
+    "class": "findItem {v} (classOf n) > 0",
+    "kind": "maxpIsAnyKindOf n {v}",
+    "name": "maxpMatchAny n.name {v}",
+    "layer": "maxpMatchAny n.layer.name {v}",
+    "hidden": "n.isHiddenInVpt",
+    "frozen": "n.isFrozen",
+    "selected": "n.isSelected",
+}
+
+FLAGS = ["hidden", "frozen", "selected"]
+
+# Keys whose (non-negated, wildcard-free) values can be looked up directly, in order
+# of preference, and the MAXScript expression returning their candidate nodes
+SOURCES = [
+    ("name", "maxpNodesByName {v}"),
+    ("layer", "maxpLayerNodes {v}"),
+    ("selected", "(selection as array)"),
+]
+
+WILDCARDS = "*?"
+
+
+class Term(NamedTuple):
+    key: str
+    values: Tuple[str, ...]
+    negate: bool = False
+
+
+class Plan(NamedTuple):
+    """A parsed query: the MAXScript function source which evaluates it, and the
+    values to pass to that function."""
+
+    terms: Tuple[Term, ...]
+    source: str
+    values: Tuple[Tuple[str, ...], ...]
+
+
+def _parseTerm(token: str) -> Term:
+    negate = token.startswith("-")
+    if negate:
+        token = token[1:]
+    key, sep, value = token.partition(":")
+    key = key.lower()
+    if key not in CONDITIONS:
+        raise ValueError(f"Unknown selector term: {token}")
+    if key in FLAGS:
+        if sep:
+            raise ValueError(f"Selector term {key} does not take a value")
+        return Term(key, (), negate)
+    values = tuple(v for v in value.split(",") if v)
+    if not values:
+        raise ValueError(f"Selector term {key} needs a value")
+    if key in ("class", "kind"):
+        for v in values:
+            if not IDENTIFIER_PATTERN.match(v):
+                raise ValueError(f"Invalid class name: {v}")
+    return Term(key, values, negate)
+
+
+def _isExact(term: Term) -> bool:
+    return not term.negate and not any(c in v for v in term.values for c in WILDCARDS)
+
+
+@lru_cache(maxsize=256)
+def plan(query: str) -> Plan:
+    """Parse `query` into a `Plan`. Raises ValueError if the query is invalid."""
+    terms = tuple(_parseTerm(token) for token in shlex.split(query))
+
+    lines = []
+    conditions = []
+    values = []
+    for i, term in enumerate(terms, start=1):
+        name = f"v{i}"
+        if term.key in ("class", "kind"):
+            lines.append(f"    local {name} = maxpResolveClasses values[{i}]")
+        else:
+            lines.append(f"    local {name} = values[{i}]")
+        condition = CONDITIONS[term.key].format(v=name)
+        conditions.append(f"not ({condition})" if term.negate else f"({condition})")
+        values.append(term.values)
+
+    source = "objects"
+    for key, expression in SOURCES:
+        index = next(
+            (i for i, t in enumerate(terms, start=1) if t.key == key and _isExact(t)),
+            None,
+        )
+        if index is not None:
+            source = expression.format(v=f"v{index}")
+            break
+
+    where = " and ".join(conditions) or "true"
+    body = "\n".join(lines)
+    functionSource = (
+        "fn maxpSelect values nodes = (\n"
+        f"{body}\n"
+        f"    local source = if nodes == undefined then {source} else nodes\n"
+        f"    for n in source where isValidNode n and {where} collect n\n"
+        ")"
+    )
+    return Plan(terms, functionSource, tuple(values))
+
+
+def select(query: str, nodes: Optional[List[rt.Node]] = None) -> List[rt.Node]:
+    """Return the nodes in the scene (or in `nodes`) which match `query`.
+
+    Usage::
+    ```python
+    rocks = selector.select("class:Editable_Poly name:rock_* -hidden")
+    ```
+    """
+    queryPlan = plan(query)
+    mxs.compileFunction(HELPERS_FN)
+    func = mxs.compileFunction(queryPlan.source)
+    values: List[Any] = [list(v) for v in queryPlan.values]
+    return list(func(values, nodes))
@@ -0,0 +1,505 @@
+"""
+Record the runtime traffic of a 3ds Max session, and replay it without 3ds Max.
+
+While recording, `rt` is replaced in every loaded maxp module (as when profiling)
+with a proxy which logs each operation: runtime function calls and property access,
+and the same on every value they return. Each event stores its arguments, result and
+time taken. Values which cannot be stored (nodes, arrays, ...) are stored as numbered
+references, so later operations on them can be matched.
+
+Replaying installs a runtime which answers each operation from the trace, in order.
+When pymxs and qtmax are not importable (e.g. on a build machine), stand-in modules
+are installed, so maxp can be imported and driven as in the recorded session.
+
+Callbacks made by 3ds Max into Python (e.g. `callbacks.add` handlers) are not
+replayed.
+
+Usage::
+```python
+# In 3ds Max
+with trace.record("C:\\\\traces\\\\export.trace"):
+    exporter.exportQueue()
+
+# Anywhere
+with trace.replay("export.trace") as replayer:
+    exporter.exportQueue()
+print(replayer.elapsed)
+```
+"""
+
+# Standard
+import builtins
+import contextlib
+import importlib.util
+import marshal
+import sys
+import time
+import types
+import zlib
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+# Package
+from maxp.util import profiler
+
+TRACE_VERSION = 1
+MARSHAL_VERSION = 4
+COMPRESSION_LEVEL = 6
+
+# Operations
+GET = "get"
+SET = "set"
+CALL = "call"
+ITEM = "item"
+SET_ITEM = "setitem"
+ITER = "iter"
+LEN = "len"
+CONTAINS = "contains"
+EQ = "eq"
+HASH = "hash"
+BOOL = "bool"
+STR = "str"
+
+# Tags of encoded values which are not stored as themselves
+LIST = "l"
+TUPLE = "t"
+DICT = "d"
+REF = "r"
+FUNCTION = "f"
+OBJECT = "o"
+ERROR = "e"
+
+PRIMITIVES = (type(None), bool, int, float, str)
+
+# (operation, reference, name, args, kwargs, result, seconds)
+Event = Tuple[str, int, str, tuple, tuple, Any, float]
+
+
+class TraceError(Exception):
+    pass
+
+
+class TraceMismatchError(TraceError):
+    def __init__(self, position: int, expected: Any, actual: Any) -> None:
+        msg = f"Trace diverged at event {position}: expected {expected}, got {actual}"
+        super().__init__(msg)
+
+
+def _encodeArg(value: Any) -> Any:
+    """Encode an argument passed into the runtime, for storing or matching."""
+    if isinstance(value, PRIMITIVES):
+        return value
+    if isinstance(value, (TracedValue, ReplayValue)):
+        return (REF, value._ref, value._typeName)
+    if isinstance(value, list):
+        return (LIST, tuple(_encodeArg(v) for v in value))
+    if isinstance(value, tuple):
+        return (TUPLE, tuple(_encodeArg(v) for v in value))
+    if isinstance(value, dict):
+        return (DICT, tuple((_encodeArg(k), _encodeArg(v)) for k, v in value.items()))
+    if callable(value):
+        return (FUNCTION, getattr(value, "__qualname__", type(value).__name__))
+    return (OBJECT, type(value).__name__)
+
+
+def _encodeArgs(args: tuple, kwargs: dict) -> Tuple[tuple, tuple]:
+    encodedArgs = tuple(_encodeArg(arg) for arg in args)
+    encodedKwargs = tuple((k, _encodeArg(v)) for k, v in sorted(kwargs.items()))
+    return encodedArgs, encodedKwargs
+
+
+def _unwrap(value: Any) -> Any:
+    if isinstance(value, TracedValue):
+        return value._value
+    if isinstance(value, list):
+        return [_unwrap(v) for v in value]
+    if isinstance(value, tuple):
+        return tuple(_unwrap(v) for v in value)
+    if isinstance(value, dict):
+        return {k: _unwrap(v) for k, v in value.items()}
+    return profiler._unwrap(value)
+
+
+class Recorder:
+    """Records operations made through its `runtime` proxy."""
+
+    def __init__(self, runtime: Any) -> None:
+        self.events: List[Event] = []
+        self._refs = 1
+        self.runtime = TracedValue(self, 0, runtime)
+
+    def _wrap(self, value: Any) -> Tuple[Any, Any]:
+        """Return `value` encoded, and `value` with runtime values made traceable."""
+        if isinstance(value, PRIMITIVES):
+            return value, value
+        if isinstance(value, (list, tuple)):
+            pairs = [self._wrap(v) for v in value]
+            tag = LIST if isinstance(value, list) else TUPLE
+            wrapped = [w for _, w in pairs]
+            encoded = (tag, tuple(e for e, _ in pairs))
+            return encoded, wrapped if tag == LIST else tuple(wrapped)
+        if isinstance(value, dict):
+            pairs = [(k, self._wrap(v)) for k, v in value.items()]
+            encoded = (DICT, tuple((_encodeArg(k), e) for k, (e, _) in pairs))
+            return encoded, {k: w for k, (_, w) in pairs}
+        ref = self._refs
+        self._refs += 1
+        traced = TracedValue(self, ref, value)
+        return (REF, ref, traced._typeName), traced
+
+    def record(
+        self, op: str, ref: int, name: str, args: tuple, kwargs: dict, func: Callable
+    ) -> Any:
+        encodedArgs, encodedKwargs = _encodeArgs(args, kwargs)
+        start = time.perf_counter()
+        try:
+            result = func()
+        except Exception as e:
+            error = (ERROR, type(e).__name__, str(e))
+            elapsed = time.perf_counter() - start
+            self.events.append(
+                (op, ref, name, encodedArgs, encodedKwargs, error, elapsed)
+            )
+            raise
+        elapsed = time.perf_counter() - start
+        encoded, wrapped = self._wrap(result)
+        self.events.append(
+            (op, ref, name, encodedArgs, encodedKwargs, encoded, elapsed)
+        )
+        return wrapped
+
+    def save(self, filename: str) -> None:
+        data = marshal.dumps((TRACE_VERSION, self.events), MARSHAL_VERSION)
+        with open(filename, "wb") as f:
+            f.write(zlib.compress(data, COMPRESSION_LEVEL))
+
+
+class TracedValue:
+    """Proxy for a runtime value (or the runtime itself) which records every
+    operation made on it. Passes `isinstance` checks for the wrapped value's type."""
+
+    def __init__(self, recorder: Recorder, ref: int, value: Any) -> None:
+        object.__setattr__(self, "_recorder", recorder)
+        object.__setattr__(self, "_ref", ref)
+        object.__setattr__(self, "_value", value)
+        object.__setattr__(self, "_typeName", type(value).__name__)
+
+    @property  # type: ignore
+    def __class__(self) -> type:
+        return type(self._value)
+
+    def _record(self, op: str, name: str, args: tuple, func: Callable) -> Any:
+        return self._recorder.record(op, self._ref, name, args, {}, func)
+
+    def __getattr__(self, name: str) -> Any:
+        return self._record(GET, name, (), lambda: getattr(self._value, name))
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        self._record(
+            SET, name, (value,), lambda: setattr(self._value, name, _unwrap(value))
+        )
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        return self._recorder.record(
+            CALL,
+            self._ref,
+            "",
+            args,
+            kwargs,
+            lambda: self._value(*_unwrap(args), **_unwrap(kwargs)),
+        )
+
+    def __getitem__(self, key: Any) -> Any:
+        return self._record(ITEM, "", (key,), lambda: self._value[_unwrap(key)])
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        def func() -> None:
+            self._value[_unwrap(key)] = _unwrap(value)
+
+        self._record(SET_ITEM, "", (key, value), func)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._record(ITER, "", (), lambda: list(self._value)))
+
+    def __len__(self) -> int:
+        return self._record(LEN, "", (), lambda: len(self._value))
+
+    def __contains__(self, item: Any) -> bool:
+        return self._record(CONTAINS, "", (item,), lambda: _unwrap(item) in self._value)
+
+    def __eq__(self, other: Any) -> bool:
+        return self._record(EQ, "", (other,), lambda: self._value == _unwrap(other))
+
+    def __ne__(self, other: Any) -> bool:
+        return not self == other
+
+    def __hash__(self) -> int:
+        return self._record(HASH, "", (), lambda: hash(self._value))
+
+    def __bool__(self) -> bool:
+        return self._record(BOOL, "", (), lambda: bool(self._value))
+
+    def __str__(self) -> str:
+        return self._record(STR, "", (), lambda: str(self._value))
+
+    def __repr__(self) -> str:
+        return f"<traced {self._typeName} #{self._ref}>"
+
+
+def load(filename: str) -> List[Event]:
+    """Return the events stored in the trace `filename`."""
+    with open(filename, "rb") as f:
+        version, events = marshal.loads(zlib.decompress(f.read()))
+    if version != TRACE_VERSION:
+        raise TraceError(f"Unsupported trace version {version} in {filename}")
+    return events
+
+
+class Replayer:
+    """Answers operations made through its `runtime` from recorded events.
+
+    Operations must be made in the recorded order. If `strict` is off, recorded
+    events are skipped until one matches, so a trace can be replayed against code
+    which makes fewer (or reordered) calls.
+    """
+
+    def __init__(
+        self, events: List[Event], strict: bool = True, realtime: bool = False
+    ) -> None:
+        """
+        Args:
+            events (List[Event]): The recorded events.
+            strict (bool): Raise `TraceMismatchError` on the first operation which
+                does not match the next event.
+            realtime (bool): Sleep for each event's recorded time, so wall times
+                include the time spent in 3ds Max.
+        """
+        self.events = events
+        self.strict = strict
+        self.realtime = realtime
+        self.position = 0
+        self.skipped = 0
+        self.elapsed = 0.0
+        self.runtime = ReplayValue(self, 0, "runtime")
+
+    @property
+    def remaining(self) -> int:
+        return len(self.events) - self.position
+
+    def _find(self, key: tuple) -> int:
+        for i in range(self.position, len(self.events)):
+            if self.events[i][:5] == key:
+                return i
+        return -1
+
+    def _decode(self, value: Any) -> Any:
+        if not isinstance(value, tuple):
+            return value
+        tag = value[0]
+        if tag == LIST:
+            return [self._decode(v) for v in value[1]]
+        if tag == TUPLE:
+            return tuple(self._decode(v) for v in value[1])
+        if tag == DICT:
+            return {self._decode(k): self._decode(v) for k, v in value[1]}
+        if tag == REF:
+            return ReplayValue(self, value[1], value[2])
+        if tag == ERROR:
+            error = getattr(builtins, value[1], None)
+            if not (isinstance(error, type) and issubclass(error, Exception)):
+                error = RuntimeError
+            raise error(value[2])
+        raise TraceError(f"Cannot decode {value}")
+
+    def replay(self, op: str, ref: int, name: str, args: tuple, kwargs: dict) -> Any:
+        key = (op, ref, name) + _encodeArgs(args, kwargs)
+        index = self.position
+        if index >= len(self.events) or self.events[index][:5] != key:
+            expected = self.events[index][:5] if index < len(self.events) else None
+            index = -1 if self.strict else self._find(key)
+            if index < 0:
+                raise TraceMismatchError(self.position, expected, key)
+            self.skipped += index - self.position
+
+        event = self.events[index]
+        self.position = index + 1
+        self.elapsed += event[6]
+        if self.realtime:
+            time.sleep(event[6])
+        return self._decode(event[5])
+
+
+def _wrapperBase() -> type:
+    pymxs = sys.modules.get("pymxs")
+    return getattr(pymxs, "MXSWrapperBase", object)
+
+
+class ReplayValue:
+    """Stand-in for a recorded runtime value (or the runtime itself). Passes
+    `isinstance` checks for `pymxs.MXSWrapperBase`."""
+
+    def __init__(self, replayer: Replayer, ref: int, typeName: str) -> None:
+        object.__setattr__(self, "_replayer", replayer)
+        object.__setattr__(self, "_ref", ref)
+        object.__setattr__(self, "_typeName", typeName)
+
+    @property  # type: ignore
+    def __class__(self) -> type:
+        return _wrapperBase()
+
+    def _replay(self, op: str, name: str = "", *args: Any, **kwargs: Any) -> Any:
+        return self._replayer.replay(op, self._ref, name, args, kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        return self._replay(GET, name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        self._replay(SET, name, value)
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        return self._replay(CALL, "", *args, **kwargs)
+
+    def __getitem__(self, key: Any) -> Any:
+        return self._replay(ITEM, "", key)
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        self._replay(SET_ITEM, "", key, value)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._replay(ITER))
+
+    def __len__(self) -> int:
+        return self._replay(LEN)
+
+    def __contains__(self, item: Any) -> bool:
+        return self._replay(CONTAINS, "", item)
+
+    def __eq__(self, other: Any) -> bool:
+        return self._replay(EQ, "", other)
+
+    def __ne__(self, other: Any) -> bool:
+        return not self == other
+
+    def __hash__(self) -> int:
+        return self._replay(HASH)
+
+    def __bool__(self) -> bool:
+        return self._replay(BOOL)
+
+    def __str__(self) -> str:
+        return self._replay(STR)
+
+    def __repr__(self) -> str:
+        return f"<replayed {self._typeName} #{self._ref}>"
+
+
+# The replayer answering the stand-in pymxs runtime
+REPLAYER: Optional[Replayer] = None
+
+
+class _Placeholder:
+    """Inert value returned by the stand-in runtime outside of a replay, e.g. for
+    runtime classes used in module-level annotations."""
+
+    def __init__(self, name: str) -> None:
+        self._name = name
+
+    def __getattr__(self, name: str) -> "_Placeholder":
+        return _Placeholder(f"{self._name}.{name}")
+
+    def __call__(self, *args: Any, **kwargs: Any) -> "_Placeholder":
+        return _Placeholder(f"{self._name}()")
+
+    def __repr__(self) -> str:
+        return f"<placeholder {self._name}>"
+
+
+class _ActiveRuntime:
+    """The stand-in `pymxs.runtime`, which forwards to the active replayer."""
+
+    def __getattr__(self, name: str) -> Any:
+        if REPLAYER is None:
+            return _Placeholder(name)
+        return getattr(REPLAYER.runtime, name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if REPLAYER is None:
+            raise TraceError("No trace is being replayed")
+        setattr(REPLAYER.runtime, name, value)
+
+
+class _Wrapper:
+    pass
+
+
+@contextlib.contextmanager
+def _noop(*args: Any, **kwargs: Any) -> Iterator[None]:
+    yield
+
+
+def _module(name: str, attributes: Dict[str, Any]) -> types.ModuleType:
+    module = types.ModuleType(name)
+    module.__dict__.update(attributes)
+    return module
+
+
+def installModules() -> List[str]:
+    """Install stand-in pymxs and qtmax modules in `sys.modules`, where the real
+    ones cannot be imported.
+
+    Returns:
+        List[str]: The names of the modules installed.
+    """
+    modules: Dict[str, Dict[str, Any]] = {
+        "pymxs": {
+            "runtime": _ActiveRuntime(),
+            "MXSWrapperBase": type("MXSWrapperBase", (_Wrapper,), {}),
+            "MXSWrapperObjectSet": type("MXSWrapperObjectSet", (_Wrapper,), {}),
+            "MXSWrapperObjectSetIter": type("MXSWrapperObjectSetIter", (_Wrapper,), {}),
+            "mxsreference": lambda value: value,
+            "mxstoken": lambda: None,
+            "animate": _noop,
+            "attime": _noop,
+            "quiet": _noop,
+            "redraw": _noop,
+            "undo": _noop,
+        },
+        "qtmax": {"GetQMaxMainWindow": lambda: None},
+    }
+    installed = []
+    for name, attributes in modules.items():
+        if name in sys.modules or importlib.util.find_spec(name) is not None:
+            continue
+        sys.modules[name] = _module(name, attributes)
+        installed.append(name)
+    return installed
+
+
+@contextlib.contextmanager
+def record(filename: str) -> Iterator[Recorder]:
+    """Contextually record the runtime operations made by maxp to `filename`.
+
+    The trace is written on exit, including when an exception is raised.
+    """
+    recorder = Recorder(profiler.currentRuntime())
+    try:
+        with profiler.installRuntime(recorder.runtime):
+            yield recorder
+    finally:
+        recorder.save(filename)
+
+
+@contextlib.contextmanager
+def replay(
+    filename: str, strict: bool = True, realtime: bool = False
+) -> Iterator[Replayer]:
+    """Contextually answer the runtime operations made by maxp from the trace
+    `filename`. See `Replayer` for `strict` and `realtime`."""
+    global REPLAYER
+    installModules()
+    previous = REPLAYER
+    REPLAYER = Replayer(load(filename), strict=strict, realtime=realtime)
+    try:
+        with profiler.installRuntime(REPLAYER.runtime):
+            yield REPLAYER
+    finally:
+        REPLAYER = previous
@@ -0,0 +1,305 @@
+"""
+Cached, batched access to node user properties.
+
+A node's user properties are stored by 3ds Max as one text buffer of `key = value`
+lines. `UserPropStore` reads the whole buffer of many nodes in a single MAXScript
+call and parses it once. Each read then costs one bridge call, for the node's
+handle, however many keys it reads; `getMany` and `getAll` read many keys at once.
+Values returned are copies, so changing them does not change the store. Values
+are parsed as Python literals where possible (numbers, booleans, lists, dicts, ...)
+and are otherwise kept as strings. Writes are cached and written back together by
+`flush`.
+
+Cached buffers are invalidated when user properties are changed by anything other
+than the store (e.g. the Object Properties dialog), and cleared when a scene is
+reset or opened. The callbacks only hold a weak reference to the store, and are
+removed by `close` or once the store is garbage collected.
+"""
+
+# Standard
+import ast
+import copy
+import weakref
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# Package
+from maxp import rt
+from maxp.util import callbacks, mxs
+from maxp.util.callbacks import GeneralEvent
+
+# Returns #(handle, buffer) for each node
+GET_BUFFERS_FN = """
+fn maxpGetUserPropBuffers nodes = (
+    for n in nodes collect #(n.handle, getUserPropBuffer n)
+)
+"""
+
+SET_BUFFERS_FN = """
+fn maxpSetUserPropBuffers nodes buffers = (
+    for i = 1 to nodes.count do setUserPropBuffer nodes[i] buffers[i]
+    ok
+)
+"""
+
+# Prefix of the callback id of each store
+CALLBACK_ID = "maxpUserProps"
+
+# Events after which every cached buffer is stale
+RESET_EVENTS = [
+    GeneralEvent.systemPostReset,
+    GeneralEvent.systemPostNew,
+    GeneralEvent.filePostOpen,
+]
+
+# Leading characters of values which may be Python literals
+LITERAL_PREFIXES = tuple("[{(\"'-.0123456789")
+LITERAL_NAMES = {"None": None, "True": True, "False": False}
+# 3ds Max writes booleans set with setUserProp in lower case
+BOOLEAN_NAMES = {"true": True, "false": False}
+
+UserProps = Dict[str, Any]
+
+
+def parseValue(text: str) -> Any:
+    """Return a user property value as a Python literal, or as `text` if it is not
+    one."""
+    if text in LITERAL_NAMES:
+        return LITERAL_NAMES[text]
+    if text in BOOLEAN_NAMES:
+        return BOOLEAN_NAMES[text]
+    if not text.startswith(LITERAL_PREFIXES):
+        return text
+    try:
+        return int(text)
+    except ValueError:
+        pass
+    try:
+        return float(text)
+    except ValueError:
+        pass
+    try:
+        return ast.literal_eval(text)
+    except (ValueError, SyntaxError):
+        return text
+
+
+def formatValue(value: Any) -> str:
+    """Return `value` as user property text which `parseValue` reads back as
+    `value`. Strings are written as they are, unless they would read back as
+    another type, or span lines or have surrounding whitespace, which the buffer
+    would not keep."""
+    if isinstance(value, str):
+        plain = value == value.strip() and len(value.splitlines()) <= 1
+        return value if plain and parseValue(value) == value else repr(value)
+    return repr(value)
+
+
+def parseBuffer(buffer: str) -> UserProps:
+    """Parse a user property buffer into a dict. Lines without a `=` are kept as
+    keys with the value None."""
+    props: UserProps = {}
+    for line in buffer.splitlines():
+        key, sep, value = line.partition("=")
+        key = key.strip()
+        if key:
+            props[key] = parseValue(value.strip()) if sep else None
+    return props
+
+
+def formatBuffer(props: UserProps) -> str:
+    """Return `props` as a user property buffer."""
+    lines = []
+    for key, value in props.items():
+        lines.append(key if value is None else f"{key} = {formatValue(value)}")
+    return "\r\n".join(lines)
+
+
+def _removeCallbacks(callbackId: str) -> None:
+    callbacks.remove(GeneralEvent.postNodeUserPropChanged, id=callbackId)
+    for event in RESET_EVENTS:
+        callbacks.remove(event, id=callbackId)
+
+
+def _weakCallback(store: "UserPropStore", method: str) -> Callable:
+    """Return a callback which calls `method` of `store` without keeping the store
+    alive. Once the store is collected, the callback removes the store's
+    callbacks."""
+    ref = weakref.ref(store)
+    callbackId = store._callbackId
+
+    def callback(*args: Any) -> None:
+        target = ref()
+        if target is None:
+            _removeCallbacks(callbackId)
+            return
+        getattr(target, method)(*args)
+
+    return callback
+
+
+class UserPropStore:
+    """Cache of parsed user properties, keyed by node handle.
+
+    Usage::
+    ```python
+    with UserPropStore() as store:
+        store.load(nodes)  # One call for all nodes
+        settings = [store.getMany(node, ["lods", "collision"]) for node in nodes]
+        for node in nodes:
+            store.set(node, "exported", True)
+    # Written back in one call, and the callbacks removed, on exit
+    ```
+    """
+
+    def __init__(self, watch: bool = True) -> None:
+        """
+        Args:
+            watch (bool): Invalidate cached buffers when user properties are changed
+                outside the store. See `watch`.
+        """
+        self._cache: Dict[int, UserProps] = {}
+        self._dirty: Dict[int, Tuple[rt.Node, UserProps]] = {}
+        self._writing = False
+        self._watch = watch
+        self._watching = False
+        self._callbackId = f"{CALLBACK_ID}{id(self)}"
+        if watch:
+            self.watch()
+
+    def __enter__(self) -> "UserPropStore":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def watch(self) -> None:
+        """Add the callbacks which invalidate the cache."""
+        if self._watching:
+            return
+        callbacks.add(
+            GeneralEvent.postNodeUserPropChanged,
+            _weakCallback(self, "_onChanged"),
+            id=self._callbackId,
+        )
+        onReset = _weakCallback(self, "_onReset")
+        for event in RESET_EVENTS:
+            callbacks.add(event, onReset, id=self._callbackId)
+        self._watching = True
+
+    def unwatch(self) -> None:
+        """Remove the callbacks which invalidate the cache."""
+        if not self._watching:
+            return
+        _removeCallbacks(self._callbackId)
+        self._watching = False
+
+    def close(self) -> None:
+        """Write any changes, remove the callbacks and drop the cache. Using the
+        store again reloads the user properties, and watches again if it was created
+        with `watch`."""
+        self.flush()
+        self.unwatch()
+        self._cache.clear()
+
+    def _onChanged(self, *args: Any) -> None:
+        if self._writing:
+            return
+        node = rt.Callbacks.NotificationParam()
+        if rt.IsValidNode(node):
+            self.invalidate([node])
+        else:
+            self.invalidate()
+
+    def _onReset(self, *args: Any) -> None:
+        self._cache.clear()
+        self._dirty.clear()
+
+    def load(self, nodes: Iterable[rt.Node], reload: bool = False) -> None:
+        """Read and parse the user properties of `nodes` which are not cached yet
+        (or all of them, if `reload` is set), in a single MAXScript call."""
+        nodes = list(nodes)
+        if not nodes:
+            return
+        if self._watch:
+            self.watch()
+        for handle, buffer in mxs.compileFunction(GET_BUFFERS_FN)(nodes):
+            handle = int(handle)
+            if reload or handle not in self._cache:
+                self._cache[handle] = parseBuffer(str(buffer))
+
+    def _props(self, node: rt.Node) -> Tuple[int, UserProps]:
+        """Return the handle and cached user properties of `node`, reading the
+        handle once."""
+        handle = int(node.handle)
+        props = self._cache.get(handle)
+        if props is None:
+            self.load([node])
+            props = self._cache[handle]
+        return handle, props
+
+    def getAll(self, node: rt.Node) -> UserProps:
+        """Return a copy of all of the user properties of `node`."""
+        return copy.deepcopy(self._props(node)[1])
+
+    def getMany(
+        self, node: rt.Node, keys: Iterable[str], default: Any = None
+    ) -> UserProps:
+        """Return a copy of the values of `keys` of `node`, or `default` for keys it
+        does not have."""
+        props = self._props(node)[1]
+        return {key: copy.deepcopy(props.get(key, default)) for key in keys}
+
+    def has(self, node: rt.Node, key: str) -> bool:
+        return key in self._props(node)[1]
+
+    def get(self, node: rt.Node, key: str, default: Any = None) -> Any:
+        """Return a copy of the value of `key` of `node`, or `default`."""
+        return copy.deepcopy(self._props(node)[1].get(key, default))
+
+    def set(self, node: rt.Node, key: str, value: Any) -> None:
+        """Set the user property `key` of `node`. It is written on `flush`."""
+        handle, props = self._props(node)
+        props[key] = value
+        self._dirty[handle] = (node, props)
+
+    def update(self, node: rt.Node, values: UserProps) -> None:
+        """Set several user properties of `node`. They are written on `flush`."""
+        handle, props = self._props(node)
+        props.update(values)
+        self._dirty[handle] = (node, props)
+
+    def delete(self, node: rt.Node, key: str) -> None:
+        handle, props = self._props(node)
+        if key in props:
+            del props[key]
+            self._dirty[handle] = (node, props)
+
+    def flush(self) -> None:
+        """Write the user properties of every changed node in a single MAXScript
+        call."""
+        if not self._dirty:
+            return
+        dirty = list(self._dirty.values())
+        self._dirty.clear()
+        nodes = [node for node, _ in dirty]
+        buffers = [formatBuffer(props) for _, props in dirty]
+        self._writing = True
+        try:
+            mxs.compileFunction(SET_BUFFERS_FN)(nodes, buffers)
+        finally:
+            self._writing = False
+
+    def invalidate(self, nodes: Optional[List[rt.Node]] = None) -> None:
+        """Drop the cached user properties of `nodes`, or of every node. Unflushed
+        changes to those nodes are lost."""
+        if nodes is None:
+            self._cache.clear()
+            self._dirty.clear()
+            return
+        for node in nodes:
+            handle = int(node.handle)
+            self._cache.pop(handle, None)
+            self._dirty.pop(handle, None)
@@ -1,9 +1,169 @@
+"""
+Conversion between Python values and MAXScript values.
+
+Each conversion crosses the pymxs bridge once: data is handed to a compiled
+MAXScript function as a single Python list (or returned from one as a single
+string) rather than appended or read an element at a time.
+"""
+
+# Standard
+import ast
+from typing import Any, Iterable, List
+
+# Third-party
+import numpy as np
+
 # Package
 from maxp import rt
+from maxp.util import mxs
+
+# pymxs converts a Python list argument into a MAXScript array
+IDENTITY_FN = "fn maxpIdentity a = a"
+
+TO_POINT3_ARRAY_FN = """
+fn maxpToPoint3Array flat = (
+    local count = flat.count / 3
+    local result = #()
+    result.count = count
+    for i = 1 to count do (
+        local j = i * 3
+        result[i] = [flat[j - 2], flat[j - 1], flat[j]]
+    )
+    result
+)
+"""
+
+TO_BIT_ARRAY_FN = "fn maxpToBitArray a = (a as bitArray)"
+
+# MAXScript floats are single precision, so 9 significant digits round-trip
+FROM_FLOAT_ARRAY_FN = """
+fn maxpFromFloatArray a = (
+    local ss = stringStream ""
+    for v in a do format "% " (formattedPrint (v as float) format:".9g") to:ss
+    ss as string
+)
+"""
+
+FROM_POINT3_ARRAY_FN = """
+fn maxpFromPoint3Array a = (
+    local ss = stringStream ""
+    for p in a do (
+        format "% " (formattedPrint p.x format:".9g") to:ss
+        format "% " (formattedPrint p.y format:".9g") to:ss
+        format "% " (formattedPrint p.z format:".9g") to:ss
+    )
+    ss as string
+)
+"""
+
+FROM_INT_ARRAY_FN = """
+fn maxpFromIntArray a = (
+    local ss = stringStream ""
+    for v in a do format "% " (v as integer) to:ss
+    ss as string
+)
+"""
+
+# Writes an array as a Python literal, for `_literal`. Non-finite floats are written
+# as the names nan and inf.
+FROM_ARRAY_FN = """
+fn maxpFormatFloat v = (
+    if bit.isNAN v then "nan"
+    else if not bit.isFinite v then (if v > 0 then "inf" else "-inf")
+    else formattedPrint v format:".9g"
+)
+fn maxpFromArray a = (
+    local ss = stringStream ""
+    format "[" to:ss
+    for v in a do (
+        case classOf v of (
+            Integer: format "%, " v to:ss
+            Float: format "%, " (maxpFormatFloat v) to:ss
+            BooleanClass: format "%, " (if v then "True" else "False") to:ss
+            UndefinedClass: format "None, " to:ss
+            String: (
+                local s = substituteString v "\\\\" "\\\\\\\\"
+                s = substituteString s "\\"" "\\\\\\""
+                s = substituteString s "\\n" "\\\\n"
+                s = substituteString s "\\r" "\\\\r"
+                format "\\"%\\", " s to:ss
+            )
+            Name: format "\\"%\\", " (v as string) to:ss
+            Point3: format "(%, %, %), " (maxpFormatFloat v.x) \\
+                (maxpFormatFloat v.y) (maxpFormatFloat v.z) to:ss
+            default: throw ("Cannot convert " + (classOf v as string))
+        )
+    )
+    format "]" to:ss
+    ss as string
+)
+"""
+
+
+# Values of the names written for non-finite floats by `FROM_ARRAY_FN`
+NON_FINITE = {"nan": float("nan"), "inf": float("inf")}
+
+
+class _NonFinite(ast.NodeTransformer):
+    def visit_Name(self, node: ast.Name) -> ast.AST:
+        if node.id not in NON_FINITE:
+            raise ValueError(f"Unexpected name in array literal: {node.id}")
+        return ast.copy_location(ast.Constant(NON_FINITE[node.id]), node)
+
+
+def _literal(text: str) -> Any:
+    """Evaluate a Python literal, which may also contain nan and inf."""
+    tree = _NonFinite().visit(ast.parse(text, mode="eval"))
+    return ast.literal_eval(tree)
+
+
+def toArray(iterable: Iterable) -> rt.Array:
+    """Return `iterable` as a MAXScript array."""
+    return mxs.compileFunction(IDENTITY_FN)(list(iterable))
+
+
+def toPoint3Array(array: np.ndarray) -> rt.Array:
+    """Return an (N, 3) float array as a MAXScript array of Point3 values."""
+    flat = np.asarray(array, dtype=np.float64).reshape(-1, 3).ravel().tolist()
+    return mxs.compileFunction(TO_POINT3_ARRAY_FN)(flat)
+
+
+def toIntArray(array: np.ndarray) -> rt.Array:
+    """Return an integer array as a MAXScript array of integers."""
+    return toArray(np.asarray(array, dtype=np.int64).ravel().tolist())
+
+
+def toBitArray(indices: np.ndarray) -> rt.BitArray:
+    """Return one-based `indices` (e.g. vertex or face indices) as a BitArray."""
+    flat = np.asarray(indices, dtype=np.int64).ravel().tolist()
+    return mxs.compileFunction(TO_BIT_ARRAY_FN)(flat)
+
+
+def _parse(data: str, dtype: type) -> np.ndarray:
+    return np.array(data.split(), dtype=dtype)
+
+
+def fromFloatArray(array: rt.Array) -> np.ndarray:
+    """Return a MAXScript array of numbers as a 1D float array."""
+    return _parse(mxs.compileFunction(FROM_FLOAT_ARRAY_FN)(array), np.float64)
+
+
+def fromPoint3Array(array: rt.Array) -> np.ndarray:
+    """Return a MAXScript array of Point3 values as an (N, 3) float array."""
+    data = mxs.compileFunction(FROM_POINT3_ARRAY_FN)(array)
+    return _parse(data, np.float64).reshape(-1, 3)
+
+
+def fromIntArray(array: rt.Array) -> np.ndarray:
+    """Return a MAXScript array of integers (or a BitArray, as its set indices) as
+    a 1D integer array."""
+    return _parse(mxs.compileFunction(FROM_INT_ARRAY_FN)(array), np.int64)
+
 
+def fromArray(array: rt.Array) -> List[Any]:
+    """Return a MAXScript array as a Python list.
 
-def toArray(iterable: list) -> rt.Array:
-    mxsArray = rt.Array()
-    for item in iterable:
-        rt.Append(mxsArray, item)
-    return mxsArray
+    Supports integers, floats (including non-finite ones), booleans, undefined,
+    strings, names (as strings) and Point3 values (as tuples).
+    """
+    return _literal(mxs.compileFunction(FROM_ARRAY_FN)(array))
@@ -10,7 +10,7 @@ from PySide2.QtWidgets import QMainWindow, QWidget
 
 # Internal
 from maxp import MAX_HWND, rt
-from maxp.util import fileio
+from maxp.util import resources
 
 # Globals
 global HANDLERS
@@ -220,7 +220,7 @@ class AutoWindow(QMainWindow):
         """
         if self._uiFileName != "":
             loader = QUiLoader()
-            filename = fileio.relative(f"..\\tools\\{self._uiFileName}.ui")
+            filename = resources.resource("maxp.tools", f"{self._uiFileName}.ui")
 
             if not os.path.exists(filename):
                 raise FileNotFoundError(f"File {filename} not found!")
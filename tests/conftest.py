@@ -0,0 +1,64 @@
+"""
+Test session setup.
+
+Outside 3ds Max, stand-in pymxs and qtmax modules (see `trace.installModules`) are
+installed for the session, so that offline tests can import maxp, and the tests
+which need a running 3ds Max are skipped. The stand-ins, and every module imported
+while they were installed, are removed from `sys.modules` when the session ends.
+"""
+
+# Standard
+import importlib.util
+import sys
+from typing import Any, Dict
+
+# Third-party
+import pytest
+
+# Package
+from maxp.util import trace
+
+# Tests which drive a running 3ds Max
+MAX_TESTS = [
+    "testcallbacks.py",
+    "testdispatch.py",
+    "testfileio.py",
+    "testscene.py",
+    "testvalues.py",
+    "testwidgets.py",
+]
+
+IN_MAX = importlib.util.find_spec("pymxs") is not None
+
+# sys.modules before the stand-ins were installed
+MODULES: Dict[str, Any] = {}
+
+
+def pytest_sessionstart(session: Any) -> None:
+    if IN_MAX:
+        return
+    MODULES.update(sys.modules)
+    trace.installModules()
+
+
+def pytest_sessionfinish(session: Any, exitstatus: int) -> None:
+    if IN_MAX:
+        return
+    for name in list(sys.modules):
+        if name not in MODULES:
+            del sys.modules[name]
+    sys.modules.update(MODULES)
+    MODULES.clear()
+
+
+class MaxModule(pytest.Module):
+    """A test module which is skipped, without being imported, outside 3ds Max."""
+
+    def collect(self) -> Any:
+        pytest.skip("needs a running 3ds Max", allow_module_level=True)
+
+
+def pytest_pycollect_makemodule(module_path: Any, parent: Any) -> Any:
+    if not IN_MAX and module_path.name in MAX_TESTS:
+        return MaxModule.from_parent(parent, path=module_path)
+    return None
@@ -0,0 +1,97 @@
+import threading
+import time
+
+from PySide2.QtCore import QCoreApplication
+
+from maxp import rt
+from maxp.util import dispatch
+
+
+def _wait(futures, timeout=10.0) -> None:
+    deadline = time.perf_counter() + timeout
+    while not all(f.done() for f in futures):
+        assert time.perf_counter() < deadline, "timed out"
+        QCoreApplication.processEvents()
+
+
+def test_submitFromWorker() -> bool:
+    dispatcher = dispatch.MainThreadDispatcher(maxItems=5)
+    futures = []
+    threads = []
+
+    def work(i):
+        futures.append(dispatcher.submit(rt.Sphere, radius=i + 1))
+
+    for i in range(20):
+        threads.append(threading.Thread(target=work, args=[i]))
+        threads[-1].start()
+    for thread in threads:
+        thread.join()
+    _wait(futures)
+
+    radii = sorted(float(f.result().radius) for f in futures)
+    dispatcher.shutdown()
+
+    assert radii == [float(i + 1) for i in range(20)], f"radii == {radii}"
+    assert dispatcher.ticks >= 4, f"ticks == {dispatcher.ticks}"
+
+    return True
+
+
+def test_submitOnMainThread() -> bool:
+    with dispatch.MainThreadDispatcher() as dispatcher:
+        future = dispatcher.submit(lambda: 1 + 1)
+        assert future.done(), "not run immediately"
+        assert future.result() == 2, f"result == {future.result()}"
+
+    return True
+
+
+def test_shutdownCancels() -> bool:
+    dispatcher = dispatch.MainThreadDispatcher()
+    dispatcher.stop()
+    futures = []
+    thread = threading.Thread(target=lambda: futures.append(dispatcher.submit(rt.Box)))
+    thread.start()
+    thread.join()
+    dispatcher.shutdown()
+
+    assert futures[0].cancelled(), "not cancelled"
+
+    return True
+
+
+def test_submitDuringShutdown() -> bool:
+    dispatcher = dispatch.MainThreadDispatcher()
+    dispatcher.stop()
+    futures = []
+    stop = threading.Event()
+
+    def work():
+        while not stop.is_set():
+            try:
+                futures.append(dispatcher.submit(lambda: None))
+            except RuntimeError:
+                return
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.05)
+    dispatcher.shutdown()
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    # Every item accepted before the shutdown was cancelled by it, none were left
+    assert all(f.cancelled() for f in futures), "item queued after shutdown"
+    assert len(dispatcher) == 0, f"{len(dispatcher)} items left"
+
+    return True
+
+
+if __name__ == "__main__":
+    test_submitFromWorker()
+    test_submitOnMainThread()
+    test_shutdownCancels()
+    test_submitDuringShutdown()
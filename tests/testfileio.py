@@ -1,16 +1,80 @@
 import os
+import tempfile
 
-from ..maxp import context, fileio, rt, scene
+from ..maxp import context, fileio, pymxs, rt, scene
 
 
 def test_originExport():
     sphere = rt.Sphere()
     origPos = rt.Point3(25, 5, 50)
     scene.setProperty(sphere, "transform.position", origPos)
-    path = "C:\\Users\\Tom\\Desktop"
+    path = tempfile.mkdtemp()
     ext = ".obj"
     with context.origin(sphere):
         filename = fileio.exportNode(sphere, path, ext)
 
     assert sphere.transform.position == origPos
     assert os.path.exists(filename)
+
+
+def test_exportGroups():
+    spheres = [rt.Sphere(), rt.Sphere()]
+    path = tempfile.mkdtemp()
+    results = fileio.exportGroups(spheres, path, ".fbx")
+    assert [result.skipped for result in results] == [False]
+    assert os.path.exists(results[0].filename)
+
+    results = fileio.exportGroups(spheres, path, ".fbx")
+    assert [result.skipped for result in results] == [True]
+
+    scene.setProperty(spheres[0], "radius", 50.0)
+    results = fileio.exportGroups(spheres, path, ".fbx")
+    assert [result.skipped for result in results] == [False]
+
+    spheres[1].material = rt.StandardMaterial()
+    fileio.exportGroups(spheres, path, ".fbx")
+    spheres[1].material.diffuse = rt.Color(255, 0, 0)
+    results = fileio.exportGroups(spheres, path, ".fbx")
+    assert [result.skipped for result in results] == [False], "material change"
+
+    bend = rt.Bend()
+    rt.AddModifier(spheres[1], bend)
+    fileio.exportGroups(spheres, path, ".fbx")
+    bend.angle = 45.0
+    results = fileio.exportGroups(spheres, path, ".fbx")
+    assert [result.skipped for result in results] == [False], "modifier change"
+
+    with pymxs.animate(True), pymxs.attime(10):
+        spheres[0].pos = rt.Point3(0, 0, 10)
+    fileio.exportGroups(spheres, path, ".fbx")
+    with pymxs.animate(True), pymxs.attime(10):
+        spheres[0].pos = rt.Point3(0, 0, 20)
+    results = fileio.exportGroups(spheres, path, ".fbx")
+    assert [result.skipped for result in results] == [False], "key change"
+
+
+def test_exportGroupsCollision():
+    groups = {"a/b": [rt.Sphere()], "A?b": [rt.Sphere()]}
+    try:
+        list(fileio.iterExportGroups(groups, tempfile.mkdtemp(), ".fbx"))
+    except ValueError as e:
+        assert "'a/b'" in str(e) and "'A?b'" in str(e), str(e)
+    else:
+        raise AssertionError("colliding groups were exported")
+
+
+def test_exportJobResume():
+    spheres = [rt.Sphere(name=f"exportJob{i}") for i in range(3)]
+    path = tempfile.mkdtemp()
+    job = fileio.ExportJob(spheres, path, ".obj")
+    result = job.step()
+    assert result.position == 0 and os.path.exists(result.filename)
+
+    job = fileio.ExportJob(spheres, path, ".obj")
+    assert job.resumedAt == 1, f"resumedAt == {job.resumedAt}"
+    results = list(job)
+    assert [result.position for result in results] == [1, 2]
+    assert len(job.timings) == 3
+
+    job = fileio.ExportJob(spheres, path, ".obj")
+    assert job.position == 0, "completed job was resumed"
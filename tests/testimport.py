@@ -0,0 +1,55 @@
+import os
+import re
+import subprocess
+import sys
+
+MAXP_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cumulative import time budget for `import maxp`, in microseconds
+IMPORT_TIME_LIMIT = 10000
+
+# Modules which must not be loaded by `import maxp` alone
+HEAVY_MODULES = [
+    "pymxs",
+    "qtmax",
+    "PySide2",
+    "numpy",
+    "maxp.runtime",
+    "maxp.util.logger",
+]
+
+
+def _run(code: str, *args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *args, "-c", code],
+        cwd=MAXP_PATH,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def test_importTime():
+    result = _run("import maxp", "-X", "importtime")
+    match = re.search(r"\|\s*(\d+)\s*\|\s*maxp$", result.stderr, re.MULTILINE)
+    assert match is not None, result.stderr
+    cumulative = int(match.group(1))
+    assert cumulative < IMPORT_TIME_LIMIT, f"import maxp took {cumulative}us"
+
+
+def test_importIsLazy():
+    code = (
+        f"import sys, maxp; print([m for m in {HEAVY_MODULES!r} if m in sys.modules])"
+    )
+    assert _run(code).stdout.strip() == "[]"
+
+
+def test_importHelperIsLazy():
+    code = "import sys, maxp.util.resources; print('maxp.runtime' in sys.modules)"
+    assert _run(code).stdout.strip() == "False"
+
+
+if __name__ == "__main__":
+    test_importTime()
+    test_importIsLazy()
+    test_importHelperIsLazy()
@@ -0,0 +1,39 @@
+import numpy as np
+
+from maxp.util import keyreduce
+
+
+def test_reduceLinear():
+    times = np.arange(100, dtype=np.float64)
+    values = np.stack([2.0 * times, np.full(100, 5.0)], axis=-1)
+    keys = keyreduce.reduceScalars(times, values, 1e-6)
+    assert keys.shape == (100, 2)
+    assert np.flatnonzero(keys[:, 0]).tolist() == [0, 99]
+    assert np.flatnonzero(keys[:, 1]).tolist() == [0, 99]
+
+
+def test_reduceTolerance():
+    times = np.arange(200, dtype=np.float64)
+    values = np.sin(times / 10.0)
+    keys = keyreduce.reduceScalars(times, values, 0.01)
+    reduced = np.interp(times, times[keys], values[keys])
+    assert np.abs(reduced - values).max() <= 0.01
+    assert keyreduce.compressionRatio(keys) > 2.0
+
+
+def test_reduceRotations():
+    times = np.arange(50, dtype=np.float64)
+    half = np.radians(times) / 2.0
+    zero = np.zeros_like(half)
+    quats = np.stack([zero, zero, np.sin(half), np.cos(half)], axis=-1)
+    # q and -q are the same rotation
+    quats[::2] *= -1.0
+    keys = keyreduce.reduceRotations(times, quats[:, np.newaxis], 0.01)
+    assert keys.shape == (50, 1)
+    assert np.flatnonzero(keys).tolist() == [0, 49]
+
+
+if __name__ == "__main__":
+    test_reduceLinear()
+    test_reduceTolerance()
+    test_reduceRotations()
@@ -0,0 +1,58 @@
+import os
+import tempfile
+import threading
+
+import pymxs
+
+from maxp.util import logger
+
+
+class FakeNode(pymxs.MXSWrapperBase):
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.threads = []
+
+    def __str__(self) -> str:
+        self.threads.append(threading.current_thread())
+        return f"${self.name}"
+
+
+def test_maxValuesFormattedOnCaller():
+    filename = os.path.join(tempfile.mkdtemp(), "maxp.log")
+    logger.configure(filename=filename)
+    node = FakeNode("Box001")
+    logger.log("Exporting %s with %s", node, [node])
+    logger.stop()
+
+    with open(filename) as f:
+        text = f.read()
+    assert "Exporting $Box001 with [" in text, text
+    assert node.threads and all(
+        thread is threading.current_thread() for thread in node.threads
+    ), node.threads
+
+
+def test_concurrentStart():
+    logger.configure(filename=os.path.join(tempfile.mkdtemp(), "maxp.log"))
+    barrier = threading.Barrier(8)
+
+    def work() -> None:
+        barrier.wait()
+        logger.log("Started")
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    handlers = [
+        h for h in logger.LOGGER.handlers if isinstance(h, logger.LazyQueueHandler)
+    ]
+    logger.stop()
+    assert len(handlers) == 1, handlers
+
+
+if __name__ == "__main__":
+    test_maxValuesFormattedOnCaller()
+    test_concurrentStart()
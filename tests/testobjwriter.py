@@ -0,0 +1,49 @@
+import os
+import tempfile
+
+import numpy as np
+
+from maxp.util.objwriter import ObjMesh, writeObj, writeObjs
+
+VERTICES = np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0], [1, 1, 0]], dtype=float)
+FACES = np.array([[0, 1, 2], [1, 3, 2]])
+
+
+def test_writeObj():
+    filename = os.path.join(tempfile.mkdtemp(), "quad.obj")
+    meshes = [
+        ObjMesh("a", VERTICES, FACES, normals=np.tile([0.0, 0.0, 1.0], (4, 1))),
+        ObjMesh("b", VERTICES, FACES, uvs=VERTICES[:, :2]),
+    ]
+    writeObj(filename, meshes)
+
+    with open(filename) as f:
+        lines = f.read().splitlines()
+
+    assert lines[0] == "o a"
+    assert lines[1] == "v 0.000000 0.000000 0.000000"
+    assert lines.count("vn 0.000000 0.000000 1.000000") == 4
+    assert "f 1//1 2//2 3//3" in lines
+    # Second object's indices are offset by the first object's vertices
+    assert "f 5/1 6/2 7/3" in lines
+
+
+def test_writeObjs():
+    filepath = tempfile.mkdtemp()
+    meshes = [ObjMesh(f"mesh{i}", VERTICES, FACES) for i in range(8)]
+    written = []
+
+    def check(filename):
+        assert os.path.exists(filename)
+        written.append(filename)
+
+    filenames = writeObjs(meshes, filepath, workers=4, callback=check)
+
+    assert filenames == [os.path.join(filepath, f"mesh{i}.obj") for i in range(8)]
+    assert all(os.path.exists(filename) for filename in filenames)
+    assert sorted(written) == sorted(filenames)
+
+
+if __name__ == "__main__":
+    test_writeObj()
+    test_writeObjs()
@@ -0,0 +1,88 @@
+import gzip
+import hashlib
+import os
+import tempfile
+
+from maxp.util import fileio
+
+DATA = b"o mesh\nv 0 0 0\n" * 1000
+
+
+def _exported(name: str = "mesh") -> str:
+    filename = os.path.join(tempfile.mkdtemp(), f"{name}.obj")
+    with open(filename, "wb") as f:
+        f.write(DATA)
+    return filename
+
+
+def test_checksum():
+    filename = _exported()
+    result = fileio.PostExportResult(filename)
+    output = fileio.Checksum("sha1").run(filename, result)
+
+    assert output == filename
+    assert result.values["checksum"] == hashlib.sha1(DATA).hexdigest()
+
+
+def test_compress():
+    filename = _exported()
+    result = fileio.PostExportResult(filename)
+    output = fileio.Compress(remove=True).run(filename, result)
+
+    assert output == f"{filename}.gz" and result.values["compress"] == output
+    assert not os.path.exists(filename), "original not removed"
+    with gzip.open(output, "rb") as f:
+        assert f.read() == DATA
+
+
+def test_copyTo():
+    filename = _exported()
+    staging = tempfile.mkdtemp()
+    result = fileio.PostExportResult(filename)
+    output = fileio.CopyTo(staging).run(filename, result)
+
+    assert output == os.path.join(staging, "mesh.obj")
+    assert os.path.exists(filename), "original removed"
+    with open(output, "rb") as f:
+        assert f.read() == DATA
+
+
+def test_pipeline():
+    filenames = [_exported(f"mesh{i}") for i in range(4)]
+    staging = tempfile.mkdtemp()
+    with fileio.PostExport(
+        [fileio.Checksum(), fileio.Compress(), fileio.CopyTo(staging)], workers=2
+    ) as post:
+        for filename in filenames:
+            post.submit(filename)
+
+    results = post.results()
+    assert [result.filename for result in results] == filenames
+    for i, result in enumerate(results):
+        assert result.output == os.path.join(staging, f"mesh{i}.obj.gz")
+        assert result.values["checksum"] == hashlib.sha256(DATA).hexdigest()
+        assert set(result.timings) == {"checksum", "compress", "copy"}
+
+    try:
+        post.submit(filenames[0])
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError("submitted to a closed pipeline")
+
+
+def test_abstractStep():
+    try:
+        fileio.PostExportStep()  # type: ignore
+    except TypeError:
+        pass
+    else:
+        raise AssertionError("created a step without run")
+
+
+if __name__ == "__main__":
+    test_checksum()
+    test_compress()
+    test_copyTo()
+    test_pipeline()
+    test_abstractStep()
@@ -0,0 +1,126 @@
+from maxp import MXSWrapperBase
+from maxp.util import mxs, profiler, scene
+
+
+class FakeValue(MXSWrapperBase):
+    def __init__(self, **props) -> None:
+        self.__dict__.update(props)
+
+    def setmxsprop(self, name, value) -> None:
+        setattr(self, name, value)
+
+
+class FakeObjectSet(MXSWrapperBase):
+    def __init__(self, nodes) -> None:
+        self.nodes = nodes
+
+    def __iter__(self):
+        return iter(self.nodes)
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+
+class FakeFunction(MXSWrapperBase):
+    def __init__(self, func) -> None:
+        self.func = func
+
+    def __call__(self, *args):
+        return self.func(*args)
+
+
+def _countNodes(values) -> int:
+    """Return the number of nodes in `values`, or -1 if any are still proxies."""
+    nodes, lookup = values
+    if any(type(node) is not FakeValue for node in nodes + [lookup["node"]]):
+        return -1
+    return len(nodes)
+
+
+class FakeRuntime:
+    def __init__(self) -> None:
+        self.nodes = [
+            FakeValue(name="Box001", pos=FakeValue(x=1.0)),
+            FakeValue(name="Sphere001", pos=FakeValue(x=2.0)),
+        ]
+        self.Objects = FakeObjectSet(self.nodes)
+        self.IsValidNode = FakeFunction(lambda node: node in self.nodes)
+        self.count = FakeFunction(_countNodes)
+        self.Execute = FakeFunction(lambda source: FakeFunction(lambda: source))
+
+    def classOf(self, value) -> str:
+        return "Primitive" if isinstance(value, FakeFunction) else "ObjectSet"
+
+
+def _profile(func):
+    with profiler.installRuntime(profiler.BridgeProfiler(FakeRuntime())) as p:
+        result = func()
+    return result, p
+
+
+def test_iterateValues():
+    names, p = _profile(lambda: [node.name for node in scene.getNodes()])
+    assert names == ["Box001", "Sphere001"]
+    totals = p.totals()
+    assert totals["Objects"][0] == 2, totals  # get and iter
+    assert totals["IsValidNode"][0] == 2, totals
+
+
+def test_propertyCounts():
+    def read():
+        return [node.pos.x for node in scene.getNodes()]
+
+    values, p = _profile(read)
+    assert values == [1.0, 2.0]
+    assert p.totals()[".pos"][0] == 2
+    assert p.totals()[".x"][0] == 2
+
+
+def test_unwrapNested():
+    def count():
+        nodes = scene.getNodes()
+        return scene.rt.count([nodes, {"node": nodes[0]}])
+
+    result, _ = _profile(count)
+    assert result == 2
+
+    runtime = FakeRuntime()
+    proxy = profiler.ProfiledValue(
+        profiler.BridgeProfiler(runtime), "node", runtime.nodes[0]
+    )
+    assert isinstance(proxy, FakeValue)
+    unwrapped = profiler._unwrap([proxy, (proxy,), {"node": proxy}])
+    assert unwrapped == [
+        runtime.nodes[0],
+        (runtime.nodes[0],),
+        {"node": runtime.nodes[0]},
+    ]
+    assert type(unwrapped[0]) is FakeValue
+
+
+def test_methodArgsUnwrapped():
+    def move():
+        node = scene.getNodes()[0]
+        node.setmxsprop("pos", node.pos)
+        return node
+
+    node, p = _profile(move)
+    assert type(object.__getattribute__(node, "_value").pos) is FakeValue
+    assert p.totals()[".setmxsprop"][0] == 1
+
+
+def test_functionCache():
+    before = dict(mxs.FUNCTIONS)
+    source = "fn maxpProfiled = ()"
+    result, p = _profile(lambda: mxs.compileFunction(source)())
+    assert result == source
+    assert p.totals()["Execute"][0] == 2  # compiled and called
+    assert mxs.FUNCTIONS == before, "function compiled while profiling was kept"
+
+
+if __name__ == "__main__":
+    test_iterateValues()
+    test_propertyCounts()
+    test_unwrapNested()
+    test_methodArgsUnwrapped()
+    test_functionCache()
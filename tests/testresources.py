@@ -0,0 +1,20 @@
+import os
+
+from maxp.util import resources
+
+
+def test_relativeTo():
+    anchor = os.path.join("root", "maxp", "widgets", "autowindow.py")
+    expected = os.path.abspath(os.path.join("root", "maxp", "tools", "a.ui"))
+    assert resources.relativeTo(anchor, "..\\tools\\a.ui") == expected
+    assert resources.relativeTo(anchor, "../tools/a.ui") == expected
+
+
+def test_resource():
+    filename = resources.resource("maxp", "resources/LightRig.max")
+    assert os.path.exists(filename)
+
+
+if __name__ == "__main__":
+    test_relativeTo()
+    test_resource()
@@ -0,0 +1,91 @@
+from maxp import rt
+from maxp.util import context, scene
+
+
+def test_transaction():
+    sphere = rt.Sphere(radius=10.0)
+    with scene.transaction("Test transaction"):
+        scene.setProperty(sphere, "radius", 5.0)
+        scene.setProperty(sphere, "pos.x", 20.0)
+        assert sphere.radius == 10.0
+
+    assert sphere.radius == 5.0
+    assert sphere.pos.x == 20.0
+
+
+def test_transactionRollback():
+    sphere = rt.Sphere(radius=10.0)
+    try:
+        with scene.transaction():
+            scene.setProperty(sphere, "radius", 5.0)
+            scene.setProperty(sphere, "noSuchProperty", 1.0)
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError("Expected the transaction to fail")
+
+    assert sphere.radius == 10.0
+
+
+def test_transactionRestores():
+    sphere = rt.Sphere(radius=10.0, segs=16)
+    # The write to pos.x succeeds before radius rejects a string
+    try:
+        with scene.transaction():
+            scene.setProperty(sphere, "pos.x", 20.0)
+            scene.setProperty(sphere, "radius", "large")
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError("Expected the write to fail")
+    assert sphere.pos.x == 0.0, f"pos.x == {sphere.pos.x}"
+    assert sphere.radius == 10.0, f"radius == {sphere.radius}"
+
+    # segs is an integer, so it reads back as 8, which fails verification
+    try:
+        with scene.transaction():
+            scene.setProperty(sphere, "radius", 5.0)
+            scene.setProperty(sphere, "segs", 8.5)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Expected the verification to fail")
+    assert sphere.radius == 10.0, f"radius == {sphere.radius}"
+    assert sphere.segs == 16, f"segs == {sphere.segs}"
+
+
+def test_originHierarchy():
+    parent = rt.Point(pos=rt.Point3(10, 0, 0))
+    child = rt.Sphere(pos=rt.Point3(10, 20, 30))
+    child.parent = parent
+    # Children first, so writing in list order would move the child twice
+    nodes = [child, parent]
+    with context.origin(nodes):
+        assert parent.pos == rt.Point3(0, 0, 0), f"parent.pos == {parent.pos}"
+        assert child.pos == rt.Point3(0, 0, 0), f"child.pos == {child.pos}"
+
+    assert parent.pos == rt.Point3(10, 0, 0), f"parent.pos == {parent.pos}"
+    assert child.pos == rt.Point3(10, 20, 30), f"child.pos == {child.pos}"
+
+
+def test_originInTransaction():
+    sphere = rt.Sphere(radius=10.0, pos=rt.Point3(10, 20, 30))
+    try:
+        with scene.transaction():
+            scene.setProperty(sphere, "radius", 5.0)
+            with context.origin(sphere):
+                assert sphere.pos == rt.Point3(0, 0, 0), f"pos == {sphere.pos}"
+                raise ValueError("export failed")
+    except ValueError:
+        pass
+
+    assert sphere.pos == rt.Point3(10, 20, 30), f"pos == {sphere.pos}"
+    assert sphere.radius == 10.0, f"radius == {sphere.radius}"
+
+
+if __name__ == "__main__":
+    test_transaction()
+    test_transactionRollback()
+    test_transactionRestores()
+    test_originHierarchy()
+    test_originInTransaction()
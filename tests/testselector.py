@@ -0,0 +1,40 @@
+from maxp.util import selector
+
+
+def test_plan():
+    plan = selector.plan("class:Editable_Poly,Box layer:Props name:rock_* -hidden")
+    assert [term.key for term in plan.terms] == ["class", "layer", "name", "hidden"]
+    assert plan.values == (("Editable_Poly", "Box"), ("Props",), ("rock_*",), ())
+    assert "maxpLayerNodes v2" in plan.source
+    assert "not (n.isHiddenInVpt)" in plan.source
+
+
+def test_planSource():
+    exact = selector.plan("name:rock_01 layer:Props")
+    assert "maxpNodesByName v1" in exact.source
+    wildcard = selector.plan("name:rock_* selected")
+    assert "selection as array" in wildcard.source
+    everything = selector.plan("-name:rock_01")
+    assert "then objects" in everything.source
+    # Queries of the same shape share a function
+    assert exact.source == selector.plan('name:"rock 02" layer:Other').source
+
+
+def test_planCache():
+    assert selector.plan("class:Box") is selector.plan("class:Box")
+
+
+def test_planErrors():
+    for query in ["colour:red", "hidden:yes", "name:", "class:Box;delete"]:
+        try:
+            selector.plan(query)
+        except ValueError:
+            continue
+        raise AssertionError(f"Expected {query!r} to be invalid")
+
+
+if __name__ == "__main__":
+    test_plan()
+    test_planSource()
+    test_planCache()
+    test_planErrors()
@@ -0,0 +1,85 @@
+import os
+import tempfile
+
+from maxp.util import profiler, trace
+
+from maxp.util import mxs, scene
+
+
+class FakeNode:
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+
+class FakeRuntime:
+    def __init__(self) -> None:
+        self.Objects = [FakeNode("Box001"), FakeNode("Sphere001")]
+
+    def IsValidNode(self, node: FakeNode) -> bool:
+        return isinstance(node, FakeNode)
+
+    def getNodeByName(self, name: str) -> FakeNode:
+        return next(node for node in self.Objects if node.name == name)
+
+
+def _names() -> list:
+    return [node.name for node in scene.getNodes()]
+
+
+def _record(filename: str) -> list:
+    recorder = trace.Recorder(FakeRuntime())
+    with profiler.installRuntime(recorder.runtime):
+        names = _names()
+    recorder.save(filename)
+    return names
+
+
+def test_replay():
+    filename = os.path.join(tempfile.mkdtemp(), "scene.trace")
+    recorded = _record(filename)
+
+    with trace.replay(filename) as replayer:
+        replayed = _names()
+
+    assert replayed == recorded == ["Box001", "Sphere001"]
+    assert replayer.remaining == 0
+    assert replayer.elapsed >= 0.0
+
+
+def test_mismatch():
+    filename = os.path.join(tempfile.mkdtemp(), "scene.trace")
+    _record(filename)
+
+    with trace.replay(filename):
+        try:
+            scene.getNodeByName("Box001")
+        except trace.TraceMismatchError:
+            pass
+        else:
+            raise AssertionError("Expected a TraceMismatchError")
+
+    with trace.replay(filename, strict=False):
+        names = [node.name for node in scene.getNodes()[1:]]
+    assert names == ["Sphere001"]
+
+
+def test_functionCache():
+    filename = os.path.join(tempfile.mkdtemp(), "scene.trace")
+    _record(filename)
+    source = "fn maxpTestTrace = ok"
+    mxs.FUNCTIONS[source] = "compiled"
+    before = dict(mxs.FUNCTIONS)
+
+    with trace.replay(filename):
+        assert source not in mxs.FUNCTIONS
+        mxs.FUNCTIONS["fn maxpTestReplay = ok"] = "replayed"
+        _names()
+
+    assert mxs.FUNCTIONS == before
+    del mxs.FUNCTIONS[source]
+
+
+if __name__ == "__main__":
+    test_replay()
+    test_mismatch()
+    test_functionCache()
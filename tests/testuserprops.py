@@ -0,0 +1,91 @@
+import gc
+import weakref
+
+from maxp.util import userprops
+
+
+def test_parseBuffer():
+    buffer = (
+        "lods = [0, 2, 4]\r\nexport = true\r\nname = rock_01\r\n\r\nscale = 1.5\r\nflag"
+    )
+    props = userprops.parseBuffer(buffer)
+    assert props == {
+        "lods": [0, 2, 4],
+        "export": True,
+        "name": "rock_01",
+        "scale": 1.5,
+        "flag": None,
+    }
+
+
+def test_roundTrip():
+    props = {
+        "lods": [0, 2, 4],
+        "meta": {"author": "me", "tags": ("a", "b")},
+        "count": 3,
+        "enabled": False,
+        "label": "rock 01",
+        "numeric": "123",
+        "quoted": "'quoted'",
+        "multiline": "first\nsecond\r\nthird",
+        "padded": "  padded ",
+        "nested": ["a\nb"],
+        "flag": None,
+    }
+    assert userprops.parseBuffer(userprops.formatBuffer(props)) == props
+
+
+def test_callbacksDoNotKeepStore():
+    store = userprops.UserPropStore()
+    onReset = userprops._weakCallback(store, "_onReset")
+    store._cache[1] = {"lods": [0]}
+    onReset()
+    assert not store._cache
+
+    ref = weakref.ref(store)
+    del store
+    gc.collect()
+    assert ref() is None, "store kept alive by its callbacks"
+    onReset()  # Removes the callbacks of the collected store
+
+
+class Node:
+    """Stand-in node which counts reads of its handle."""
+
+    def __init__(self, handle: int) -> None:
+        self._handle = handle
+        self.reads = 0
+
+    @property
+    def handle(self) -> int:
+        self.reads += 1
+        return self._handle
+
+
+def test_getManyReadsHandleOnce():
+    store = userprops.UserPropStore(watch=False)
+    store._cache[1] = {"lods": [0, 2], "export": True}
+    node = Node(1)
+
+    values = store.getMany(node, ["lods", "export", "missing"], default=0)
+    assert values == {"lods": [0, 2], "export": True, "missing": 0}
+    assert node.reads == 1
+
+    values["lods"].append(4)
+    store.get(node, "lods").append(4)
+    store.getAll(node)["lods"].append(4)
+    assert store._cache[1]["lods"] == [0, 2], "returned values alias the cache"
+
+
+def test_closeUnwatches():
+    with userprops.UserPropStore() as store:
+        assert store._watching
+    assert not store._watching
+
+
+if __name__ == "__main__":
+    test_parseBuffer()
+    test_roundTrip()
+    test_callbacksDoNotKeepStore()
+    test_getManyReadsHandleOnce()
+    test_closeUnwatches()
@@ -0,0 +1,21 @@
+import math
+
+from maxp.util import values
+
+
+def test_fromArrayRoundTrip():
+    items = [1, 2.5, True, None, "line\r\nbreak", 'quote " \\ slash']
+    assert values.fromArray(values.toArray(items)) == items
+
+
+def test_fromArrayNonFinite():
+    result = values.fromArray(values.toArray([float("inf"), float("-inf")]))
+    assert result == [math.inf, -math.inf], f"result == {result}"
+
+    result = values.fromArray(values.toArray([float("nan")]))
+    assert math.isnan(result[0]), f"result == {result}"
+
+
+if __name__ == "__main__":
+    test_fromArrayRoundTrip()
+    test_fromArrayNonFinite()
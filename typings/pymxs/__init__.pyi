@@ -0,0 +1,32 @@
+# The generated stub in _runtime is ignored by mypy (see its first line), which
+# would otherwise hide every name in it. The module-level API is declared here so
+# that it is type checked, while `runtime` is Any for mypy and keeps the generated
+# class members for editors which read _runtime.
+from typing import Any, ContextManager
+
+from ._runtime import runtime as runtime  # type: ignore
+
+class MXSWrapperBase:
+    def getmxsprop(self, key: str) -> Any: ...
+    def setmxsprop(self, key: str, value: Any) -> None: ...
+
+class MXSWrapperObjectSet:
+    def getmxsprop(self, key: str) -> Any: ...
+    def setmxsprop(self, key: str, value: Any) -> None: ...
+
+class MXSWrapperObjectSetIter:
+    def getmxsprop(self, key: str) -> Any: ...
+    def setmxsprop(self, key: str, value: Any) -> None: ...
+
+def animate(onoff: bool) -> ContextManager[None]: ...
+def atlevel(node_name: Any) -> ContextManager[None]: ...
+def attime(time: Any) -> ContextManager[None]: ...
+def byref(o: Any) -> Any: ...
+def mxsreference(o: Any) -> Any: ...
+def mxstoken() -> Any: ...
+def print_(*args: Any) -> None: ...
+def quiet(onoff: bool) -> ContextManager[None]: ...
+def redraw(onoff: bool) -> ContextManager[None]: ...
+def run_redo() -> None: ...
+def run_undo() -> None: ...
+def undo(onoff: bool, label: str = ...) -> ContextManager[None]: ...